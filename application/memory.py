@@ -0,0 +1,123 @@
+"""Memory accounting and allocation tracking for long-running bots."""
+from __future__ import annotations
+
+import json
+import logging
+import tracemalloc
+from collections.abc import Callable, Mapping
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from config.settings import MemorySettings
+
+
+@dataclass(frozen=True)
+class MemoryReport:
+    """Byte estimates per component, plus tracemalloc totals when tracing."""
+
+    cycle: int
+    components: dict[str, int]
+    traced_bytes: int | None = None
+    peak_traced_bytes: int | None = None
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.components.values())
+
+
+class MemoryMonitor:
+    """Periodically accounts memory per component and diffs allocation snapshots.
+
+    Every ``report_interval_cycles`` cycles :meth:`check` collects the byte
+    estimates returned by ``components`` and appends them to
+    ``<output_directory>/memory.jsonl``. With ``tracemalloc`` enabled it also
+    writes the allocation sites that grew most since the previous check to
+    ``snapshot-<cycle>.txt``. When the accounted total exceeds
+    ``budget_bytes`` a warning is logged and, with ``budget_action="trim"``,
+    ``trim`` is called to release buffers.
+    """
+
+    def __init__(
+        self,
+        settings: MemorySettings,
+        *,
+        components: Callable[[], Mapping[str, int]],
+        trim: Callable[[], None] | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self._settings = settings
+        self._components = components
+        self._trim = trim
+        self._logger = logger or logging.getLogger(__name__)
+        self._directory = Path(settings.output_directory)
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._owns_tracing = False
+
+    def start(self) -> None:
+        """Start tracemalloc if it is enabled and not already tracing."""
+
+        if self._settings.tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start(self._settings.tracemalloc_frames)
+            self._owns_tracing = True
+
+    def stop(self) -> None:
+        """Stop tracemalloc if this monitor started it."""
+
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        self._snapshot = None
+
+    def check(self, cycle: int) -> MemoryReport | None:
+        """Report, snapshot and enforce the budget when ``cycle`` is due."""
+
+        if cycle % self._settings.report_interval_cycles:
+            return None
+        report = self.report(cycle)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        with (self._directory / "memory.jsonl").open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps({**asdict(report), "total_bytes": report.total_bytes}) + "\n")
+        if tracemalloc.is_tracing():
+            self._write_snapshot_diff(cycle)
+        self._enforce_budget(report)
+        return report
+
+    def report(self, cycle: int = 0) -> MemoryReport:
+        """Collect the current byte estimates."""
+
+        traced = peak = None
+        if tracemalloc.is_tracing():
+            traced, peak = tracemalloc.get_traced_memory()
+        return MemoryReport(cycle, dict(self._components()), traced, peak)
+
+    def _write_snapshot_diff(self, cycle: int) -> None:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            )
+        )
+        previous, self._snapshot = self._snapshot, snapshot
+        if previous is None:
+            stats = snapshot.statistics("lineno")
+            title = "Largest allocation sites"
+        else:
+            stats = snapshot.compare_to(previous, "lineno")
+            title = "Allocation growth since the previous snapshot"
+        lines = [f"# {title} at cycle {cycle}"]
+        lines.extend(str(stat) for stat in stats[: self._settings.snapshot_top])
+        (self._directory / f"snapshot-{cycle:08d}.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    def _enforce_budget(self, report: MemoryReport) -> None:
+        budget = self._settings.budget_bytes
+        if budget is None or report.total_bytes <= budget:
+            return
+        largest = sorted(report.components.items(), key=lambda item: item[1], reverse=True)[:3]
+        self._logger.warning(
+            "Accounted memory %s bytes exceeds the budget of %s bytes; largest components: %s",
+            report.total_bytes,
+            budget,
+            ", ".join(f"{name}={size}" for name, size in largest),
+        )
+        if self._settings.budget_action == "trim" and self._trim is not None:
+            self._trim()
@@ -0,0 +1,207 @@
+"""Multi-stage worker pipeline with bounded queues and per-key ordering."""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Hashable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from utils.memory import estimate_size
+
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    """Definition of one pipeline stage.
+
+    ``handler`` receives the item produced by the previous stage and returns
+    the item for the next one, or ``None`` to drop it.
+    """
+
+    name: str
+    handler: Callable[[Any], Any]
+    workers: int = 1
+    queue_size: int = 64
+
+    def __post_init__(self) -> None:
+        if self.workers <= 0:
+            raise ValueError("Stage workers must be positive")
+        if self.queue_size <= 0:
+            raise ValueError("Stage queue size must be positive")
+
+
+@dataclass(frozen=True)
+class StageStats:
+    """Point-in-time statistics of a pipeline stage.
+
+    ``stalled_seconds`` is the time the stage's workers (or, for the first
+    stage, producers) spent blocked because the next queue was full.
+    """
+
+    name: str
+    workers: int
+    capacity: int
+    queue_depth: int
+    processed: int
+    errors: int
+    busy_seconds: float
+    stalled_seconds: float
+
+
+class _Stage:
+    def __init__(self, spec: StageSpec) -> None:
+        self.spec = spec
+        # One queue per worker: items are routed by key, so each key is always
+        # handled by the same worker and stays in order.
+        self.queues: list[queue.Queue[Any]] = [queue.Queue(maxsize=spec.queue_size) for _ in range(spec.workers)]
+        self.threads: list[threading.Thread] = []
+        self.lock = threading.Lock()
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.stalled_seconds = 0.0
+
+    def route(self, key: Hashable) -> queue.Queue[Any]:
+        return self.queues[hash(key) % len(self.queues)]
+
+
+class Pipeline:
+    """Runs items through consecutive stages, each with its own worker pool.
+
+    Every stage has bounded queues, so a slow stage blocks the one before it
+    (and ultimately :meth:`submit`) instead of letting work pile up. Items
+    with the same key are handled by the same worker of every stage and
+    therefore keep their submission order. Throughput is set by the slowest
+    stage rather than by the sum of all stages.
+    """
+
+    def __init__(self, stages: Sequence[StageSpec], *, logger: logging.Logger | None = None) -> None:
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self._stages = [_Stage(spec) for spec in stages]
+        self._logger = logger or logging.getLogger(__name__)
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._started = False
+        self._closed = False
+
+    def start(self) -> Pipeline:
+        """Start every stage's workers."""
+
+        if self._started:
+            return self
+        self._started = True
+        for index, stage in enumerate(self._stages):
+            for worker, inbox in enumerate(stage.queues):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(index, inbox),
+                    name=f"pipeline-{stage.spec.name}-{worker}",
+                    daemon=True,
+                )
+                stage.threads.append(thread)
+                thread.start()
+        return self
+
+    def submit(self, key: Hashable, item: Any) -> None:
+        """Queue ``item`` for the first stage, blocking while that stage is full."""
+
+        if self._closed:
+            raise RuntimeError("Pipeline is closed")
+        if not self._started:
+            self.start()
+        with self._idle:
+            self._pending += 1
+        self._put(self._stages[0], key, item, self._stages[0])
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until every submitted item has left the pipeline; return ``False`` on timeout."""
+
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def close(self) -> None:
+        """Drain queued items, then stop the workers stage by stage."""
+
+        if self._closed:
+            return
+        self._closed = True
+        if not self._started:
+            return
+        for stage in self._stages:
+            for inbox in stage.queues:
+                inbox.put(_STOP)
+            for thread in stage.threads:
+                thread.join()
+
+    def stats(self) -> list[StageStats]:
+        """Return queue depth, throughput and stall time for every stage."""
+
+        result = []
+        for stage in self._stages:
+            with stage.lock:
+                result.append(
+                    StageStats(
+                        name=stage.spec.name,
+                        workers=stage.spec.workers,
+                        capacity=stage.spec.workers * stage.spec.queue_size,
+                        queue_depth=sum(inbox.qsize() for inbox in stage.queues),
+                        processed=stage.processed,
+                        errors=stage.errors,
+                        busy_seconds=stage.busy_seconds,
+                        stalled_seconds=stage.stalled_seconds,
+                    )
+                )
+        return result
+
+    def memory_usage(self) -> int:
+        """Return the estimated bytes held by queued items."""
+
+        return sum(estimate_size(list(inbox.queue)) for stage in self._stages for inbox in stage.queues)
+
+    def _work(self, index: int, inbox: queue.Queue[Any]) -> None:
+        stage = self._stages[index]
+        next_stage = self._stages[index + 1] if index + 1 < len(self._stages) else None
+        while True:
+            envelope = inbox.get()
+            if envelope is _STOP:
+                return
+            key, item = envelope
+            started = time.perf_counter()
+            try:
+                result = stage.spec.handler(item)
+                failed = False
+            except Exception as exc:  # noqa: BLE001 - one bad item must not stop the stage
+                result, failed = None, True
+                self._logger.exception("Pipeline stage %s failed for %s: %s", stage.spec.name, key, exc)
+            elapsed = time.perf_counter() - started
+            with stage.lock:
+                stage.processed += 1
+                stage.errors += failed
+                stage.busy_seconds += elapsed
+            if result is not None and next_stage is not None:
+                self._put(next_stage, key, result, stage)
+            else:
+                self._finish()
+
+    def _put(self, target: _Stage, key: Hashable, item: Any, blocked: _Stage) -> None:
+        inbox = target.route(key)
+        try:
+            inbox.put_nowait((key, item))
+            return
+        except queue.Full:
+            pass
+        started = time.perf_counter()
+        inbox.put((key, item))
+        with blocked.lock:
+            blocked.stalled_seconds += time.perf_counter() - started
+
+    def _finish(self) -> None:
+        with self._idle:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.notify_all()
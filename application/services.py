@@ -2,23 +2,79 @@
 from __future__ import annotations
 
 import logging
+import threading
+import time
 from collections import defaultdict, deque
-from collections.abc import Callable
-from dataclasses import dataclass
-from datetime import timedelta
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
 from typing import Deque
 
-from config.settings import TradingBotSettings
+from application.memory import MemoryMonitor
+from application.pipeline import Pipeline, StageSpec, StageStats
+from config.settings import RiskSettings, StrategySettings, TradingBotSettings
 from domain.interfaces import MarketDataProvider, OrderExecutor, RiskManager, Strategy
-from domain.models import Candle, Instrument, Order
+from domain.models import Candle, Instrument, Order, SignalType, TradingSignal
+from domain.registry import InstrumentRegistry
+from utils.memory import estimate_collection_size, estimate_size
 from utils.time import IntervalScheduler, utc_now
 
+_FLAT = 1e-12
+
+# An instrument's symbol, the candle window its signals were generated from, and the signals.
+Evaluation = tuple[str, tuple[Candle, ...], Sequence[TradingSignal]]
+
 
 @dataclass
 class TradingContext:
     """State maintained by the trading bot for each instrument."""
 
     candles: Deque[Candle]
+    last_signal_cycle: int | None = None
+    deferred: bool = False
+
+
+@dataclass
+class ServiceMetrics:
+    """Counters describing the work performed by the trading loop."""
+
+    cycles: int = 0
+    candles: int = 0
+    signals: int = 0
+    orders_executed: int = 0
+    errors: int = 0
+    stale_candles: int = 0
+    deadline_misses: int = 0
+    deferred_instruments: int = 0
+
+
+@dataclass(frozen=True)
+class BootstrapStatus:
+    """Progress of the history bootstrap.
+
+    ``ready`` instruments have at least as many candles as the strategy's
+    longest window; ``warming_up`` ones are trading but still filling it from
+    live candles, and ``pending`` ones are still loading.
+    """
+
+    total: int
+    ready: tuple[str, ...]
+    warming_up: tuple[str, ...]
+    pending: tuple[str, ...]
+    failed: tuple[str, ...]
+
+    @property
+    def loaded(self) -> int:
+        """Return the number of instruments whose history load has finished."""
+
+        return self.total - len(self.pending)
+
+    @property
+    def complete(self) -> bool:
+        """Return whether every instrument has finished loading."""
+
+        return not self.pending
 
 
 class TradingBotService:
@@ -34,75 +90,501 @@ class TradingBotService:
         order_executor: OrderExecutor,
         scheduler_factory: Callable[[float], IntervalScheduler] = IntervalScheduler,
         execution_callback: Callable[[Order, str], None] | None = None,
+        cycle_callback: Callable[[ServiceMetrics], None] | None = None,
+        registry: InstrumentRegistry | None = None,
+        settings_source: Callable[[], TradingBotSettings | None] | None = None,
+        strategy_factory: Callable[[StrategySettings], Strategy] | None = None,
+        risk_factory: Callable[[RiskSettings], RiskManager] | None = None,
+        clock: Callable[[], datetime] = utc_now,
+        timer: Callable[[], float] = time.monotonic,
+        positions: Callable[[str], float] | None = None,
         logger: logging.Logger | None = None,
     ) -> None:
         self._settings = settings
+        if registry is None:
+            registry = InstrumentRegistry.from_config(settings.instruments, settings.instrument_details)
+        self._registry = registry
         self._market_data = market_data
         self._strategy = strategy
         self._risk_manager = risk_manager
         self._order_executor = order_executor
         self._scheduler = scheduler_factory(settings.poll_interval_seconds)
-        self._contexts: dict[str, TradingContext] = defaultdict(
-            lambda: TradingContext(candles=deque(maxlen=settings.history_limit))
-        )
+        self._contexts: dict[str, TradingContext] = defaultdict(self._new_context)
+        self._settings_source = settings_source
+        self._strategy_factory = strategy_factory
+        self._risk_factory = risk_factory
+        self._clock = clock
+        self._timer = timer
+        self._positions = positions
         self._execution_callback = execution_callback
+        self._cycle_callback = cycle_callback
+        self._metrics = ServiceMetrics()
+        self._metrics_lock = threading.Lock()
+        self._pipeline: Pipeline | None = None
+        self._deadline: float | None = None
+        self._bootstrap_lock = threading.Lock()
+        self._loading: set[str] = set()
+        self._bootstrap_failed: set[str] = set()
+        self._bootstrap_pool: ThreadPoolExecutor | None = None
+        self._memory_monitor: MemoryMonitor | None = None
         self._logger = logger or logging.getLogger(__name__)
 
+    @property
+    def metrics(self) -> ServiceMetrics:
+        """Return a snapshot of the counters collected so far."""
+
+        with self._metrics_lock:
+            return replace(self._metrics)
+
+    def memory_usage(self) -> dict[str, int]:
+        """Return estimated bytes per component: candle history per instrument, caches, queues and state.
+
+        Components that implement ``memory_usage()`` report their own parts;
+        the others are estimated by walking their object graph.
+        """
+
+        instruments = list(self._registry)
+        usage = {"instruments": estimate_size(instruments)}
+        for symbol, context in list(self._contexts.items()):
+            usage[f"history.{symbol}"] = estimate_collection_size(context.candles, shared=instruments)
+        components = {
+            "market_data": self._market_data,
+            "strategy": self._strategy,
+            "risk_manager": self._risk_manager,
+            "order_executor": self._order_executor,
+        }
+        for name, component in components.items():
+            report = getattr(component, "memory_usage", None)
+            if report is None:
+                usage[name] = estimate_size(component, shared=instruments)
+            else:
+                usage.update({f"{name}.{part}": size for part, size in report().items()})
+        if self._pipeline is not None:
+            usage["pipeline.queues"] = self._pipeline.memory_usage()
+        return usage
+
+    def trim_history(self, minimum: int) -> int:
+        """Halve every instrument's candle history, keeping at least ``minimum`` candles.
+
+        Returns the number of candles released. Call between cycles.
+        """
+
+        released = 0
+        for context in self._contexts.values():
+            capacity = context.candles.maxlen or len(context.candles)
+            keep = max(minimum, capacity // 2)
+            if keep < capacity:
+                released += max(0, len(context.candles) - keep)
+                context.candles = deque(context.candles, maxlen=keep)
+        self._logger.info("Trimmed candle histories, released %s candles", released)
+        return released
+
+    def pipeline_stats(self) -> list[StageStats]:
+        """Return queue depth and stall time per pipeline stage (empty when disabled)."""
+
+        pipeline = self._pipeline
+        return pipeline.stats() if pipeline is not None else []
+
+    def bootstrap_status(self) -> BootstrapStatus:
+        """Return which instruments are loading, warming up or ready to trade."""
+
+        with self._bootstrap_lock:
+            pending = set(self._loading)
+            failed = tuple(sorted(self._bootstrap_failed))
+        required = self._required_history()
+        ready: list[str] = []
+        warming_up: list[str] = []
+        symbols = self._registry.symbols
+        for symbol in symbols:
+            if symbol in pending:
+                continue
+            context = self._contexts.get(symbol)
+            loaded = len(context.candles) if context is not None else 0
+            (ready if loaded >= required else warming_up).append(symbol)
+        return BootstrapStatus(
+            total=len(symbols),
+            ready=tuple(ready),
+            warming_up=tuple(warming_up),
+            pending=tuple(symbol for symbol in symbols if symbol in pending),
+            failed=failed,
+        )
+
     def start(self) -> None:
-        """Start the trading loop."""
+        """Start the trading loop.
+
+        With ``bootstrap.background`` the loop starts before the history is
+        loaded, and each instrument is traded once its own history arrives.
+        """
 
         self._logger.info("Starting trading bot")
-        self._bootstrap_history()
-        self._scheduler.run(self._run_cycle)
+        if self._settings.bootstrap.background:
+            self._start_background_bootstrap()
+        else:
+            self._bootstrap_history()
+        self._start_memory_monitor()
+        try:
+            self._scheduler.run(self._run_cycle)
+        finally:
+            self._stop_background_bootstrap()
+            self._close_pipeline()
+            self._stop_memory_monitor()
 
     def stop(self) -> None:
-        """Stop the trading loop."""
+        """Stop the trading loop.
+
+        The cycle in progress finishes first; with the pipeline enabled its
+        queued work is drained before the workers exit.
+        """
 
         self._logger.info("Stopping trading bot")
         self._scheduler.stop()
 
+    def apply_settings(self, settings: TradingBotSettings) -> None:
+        """Apply a new configuration without restarting the trading loop.
+
+        Only the parts that changed are rebuilt: newly added instruments are
+        bootstrapped, removed ones are dropped, and the strategy or risk manager
+        is recreated only when its own settings differ. Everything is prepared
+        before any state is swapped, so a failing reload leaves the running
+        configuration untouched. Call between cycles. The CLI passes settings
+        re-read from the config file by :class:`~config.watcher.ConfigWatcher`;
+        environment variables changed after startup are not seen.
+        """
+
+        current = self._settings
+        strategy = self._strategy
+        if settings.strategy != current.strategy:
+            if self._strategy_factory is None:
+                self._logger.warning("Strategy settings changed but no strategy factory is configured")
+            else:
+                strategy = self._strategy_factory(settings.strategy)
+        risk_manager = self._risk_manager
+        if settings.risk != current.risk:
+            if self._risk_factory is None:
+                self._logger.warning("Risk settings changed but no risk factory is configured")
+            else:
+                risk_manager = self._risk_factory(settings.risk)
+        if settings.data_source != current.data_source:
+            self._logger.warning("Data source settings changed; restart the bot to apply them")
+        if settings.pipeline != current.pipeline and self._pipeline is not None:
+            self._logger.warning("Pipeline settings changed; restart the bot to apply them")
+        if settings.memory != current.memory:
+            self._logger.warning("Memory settings changed; restart the bot to apply them")
+
+        removed = [symbol for symbol in self._registry.symbols if symbol not in settings.instruments]
+        changed: list[Instrument] = []
+        for symbol in dict.fromkeys(settings.instruments):
+            details = settings.instrument_details.get(symbol) or {}
+            if symbol not in self._registry or details != (current.instrument_details.get(symbol) or {}):
+                changed.append(Instrument(symbol=symbol, **dict(details)))
+        added = [instrument for instrument in changed if instrument.symbol not in self._registry]
+        history = self._fetch_history(added, settings.history_limit)
+        strategy_rebuilt = strategy is not self._strategy
+        risk_rebuilt = risk_manager is not self._risk_manager
+
+        self._settings = settings
+        self._strategy = strategy
+        self._risk_manager = risk_manager
+        self._scheduler.interval_seconds = settings.poll_interval_seconds
+        for symbol in removed:
+            self._registry.unregister(symbol)
+            self._contexts.pop(symbol, None)
+            with self._bootstrap_lock:
+                self._loading.discard(symbol)
+                self._bootstrap_failed.discard(symbol)
+        for instrument in changed:
+            if instrument.symbol in self._registry:
+                self._registry.update(instrument)
+            else:
+                self._registry.register(instrument)
+        if settings.history_limit != current.history_limit:
+            for context in self._contexts.values():
+                context.candles = deque(context.candles, maxlen=settings.history_limit)
+        for symbol, candles in history.items():
+            self._contexts[symbol].candles.extend(candles)
+        self._logger.info(
+            "Applied configuration: %s instruments added, %s removed, strategy %s, risk manager %s",
+            len(added),
+            len(removed),
+            "rebuilt" if strategy_rebuilt else "unchanged",
+            "rebuilt" if risk_rebuilt else "unchanged",
+        )
+
+    def _new_context(self) -> TradingContext:
+        return TradingContext(candles=deque(maxlen=self._settings.history_limit))
+
+    def _load_history(self, instrument: Instrument, limit: int) -> Sequence[Candle]:
+        now = self._clock()
+        start = now - timedelta(seconds=limit * self._settings.data_source.candle_interval_seconds)
+        return self._market_data.get_historical_candles(instrument, start=start, end=now, limit=limit)
+
+    def _fetch_history(self, instruments: list[Instrument], limit: int) -> dict[str, list[Candle]]:
+        history: dict[str, list[Candle]] = {}
+        for instrument in instruments:
+            try:
+                history[instrument.symbol] = list(self._load_history(instrument, limit))
+            except Exception as exc:  # noqa: BLE001
+                history[instrument.symbol] = []
+                self._logger.exception("Failed to bootstrap history for %s: %s", instrument.symbol, exc)
+        return history
+
+    def _reload_settings(self) -> None:
+        if self._settings_source is None:
+            return
+        try:
+            settings = self._settings_source()
+            if settings is not None:
+                self.apply_settings(settings)
+        except Exception as exc:  # noqa: BLE001
+            self._count("errors")
+            self._logger.exception("Failed to apply configuration update: %s", exc)
+
     def _bootstrap_history(self) -> None:
-        now = utc_now()
-        start = now - timedelta(minutes=self._settings.history_limit)
-        for symbol in self._settings.instruments:
-            instrument = Instrument(symbol=symbol)
-            candles = self._market_data.get_historical_candles(
-                instrument, start=start, end=now, limit=self._settings.history_limit
-            )
-            context = self._contexts[symbol]
+        """Load every instrument's history in parallel and wait for all of it.
+
+        As in the background bootstrap, an instrument whose load fails is
+        reported as failed and warms up from live candles instead.
+        """
+
+        self._submit_bootstrap().shutdown(wait=True)
+
+    def _start_background_bootstrap(self) -> None:
+        self._bootstrap_pool = self._submit_bootstrap()
+        self._logger.info("Loading history for %s instruments in the background", len(self._registry))
+
+    def _submit_bootstrap(self) -> ThreadPoolExecutor:
+        instruments = list(self._registry)
+        for instrument in instruments:
+            self._contexts[instrument.symbol]  # created here, not concurrently by the workers
+        with self._bootstrap_lock:
+            self._loading.update(instrument.symbol for instrument in instruments)
+        workers = max(1, min(self._settings.bootstrap.workers, len(instruments)))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bootstrap")
+        for instrument in instruments:
+            pool.submit(self._bootstrap_instrument, instrument)
+        return pool
+
+    def _bootstrap_instrument(self, instrument: Instrument) -> None:
+        symbol = instrument.symbol
+        try:
+            candles = self._load_history(instrument, self._settings.history_limit)
+            failed = False
+        except Exception as exc:  # noqa: BLE001 - the instrument warms up from live candles instead
+            candles, failed = [], True
+            self._count("errors")
+            self._logger.exception("Failed to bootstrap history for %s: %s", symbol, exc)
+        context = self._contexts.get(symbol)
+        if context is not None:
             context.candles.extend(candles)
-            self._logger.debug("Bootstrapped %s candles for %s", len(context.candles), symbol)
+        with self._bootstrap_lock:
+            self._loading.discard(symbol)
+            if failed:
+                self._bootstrap_failed.add(symbol)
+            remaining = len(self._loading)
+        loaded = len(context.candles) if context is not None else 0
+        required = self._required_history()
+        self._logger.info(
+            "History for %s loaded: %s candles (%s), %s instruments still loading",
+            symbol,
+            loaded,
+            "ready" if loaded >= required else f"warming up to {required}",
+            remaining,
+        )
+
+    def _stop_background_bootstrap(self) -> None:
+        pool, self._bootstrap_pool = self._bootstrap_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _required_history(self) -> int:
+        """Return the candles the strategy needs, capped by the history kept per instrument."""
+
+        strategy = self._settings.strategy
+        windows = [strategy.long_window, *(variant.get("long_window", 0) for variant in strategy.variants)]
+        return min(max(windows), self._settings.history_limit)
 
     def _run_cycle(self) -> None:
-        for symbol in self._settings.instruments:
-            instrument = Instrument(symbol=symbol)
-            try:
-                candle = self._market_data.get_latest_candle(instrument)
-            except Exception as exc:  # noqa: BLE001 - propagate with logging
-                self._logger.exception("Failed to fetch candle for %s: %s", symbol, exc)
-                continue
-            context = self._contexts[symbol]
-            context.candles.append(candle)
-            self._logger.debug("Appended candle for %s at %s", symbol, candle.timestamp.isoformat())
+        started = self._timer()
+        self._reload_settings()
+        instruments = list(self._registry)
+        with self._bootstrap_lock:
+            loading = set(self._loading)
+        if loading:
+            instruments = [instrument for instrument in instruments if instrument.symbol not in loading]
+        fraction = self._settings.cycle.deadline_fraction
+        if fraction is not None:
+            self._deadline = started + fraction * self._settings.poll_interval_seconds
+            instruments.sort(key=self._priority)
+        deferred_before = self.metrics.deferred_instruments
+        pipeline = self._pipeline
+        if pipeline is None and self._settings.pipeline.enabled:
+            pipeline = self._pipeline = self._build_pipeline()
+        try:
+            if pipeline is not None:
+                for instrument in instruments:
+                    pipeline.submit(instrument.symbol, instrument)
+                pipeline.join()
+            else:
+                for instrument in instruments:
+                    fetched = self._fetch_stage(instrument)
+                    evaluated = self._evaluate_stage(fetched) if fetched is not None else None
+                    if evaluated is not None:
+                        self._execute_stage(evaluated)
+        finally:
+            self._deadline = None
+        deferred = self.metrics.deferred_instruments - deferred_before
+        if deferred:
+            self._count("deadline_misses")
+            self._logger.warning("Cycle deadline reached; deferred %s instruments to the next cycle", deferred)
+        self._count("cycles")
+        if self._memory_monitor is not None:
+            self._check_memory()
+        if self._cycle_callback is not None:
+            self._cycle_callback(self.metrics)
+
+    def _priority(self, instrument: Instrument) -> tuple[bool, bool, bool]:
+        """Sort key putting pending exits, then recent signals, then deferred instruments first."""
+
+        symbol = instrument.symbol
+        pending_exit = self._positions is not None and abs(self._positions(symbol)) > _FLAT
+        context = self._contexts.get(symbol)
+        if context is None:
+            return not pending_exit, True, True
+        recent = (
+            context.last_signal_cycle is not None
+            and self._metrics.cycles - context.last_signal_cycle < self._settings.cycle.recent_signal_cycles
+        )
+        return not pending_exit, not recent, not context.deferred
+
+    def _fetch_stage(self, instrument: Instrument) -> tuple[Instrument, Candle] | None:
+        """Fetch the latest candle, or return ``None`` when it failed or the cycle deadline has passed."""
+
+        deadline = self._deadline
+        if deadline is not None:
+            context = self._contexts[instrument.symbol]
+            context.deferred = self._timer() >= deadline
+            if context.deferred:
+                self._count("deferred_instruments")
+                self._logger.debug("Deferred %s to the next cycle", instrument.symbol)
+                return None
+        try:
+            return instrument, self._market_data.get_latest_candle(instrument)
+        except Exception as exc:  # noqa: BLE001 - propagate with logging
+            self._count("errors")
+            self._logger.exception("Failed to fetch candle for %s: %s", instrument.symbol, exc)
+            return None
+
+    def _evaluate_stage(self, fetched: tuple[Instrument, Candle]) -> Evaluation | None:
+        """Append a new candle and generate its signals, or return ``None`` when there is nothing to do."""
+
+        instrument, candle = fetched
+        symbol = instrument.symbol
+        context = self._contexts[symbol]
+        if context.candles and candle.timestamp <= context.candles[-1].timestamp:
+            # Polling faster than the candle period returns the same candle again;
+            # re-evaluating it could only repeat the previous decision.
+            self._count("stale_candles")
+            self._logger.debug("No new candle for %s since %s", symbol, context.candles[-1].timestamp.isoformat())
+            return None
+        context.candles.append(candle)
+        self._count("candles")
+        self._logger.debug("Appended candle for %s at %s", symbol, candle.timestamp.isoformat())
+        window = tuple(context.candles)
+        try:
+            signals = self._strategy.generate_signals(window)
+            if any(signal.signal_type != SignalType.HOLD for signal in signals):
+                context.last_signal_cycle = self._metrics.cycles
+            return symbol, window, signals
+        except Exception as exc:  # noqa: BLE001
+            self._count("errors")
+            self._logger.exception("Strategy failed for %s: %s", symbol, exc)
+            return None
+
+    def _execute_stage(self, evaluated: Evaluation) -> None:
+        """Assess every signal, execute the approved orders and tell the strategy which were acted upon.
+
+        Assessment happens here rather than in :meth:`_evaluate_stage` so that a
+        risk manager tracking the portfolio sees every earlier order executed
+        before it sizes the next one.
+        """
+
+        symbol, window, signals = evaluated
+        signal_executed = getattr(self._strategy, "signal_executed", None)
+        for signal in signals:
+            self._count("signals")
             try:
-                signal = self._strategy.generate_signal(tuple(context.candles))
-                assessment = self._risk_manager.assess(signal, tuple(context.candles))
+                assessment = self._risk_manager.assess(signal, window)
             except Exception as exc:  # noqa: BLE001
-                self._logger.exception("Strategy or risk manager failed for %s: %s", symbol, exc)
+                self._count("errors")
+                self._logger.exception("Risk manager failed for %s: %s", symbol, exc)
                 continue
             if not assessment.approved or assessment.order is None:
                 self._logger.info("Signal rejected for %s: %s", symbol, assessment.reason)
                 continue
             try:
                 execution_id = self._order_executor.execute(assessment.order)
+                self._count("orders_executed")
                 self._logger.info("Order executed for %s with id %s", symbol, execution_id)
+                if signal_executed is not None:
+                    signal_executed(signal)
                 if self._execution_callback is not None:
                     self._execution_callback(assessment.order, execution_id)
             except Exception as exc:  # noqa: BLE001
+                self._count("errors")
                 self._logger.exception("Order execution failed for %s: %s", symbol, exc)
 
+    def _build_pipeline(self) -> Pipeline:
+        settings = self._settings.pipeline
+        return Pipeline(
+            [
+                StageSpec("fetch", self._fetch_stage, settings.fetch_workers, settings.queue_size),
+                StageSpec("evaluate", self._evaluate_stage, settings.evaluate_workers, settings.queue_size),
+                StageSpec("execute", self._execute_stage, settings.execute_workers, settings.queue_size),
+            ],
+            logger=self._logger,
+        ).start()
+
+    def _close_pipeline(self) -> None:
+        pipeline, self._pipeline = self._pipeline, None
+        if pipeline is not None:
+            pipeline.close()
+
+    def _start_memory_monitor(self) -> None:
+        settings = self._settings.memory
+        if not settings.enabled or self._memory_monitor is not None:
+            return
+        self._memory_monitor = MemoryMonitor(
+            settings,
+            components=self.memory_usage,
+            trim=lambda: self.trim_history(settings.min_history),
+            logger=self._logger,
+        )
+        self._memory_monitor.start()
+
+    def _stop_memory_monitor(self) -> None:
+        monitor, self._memory_monitor = self._memory_monitor, None
+        if monitor is not None:
+            monitor.stop()
+
+    def _check_memory(self) -> None:
+        assert self._memory_monitor is not None
+        try:
+            self._memory_monitor.check(self._metrics.cycles)
+        except Exception as exc:  # noqa: BLE001 - instrumentation must not stop trading
+            self._count("errors")
+            self._logger.exception("Memory report failed: %s", exc)
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._metrics_lock:
+            setattr(self._metrics, name, getattr(self._metrics, name) + amount)
+
     def run_once(self) -> None:
         """Execute a single trading cycle. Useful for tests and manual runs."""
 
         self._bootstrap_history()
-        self._run_cycle()
+        self._start_memory_monitor()
+        try:
+            self._run_cycle()
+        finally:
+            self._close_pipeline()
+            self._stop_memory_monitor()
@@ -0,0 +1,186 @@
+"""End-to-end load benchmark against the local mock exchange.
+
+Starts a :class:`~infrastructure.mock_exchange.MockExchangeServer`, wires the
+real service with :func:`presentation.cli.build_service` (HTTP market data and
+order clients included) and runs back-to-back trading cycles over many
+instruments, reporting throughput and cycle latency.
+
+Run with ``python -m benchmarks.load --instruments 50 --cycles 20``.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from config.settings import (
+    DataSourceSettings,
+    PipelineSettings,
+    RateLimitSettings,
+    StrategySettings,
+    TradingBotSettings,
+)
+from infrastructure.mock_exchange import MockExchangeServer, MockExchangeSettings
+from presentation.cli import build_service
+
+
+class _SteppedClock:
+    """Exchange clock that moves one candle period forward per trading cycle."""
+
+    def __init__(self, step: timedelta) -> None:
+        self._now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self._step = step
+
+    def __call__(self) -> datetime:
+        return self._now
+
+    def advance(self) -> None:
+        self._now += self._step
+
+
+@dataclass
+class LoadResult:
+    """Outcome of a load run."""
+
+    cycles: int
+    seconds: float
+    requests: int
+    not_modified: int
+    rate_limited: int
+    orders: int
+    errors: int
+    cycle_seconds: list[float]
+
+    @property
+    def cycles_per_second(self) -> float:
+        return self.cycles / self.seconds if self.seconds else 0.0
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Return the cycle duration at ``fraction`` (0-1) of the sorted samples."""
+
+        ordered = sorted(self.cycle_seconds)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_load(
+    *,
+    instruments: int = 20,
+    cycles: int = 10,
+    history_limit: int = 50,
+    exchange_settings: MockExchangeSettings | None = None,
+    new_candle_every_cycle: bool = True,
+    pipeline: bool = False,
+    client_rate_limit: float | None = None,
+) -> LoadResult:
+    """Run ``cycles`` trading cycles over ``instruments`` symbols against a mock exchange.
+
+    By default the exchange clock advances one candle per cycle, so every
+    cycle evaluates a fresh candle. Otherwise cycles poll an unchanged candle,
+    which measures the cost of conditional requests and skipped evaluation.
+    ``pipeline`` runs cycles through the staged fetch/evaluate/execute pipeline.
+    ``client_rate_limit`` enables the bot's own limiter at that many requests
+    per second.
+    """
+
+    exchange_settings = exchange_settings or MockExchangeSettings()
+    clock = _SteppedClock(timedelta(seconds=exchange_settings.candle_interval_seconds))
+    with MockExchangeServer(exchange_settings, clock=clock) as server:
+        settings = TradingBotSettings(
+            instruments=[f"SYM{index:04d}" for index in range(instruments)],
+            poll_interval_seconds=1e-6,
+            history_limit=history_limit,
+            data_source=DataSourceSettings(
+                base_url=server.base_url,
+                retries=3,
+                rate_limit=RateLimitSettings(requests_per_second=client_rate_limit),
+            ),
+            strategy=StrategySettings(short_window=5, long_window=20),
+            pipeline=PipelineSettings(enabled=pipeline),
+        )
+        cycle_ends: list[float] = []
+
+        def _on_cycle(metrics) -> None:  # noqa: ANN001 - ServiceMetrics
+            cycle_ends.append(time.perf_counter())
+            if new_candle_every_cycle:
+                clock.advance()
+            if metrics.cycles >= cycles:
+                service.stop()
+
+        service = build_service(
+            settings,
+            execution_callback=lambda order, execution_id: None,
+            cycle_callback=_on_cycle,
+            clock=clock,
+        )
+        started = time.perf_counter()
+        service.start()
+        elapsed = time.perf_counter() - started
+        stats = server.exchange.stats
+        boundaries = [started, *cycle_ends]
+        return LoadResult(
+            cycles=service.metrics.cycles,
+            seconds=elapsed,
+            requests=stats.requests,
+            not_modified=stats.not_modified,
+            rate_limited=stats.rate_limited,
+            orders=stats.orders,
+            errors=service.metrics.errors,
+            cycle_seconds=[end - begin for begin, end in zip(boundaries, boundaries[1:])],
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the trading loop against a local mock exchange")
+    parser.add_argument("--instruments", type=int, default=20, help="Number of instruments to trade")
+    parser.add_argument("--cycles", type=int, default=10, help="Trading cycles to run")
+    parser.add_argument("--history-limit", type=int, default=50, help="Candles bootstrapped per instrument")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Exchange latency per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected 503")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Exchange requests per second")
+    parser.add_argument(
+        "--idle", action="store_true", help="Keep the latest candle unchanged to measure polling overhead"
+    )
+    parser.add_argument(
+        "--client-rate-limit", type=float, default=None, help="Requests per second allowed by the bot's limiter"
+    )
+    parser.add_argument("--pipeline", action="store_true", help="Run cycles through the staged pipeline")
+    args = parser.parse_args(argv)
+
+    result = run_load(
+        instruments=args.instruments,
+        cycles=args.cycles,
+        history_limit=args.history_limit,
+        exchange_settings=MockExchangeSettings(
+            latency_seconds=args.latency_ms / 1000,
+            error_rate=args.error_rate,
+            rate_limit_per_second=args.rate_limit,
+        ),
+        new_candle_every_cycle=not args.idle,
+        pipeline=args.pipeline,
+        client_rate_limit=args.client_rate_limit,
+    )
+    print(f"cycles:        {result.cycles} in {result.seconds:.2f} s ({result.cycles_per_second:.1f}/s)")
+    print(
+        f"http requests: {result.requests} ({result.requests_per_second:.0f}/s), "
+        f"{result.not_modified} answered 304 Not Modified, {result.rate_limited} answered 429"
+    )
+    print(f"orders filled: {result.orders}, cycle errors: {result.errors}")
+    if result.cycle_seconds:
+        print(
+            f"cycle latency: p50 {result.percentile(0.5) * 1000:.1f} ms, "
+            f"p95 {result.percentile(0.95) * 1000:.1f} ms, "
+            f"mean {statistics.fmean(result.cycle_seconds) * 1000:.1f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    raise SystemExit(main())
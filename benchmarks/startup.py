@@ -0,0 +1,145 @@
+"""Startup benchmark for cron-style ``--once`` runs.
+
+Measures, in fresh interpreter processes:
+
+* the cold import time of :mod:`presentation.cli`;
+* the time from the first import until a full ``--once`` cycle (config load,
+  wiring, history bootstrap, one trading cycle) has completed against a local
+  mock exchange.
+
+Run with ``python -m benchmarks.startup``. The process exits with status 1
+when either measurement exceeds its budget. The timings depend on the machine,
+so the test suite only checks :func:`measure_import` and
+:func:`modules_after_build` for the modules each step imports.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from infrastructure.mock_exchange import MockExchangeServer
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+IMPORT_BUDGET_SECONDS = 0.5
+FIRST_CYCLE_BUDGET_SECONDS = 3.0
+HEAVY_MODULES = (
+    "requests",
+    "yaml",
+    "infrastructure.market_data",
+    "infrastructure.order_execution",
+    "presentation.supervisor",
+    "risk.basic",
+    "strategies.sma",
+)
+OPTIONAL_MODULES = (
+    "infrastructure.paper",
+    "infrastructure.replay",
+    "infrastructure.tape",
+    "risk.volatility",
+    "strategies.edge",
+    "strategies.graph",
+    "strategies.timeframe",
+    "utils.datasets",
+)
+
+_IMPORT_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import presentation.cli
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+_BUILD_SNIPPET = """
+import json, sys
+from pathlib import Path
+from config.loader import ConfigLoader
+from presentation.cli import build_service
+build_service(ConfigLoader().load(Path(sys.argv[1])), execution_callback=lambda order, execution_id: None)
+print(json.dumps([m for m in %r if m in sys.modules]))
+""" % (HEAVY_MODULES + OPTIONAL_MODULES,)
+
+_FIRST_CYCLE_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+from presentation.cli import main
+main(["--once", "--config", sys.argv[1], "--log-level", "WARNING"])
+print(time.perf_counter() - start)
+"""
+
+
+def _run_python(snippet: str, *args: str, cwd: Path | None = None) -> str:
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT), PYTHONDONTWRITEBYTECODE="1")
+    env = {key: value for key, value in env.items() if not key.startswith("TRADING_BOT_")}
+    result = subprocess.run(
+        [sys.executable, "-c", snippet, *args],
+        cwd=cwd or REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+def measure_import(runs: int = 5) -> tuple[float, list[str]]:
+    """Return the best cold import time of the CLI and the heavy modules it loaded."""
+
+    samples = [json.loads(_run_python(_IMPORT_SNIPPET)) for _ in range(runs)]
+    best = min(samples, key=lambda sample: sample["seconds"])
+    return best["seconds"], best["loaded"]
+
+
+def modules_after_build(config: str) -> list[str]:
+    """Return the heavy and optional modules loaded once ``build_service`` has wired ``config``."""
+
+    with tempfile.TemporaryDirectory() as workdir:
+        config_path = Path(workdir) / "config.yaml"
+        config_path.write_text(config, encoding="utf-8")
+        return json.loads(_run_python(_BUILD_SNIPPET, str(config_path), cwd=Path(workdir)))
+
+
+def measure_first_cycle(runs: int = 3) -> float:
+    """Return the best time from first import to a completed ``--once`` cycle."""
+
+    timings: list[float] = []
+    with MockExchangeServer() as exchange, tempfile.TemporaryDirectory() as workdir:
+        config_path = Path(workdir) / "config.yaml"
+        config_path.write_text(
+            "instruments: [EURUSD]\n"
+            "history_limit: 5\n"
+            "strategy: {short_window: 2, long_window: 3}\n"
+            f"data_source: {{base_url: '{exchange.base_url}', retries: 1}}\n",
+            encoding="utf-8",
+        )
+        for _ in range(runs):
+            timings.append(float(_run_python(_FIRST_CYCLE_SNIPPET, str(config_path), cwd=Path(workdir))))
+    return min(timings)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure CLI startup cost")
+    parser.add_argument("--runs", type=int, default=5, help="Samples per measurement")
+    args = parser.parse_args(argv)
+
+    import_seconds, loaded = measure_import(args.runs)
+    first_cycle_seconds = measure_first_cycle(args.runs)
+    print(f"import presentation.cli: {import_seconds * 1000:.1f} ms (budget {IMPORT_BUDGET_SECONDS * 1000:.0f} ms)")
+    print(f"first --once cycle:     {first_cycle_seconds * 1000:.1f} ms (budget {FIRST_CYCLE_BUDGET_SECONDS * 1000:.0f} ms)")
+    if loaded:
+        print(f"heavy modules imported eagerly: {', '.join(loaded)}")
+    within_budget = (
+        not loaded
+        and import_seconds <= IMPORT_BUDGET_SECONDS
+        and first_cycle_seconds <= FIRST_CYCLE_BUDGET_SECONDS
+    )
+    return 0 if within_budget else 1
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    raise SystemExit(main())
@@ -5,8 +5,6 @@ import os
 from pathlib import Path
 from typing import Any, Mapping
 
-import yaml
-
 from config.settings import DEFAULT_CONFIG_PATH, DEFAULT_ENV_PREFIX, TradingBotSettings, update_dataclass
 
 
@@ -22,6 +20,8 @@ class ConfigLoader:
         settings = TradingBotSettings(instruments=["EURUSD"])
         path = path or DEFAULT_CONFIG_PATH
         if path.exists():
+            import yaml  # deferred: only needed when a config file is present
+
             with path.open("r", encoding="utf-8") as fh:
                 data = yaml.safe_load(fh) or {}
             update_dataclass(settings, data)
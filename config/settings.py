@@ -6,30 +6,123 @@ from pathlib import Path
 from collections.abc import MutableSequence
 from typing import Any, Mapping
 
+from utils.time import parse_timeframe
 from utils.validation import ensure_positive_number, ensure_within_range
 
 
+@dataclass
+class RateLimitSettings:
+    """Client-side request budget shared by the market data and order clients.
+
+    ``requests_per_second`` caps all requests to the venue together, while
+    ``market_data_per_second`` and ``orders_per_second`` cap one endpoint
+    class each; ``None`` leaves a limit off. ``burst`` is the number of
+    requests that may be sent back to back. A ``429`` response halves the
+    affected rates (never below ``min_rate_fraction`` of the configured
+    value) and pauses them for its ``Retry-After``; rates then recover
+    linearly over ``recovery_seconds``.
+    """
+
+    requests_per_second: float | None = None
+    market_data_per_second: float | None = None
+    orders_per_second: float | None = None
+    burst: int = 5
+    min_rate_fraction: float = 0.1
+    recovery_seconds: float = 30.0
+
+    def __post_init__(self) -> None:
+        for rate, name in (
+            (self.requests_per_second, "Requests per second"),
+            (self.market_data_per_second, "Market data requests per second"),
+            (self.orders_per_second, "Order requests per second"),
+        ):
+            if rate is not None:
+                ensure_positive_number(rate, f"{name} must be positive")
+        ensure_positive_number(self.burst, "Rate limit burst must be positive")
+        ensure_within_range(
+            self.min_rate_fraction, minimum=0.01, maximum=1.0, message="Minimum rate fraction must be between 0.01 and 1"
+        )
+        ensure_positive_number(self.recovery_seconds, "Rate recovery time must be positive")
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether any limit is configured."""
+
+        return any(
+            rate is not None
+            for rate in (self.requests_per_second, self.market_data_per_second, self.orders_per_second)
+        )
+
+
 @dataclass
 class DataSourceSettings:
-    """Configuration for the market data provider."""
+    """Configuration for the market data provider.
+
+    When ``replay_directory`` is set, candles are replayed from recorded
+    ``<SYMBOL>.candles`` files in that directory instead of the HTTP API,
+    after the first ``history_limit`` candles of each file have been served as
+    start-up history; ``replay_validate`` checks every file in full on open.
+    ``paper_trading`` fills orders locally instead of sending them to the
+    order endpoint. ``tape_directory`` records every raw API response to
+    compressed tapes; ``replay_tape_directory`` serves responses from such a
+    tape instead, paced by ``replay_speed`` (``None`` replays unpaced).
+    ``rate_limit`` throttles the HTTP clients on the client side.
+    Historical ranges longer than ``history_page_size`` candles of
+    ``candle_interval_seconds`` are fetched as time-sliced pages, up to
+    ``history_page_workers`` at a time.
+    """
 
     base_url: str
     timeout_seconds: float = 5.0
     retries: int = 3
+    replay_directory: str | None = None
+    replay_validate: bool = False
+    paper_trading: bool = False
+    tape_directory: str | None = None
+    replay_tape_directory: str | None = None
+    replay_speed: float | None = None
+    rate_limit: RateLimitSettings = field(default_factory=RateLimitSettings)
+    candle_interval_seconds: float = 60.0
+    history_page_size: int = 1000
+    history_page_workers: int = 4
 
     def __post_init__(self) -> None:
         ensure_positive_number(self.timeout_seconds, "Timeout must be positive")
         ensure_positive_number(self.retries, "Retries must be positive")
+        ensure_positive_number(self.candle_interval_seconds, "Candle interval must be positive")
+        ensure_positive_number(self.history_page_size, "History page size must be positive")
+        ensure_positive_number(self.history_page_workers, "History page workers must be positive")
+        if self.replay_speed is not None:
+            ensure_positive_number(self.replay_speed, "Replay speed must be positive")
+
+
+SIGNAL_MODES = ("level", "edge")
 
 
 @dataclass
 class StrategySettings:
-    """Configuration for the SMA crossover strategy."""
+    """Configuration for the SMA crossover strategy.
+
+    When ``variants`` lists several ``{short_window, long_window}`` pairs, the bot
+    runs all of them over a shared indicator graph instead of the single pair.
+    ``signal_mode="edge"`` only emits a signal when it differs from the last one
+    for the instrument; that state is persisted at ``signal_state_path``.
+    ``timeframe`` (e.g. ``"15m"``) evaluates the strategy on bars resampled
+    from the polled candles, once per completed bar.
+    """
 
     short_window: int = 5
     long_window: int = 20
+    variants: list[dict[str, int]] = field(default_factory=list)
+    signal_mode: str = "level"
+    signal_state_path: str = "data/signal_state.jsonl"
+    timeframe: str | None = None
 
     def __post_init__(self) -> None:
+        if self.signal_mode not in SIGNAL_MODES:
+            raise ValueError(f"Signal mode must be one of {', '.join(SIGNAL_MODES)}")
+        if self.timeframe is not None:
+            parse_timeframe(self.timeframe)
         ensure_positive_number(self.short_window, "Short window must be positive")
         ensure_positive_number(self.long_window, "Long window must be positive")
         if self.short_window >= self.long_window:
@@ -38,16 +131,136 @@ class StrategySettings:
 
 @dataclass
 class RiskSettings:
-    """Configuration parameters for the risk manager."""
+    """Configuration parameters for the risk manager.
+
+    Setting ``volatility_window`` switches from fixed percentage stops to stops
+    placed a multiple of the average true range away from the entry price.
+    """
 
     max_position_size: float = 1.0
     stop_loss_pct: float = 0.02
     take_profit_pct: float = 0.04
+    max_total_exposure: float | None = None
+    volatility_window: int | None = None
+    stop_loss_atr_multiple: float = 2.0
+    take_profit_atr_multiple: float = 4.0
+    risk_per_trade: float | None = None
 
     def __post_init__(self) -> None:
         ensure_positive_number(self.max_position_size, "Max position size must be positive")
         ensure_within_range(self.stop_loss_pct, minimum=0.0, maximum=1.0, message="Stop loss pct must be between 0 and 1")
         ensure_within_range(self.take_profit_pct, minimum=0.0, maximum=1.0, message="Take profit pct must be between 0 and 1")
+        if self.max_total_exposure is not None:
+            ensure_positive_number(self.max_total_exposure, "Max total exposure must be positive")
+        if self.volatility_window is not None:
+            ensure_positive_number(self.volatility_window, "Volatility window must be positive")
+        ensure_positive_number(self.stop_loss_atr_multiple, "Stop loss ATR multiple must be positive")
+        ensure_positive_number(self.take_profit_atr_multiple, "Take profit ATR multiple must be positive")
+        if self.risk_per_trade is not None:
+            ensure_positive_number(self.risk_per_trade, "Risk per trade must be positive")
+
+
+@dataclass
+class PipelineSettings:
+    """Configuration of the staged fetch, evaluate and execute pipeline.
+
+    When ``enabled``, each trading cycle runs through three stages with their
+    own worker pools and bounded queues, so fetching one instrument overlaps
+    with evaluating and executing others. Risk assessment runs in the execute
+    stage, right before each order is submitted, so with the default single
+    execute worker every order is sized against a portfolio that already holds
+    the orders executed before it. More execute workers submit orders in
+    parallel, but then portfolio limits are checked without the orders other
+    workers still have in flight.
+    """
+
+    enabled: bool = False
+    fetch_workers: int = 4
+    evaluate_workers: int = 1
+    execute_workers: int = 1
+    queue_size: int = 64
+
+    def __post_init__(self) -> None:
+        ensure_positive_number(self.fetch_workers, "Fetch workers must be positive")
+        ensure_positive_number(self.evaluate_workers, "Evaluate workers must be positive")
+        ensure_positive_number(self.execute_workers, "Execute workers must be positive")
+        ensure_positive_number(self.queue_size, "Pipeline queue size must be positive")
+
+
+MEMORY_BUDGET_ACTIONS = ("warn", "trim")
+
+
+@dataclass
+class MemorySettings:
+    """Opt-in memory instrumentation.
+
+    When ``enabled``, byte estimates per component (candle history per
+    instrument, caches, queues, strategy and risk state) are appended to
+    ``<output_directory>/memory.jsonl`` every ``report_interval_cycles``
+    cycles. With ``tracemalloc`` the largest allocation growth since the
+    previous report is written next to it. ``budget_bytes`` caps the accounted
+    total: exceeding it logs a warning, and ``budget_action="trim"`` also
+    halves the candle histories, never below ``min_history`` candles.
+    """
+
+    enabled: bool = False
+    report_interval_cycles: int = 100
+    output_directory: str = "data/memory"
+    tracemalloc: bool = True
+    tracemalloc_frames: int = 1
+    snapshot_top: int = 20
+    budget_bytes: int | None = None
+    budget_action: str = "warn"
+    min_history: int = 50
+
+    def __post_init__(self) -> None:
+        if self.budget_action not in MEMORY_BUDGET_ACTIONS:
+            raise ValueError(f"Memory budget action must be one of {', '.join(MEMORY_BUDGET_ACTIONS)}")
+        ensure_positive_number(self.report_interval_cycles, "Memory report interval must be positive")
+        ensure_positive_number(self.tracemalloc_frames, "Tracemalloc frames must be positive")
+        ensure_positive_number(self.snapshot_top, "Snapshot size must be positive")
+        ensure_positive_number(self.min_history, "Minimum history must be positive")
+        if self.budget_bytes is not None:
+            ensure_positive_number(self.budget_bytes, "Memory budget must be positive")
+
+
+@dataclass
+class CycleSettings:
+    """Latency budget of a trading cycle.
+
+    With ``deadline_fraction`` set, a cycle stops starting instruments once
+    that fraction of ``poll_interval_seconds`` has passed; the rest are
+    deferred to the next cycle and fetch the latest candle then. Instruments
+    with an open position (a pending exit) go first, then those with a signal
+    in the last ``recent_signal_cycles`` cycles, then the deferred ones.
+    """
+
+    deadline_fraction: float | None = None
+    recent_signal_cycles: int = 5
+
+    def __post_init__(self) -> None:
+        if self.deadline_fraction is not None:
+            ensure_within_range(
+                self.deadline_fraction, minimum=0.01, maximum=1.0, message="Deadline fraction must be between 0.01 and 1"
+            )
+        ensure_positive_number(self.recent_signal_cycles, "Recent signal cycles must be positive")
+
+
+@dataclass
+class BootstrapSettings:
+    """Loading of candle history at start-up.
+
+    History is fetched by ``workers`` threads in parallel. With
+    ``background``, :meth:`TradingBotService.start` does not wait for it: the
+    trading loop starts at once and each instrument joins as soon as its own
+    history is loaded.
+    """
+
+    workers: int = 4
+    background: bool = False
+
+    def __post_init__(self) -> None:
+        ensure_positive_number(self.workers, "Bootstrap workers must be positive")
 
 
 @dataclass
@@ -60,6 +273,11 @@ class TradingBotSettings:
     data_source: DataSourceSettings = field(default_factory=lambda: DataSourceSettings(base_url="http://localhost"))
     strategy: StrategySettings = field(default_factory=StrategySettings)
     risk: RiskSettings = field(default_factory=RiskSettings)
+    instrument_details: dict[str, dict[str, Any]] = field(default_factory=dict)
+    pipeline: PipelineSettings = field(default_factory=PipelineSettings)
+    memory: MemorySettings = field(default_factory=MemorySettings)
+    cycle: CycleSettings = field(default_factory=CycleSettings)
+    bootstrap: BootstrapSettings = field(default_factory=BootstrapSettings)
 
     def __post_init__(self) -> None:
         if not self.instruments:
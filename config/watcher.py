@@ -0,0 +1,62 @@
+"""Detect configuration changes for hot reloading."""
+from __future__ import annotations
+
+import logging
+import threading
+from pathlib import Path
+
+from config.loader import ConfigLoader
+from config.settings import DEFAULT_CONFIG_PATH, TradingBotSettings
+
+
+class ConfigWatcher:
+    """Reload settings when the config file changes or a reload is requested.
+
+    :meth:`poll` is cheap (a single ``stat`` call) and is meant to be invoked
+    between trading cycles. :meth:`request_reload` is safe to call from a
+    signal handler and forces the next poll to re-read the file even if it
+    looks unchanged. Environment overrides are reapplied from the process's own
+    environment, which is fixed when the bot starts, so changing
+    ``TRADING_BOT_*`` variables in a shell has no effect until a restart.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        loader: ConfigLoader | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self._path = path or DEFAULT_CONFIG_PATH
+        self._loader = loader or ConfigLoader()
+        self._logger = logger or logging.getLogger(__name__)
+        self._reload_requested = threading.Event()
+        self._signature = self._file_signature()
+
+    def request_reload(self) -> None:
+        """Force the next :meth:`poll` to reload the configuration."""
+
+        self._reload_requested.set()
+
+    def poll(self) -> TradingBotSettings | None:
+        """Return freshly loaded settings if a reload is due, otherwise ``None``."""
+
+        signature = self._file_signature()
+        if signature == self._signature and not self._reload_requested.is_set():
+            return None
+        self._reload_requested.clear()
+        self._signature = signature
+        try:
+            settings = self._loader.load(self._path)
+        except Exception as exc:  # noqa: BLE001 - keep running with the previous configuration
+            self._logger.error("Ignoring invalid configuration in %s: %s", self._path, exc)
+            return None
+        self._logger.info("Reloaded configuration from %s", self._path)
+        return settings
+
+    def _file_signature(self) -> tuple[int, int] | None:
+        try:
+            stat = self._path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
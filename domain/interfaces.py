@@ -2,11 +2,12 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Mapping, Sequence
 from datetime import datetime
-from typing import Protocol
+from typing import Any, Protocol
 
-from domain.models import Candle, Instrument, Order, TradingSignal
+from domain.models import Candle, CandleColumns, Instrument, Order, OrderBatch, SignalType, TradingSignal
+from utils.indicators import IndicatorSpec
 
 
 class MarketDataProvider(ABC):
@@ -34,6 +35,36 @@ class Strategy(ABC):
     def generate_signal(self, candles: Sequence[Candle]) -> TradingSignal:
         """Generate a trading signal from the provided candles."""
 
+    def generate_signals(self, candles: Sequence[Candle]) -> Sequence[TradingSignal]:
+        """Generate every signal produced for the candles; composite strategies may return several."""
+
+        return (self.generate_signal(candles),)
+
+    def signal_executed(self, signal: TradingSignal) -> None:
+        """Called after the order for ``signal``, as returned by this strategy, executed; no-op by default."""
+
+    def generate_signal_batch(self, columns: CandleColumns) -> Sequence[SignalType] | None:
+        """Return the signal type for every candle in one pass, or ``None`` if unsupported.
+
+        Entry ``i`` must equal ``generate_signal`` over the first ``i + 1``
+        candles. Strategies that keep state between calls should not
+        implement it.
+        """
+
+        return None
+
+
+class IndicatorStrategy(Strategy):
+    """Strategy that declares its indicators so they can be computed once and shared."""
+
+    @abstractmethod
+    def required_indicators(self) -> Sequence[IndicatorSpec]:
+        """Return the indicators consumed by :meth:`evaluate`."""
+
+    @abstractmethod
+    def evaluate(self, instrument: Instrument, indicators: Mapping[IndicatorSpec, Any]) -> TradingSignal:
+        """Return a signal from current indicator values (``None`` while warming up)."""
+
 
 class RiskAssessment(Protocol):
     """Represents the outcome of a risk validation."""
@@ -50,6 +81,17 @@ class RiskManager(ABC):
     def assess(self, signal: TradingSignal, candles: Sequence[Candle]) -> RiskAssessment:
         """Return a risk assessment for an order derived from the supplied signal."""
 
+    def assess_batch(self, signal_types: Sequence[SignalType], columns: CandleColumns) -> OrderBatch | None:
+        """Assess the signal at every candle in one pass, or return ``None`` if unsupported.
+
+        Row ``i`` must match ``assess`` for a signal of ``signal_types[i]``
+        (without strength) over the first ``i + 1`` candles. Managers whose
+        decisions depend on earlier fills, such as portfolio limits, should
+        not implement it.
+        """
+
+        return None
+
 
 class OrderExecutor(ABC):
     """Executes approved orders via an exchange or broker."""
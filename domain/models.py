@@ -1,11 +1,15 @@
 """Domain entities for the trading bot."""
 from __future__ import annotations
 
+import math
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
+from decimal import ROUND_HALF_EVEN, Decimal
 from enum import Enum
-from typing import Optional
+from typing import Any, Mapping, Optional
 
+from utils.time import from_microseconds, to_microseconds
 from utils.validation import ensure_non_empty_string, ensure_positive_number
 
 
@@ -31,11 +35,23 @@ class Instrument:
     symbol: str
     name: Optional[str] = None
     tick_size: float = 0.01
+    metadata: Mapping[str, Any] = field(default_factory=dict, compare=False, hash=False)
 
     def __post_init__(self) -> None:
         ensure_non_empty_string(self.symbol, "Instrument symbol must be provided")
         ensure_positive_number(self.tick_size, "Instrument tick size must be positive")
 
+    def round_price(self, price: float, rounding: str = ROUND_HALF_EVEN) -> float:
+        """Round ``price`` to a multiple of the instrument tick size.
+
+        ``rounding`` is a :mod:`decimal` rounding mode; the default rounds to the
+        nearest tick, ``ROUND_FLOOR`` and ``ROUND_CEILING`` round down and up.
+        """
+
+        tick = Decimal(str(self.tick_size))
+        ticks = (Decimal(str(price)) / tick).to_integral_value(rounding=rounding)
+        return float(ticks * tick)
+
 
 @dataclass(frozen=True)
 class Candle:
@@ -60,6 +76,79 @@ class Candle:
             raise ValueError("High/low must bound open/close prices")
 
 
+@dataclass(frozen=True)
+class CandleColumns:
+    """Column-oriented candles for a single instrument.
+
+    Timestamps are integer microseconds since the Unix epoch and a missing
+    volume is stored as NaN. Columns may be any sequences, including arrays
+    and memory views, so large datasets can be processed without building a
+    :class:`Candle` per row; :meth:`__iter__` creates candles lazily when a
+    row-oriented consumer needs them.
+    """
+
+    instrument: Instrument
+    timestamps: Sequence[int]
+    open: Sequence[float]
+    high: Sequence[float]
+    low: Sequence[float]
+    close: Sequence[float]
+    volume: Sequence[float]
+
+    def __post_init__(self) -> None:
+        length = len(self.timestamps)
+        if any(len(column) != length for column in (self.open, self.high, self.low, self.close, self.volume)):
+            raise ValueError("Candle columns must have the same length")
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __iter__(self) -> Iterator[Candle]:
+        return (self.candle(index) for index in range(len(self)))
+
+    def candle(self, index: int) -> Candle:
+        """Build the :class:`Candle` for row ``index``."""
+
+        volume = self.volume[index]
+        return Candle(
+            instrument=self.instrument,
+            timestamp=from_microseconds(self.timestamps[index]),
+            open=self.open[index],
+            high=self.high[index],
+            low=self.low[index],
+            close=self.close[index],
+            volume=None if math.isnan(volume) else volume,
+        )
+
+    def slice(self, start: int, stop: int) -> CandleColumns:
+        """Return rows ``[start, stop)`` as new columns."""
+
+        return CandleColumns(
+            instrument=self.instrument,
+            timestamps=self.timestamps[start:stop],
+            open=self.open[start:stop],
+            high=self.high[start:stop],
+            low=self.low[start:stop],
+            close=self.close[start:stop],
+            volume=self.volume[start:stop],
+        )
+
+    @classmethod
+    def from_candles(cls, instrument: Instrument, candles: Iterable[Candle]) -> CandleColumns:
+        """Transpose row-oriented candles into columns."""
+
+        rows = list(candles)
+        return cls(
+            instrument=instrument,
+            timestamps=[to_microseconds(candle.timestamp) for candle in rows],
+            open=[candle.open for candle in rows],
+            high=[candle.high for candle in rows],
+            low=[candle.low for candle in rows],
+            close=[candle.close for candle in rows],
+            volume=[math.nan if candle.volume is None else candle.volume for candle in rows],
+        )
+
+
 @dataclass(frozen=True)
 class TradingSignal:
     """Signal generated by a strategy."""
@@ -94,3 +183,39 @@ class Order:
                 raise ValueError("For buy orders stop-loss must be below take-profit")
             if self.side == OrderSide.SELL and not (self.stop_loss > self.take_profit):
                 raise ValueError("For sell orders stop-loss must be above take-profit")
+
+
+@dataclass(frozen=True)
+class OrderBatch:
+    """Column-oriented risk decisions for consecutive candles of one instrument.
+
+    Row ``i`` holds the order parameters for the signal at candle ``i``.
+    ``sides[i]`` is ``None`` when that signal was rejected, with the reason in
+    ``reasons[i]``; the other columns are ignored for rejected rows.
+    """
+
+    instrument: Instrument
+    sides: Sequence[Optional[OrderSide]]
+    quantities: Sequence[float]
+    prices: Sequence[float]
+    stop_losses: Sequence[Optional[float]]
+    take_profits: Sequence[Optional[float]]
+    reasons: Sequence[Optional[str]]
+
+    def __len__(self) -> int:
+        return len(self.sides)
+
+    def order(self, index: int) -> Optional[Order]:
+        """Build the :class:`Order` for row ``index``, or ``None`` if it was rejected."""
+
+        side = self.sides[index]
+        if side is None:
+            return None
+        return Order(
+            instrument=self.instrument,
+            side=side,
+            quantity=self.quantities[index],
+            price=self.prices[index],
+            stop_loss=self.stop_losses[index],
+            take_profit=self.take_profits[index],
+        )
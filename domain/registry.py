@@ -0,0 +1,106 @@
+"""Registry of interned instrument definitions."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+from domain.models import Instrument
+
+
+class InstrumentRegistry:
+    """Holds one canonical :class:`Instrument` per symbol.
+
+    Instruments are built once and then shared by candles, signals and orders,
+    so hot paths never re-run instrument validation. Every instrument receives
+    a stable integer id that is never reused, even after it is removed.
+    """
+
+    def __init__(self, instruments: Iterable[Instrument] = ()) -> None:
+        self._by_symbol: dict[str, Instrument] = {}
+        self._ids: dict[str, int] = {}
+        self._by_id: dict[int, Instrument] = {}
+        self._next_id = 0
+        for instrument in instruments:
+            self.register(instrument)
+
+    @classmethod
+    def from_config(
+        cls, symbols: Iterable[str], details: Mapping[str, Mapping[str, Any]] | None = None
+    ) -> "InstrumentRegistry":
+        """Build a registry from configured symbols and optional per-symbol details."""
+
+        details = details or {}
+        return cls(Instrument(symbol=symbol, **dict(details.get(symbol) or {})) for symbol in symbols)
+
+    def register(self, instrument: Instrument) -> Instrument:
+        """Add ``instrument`` unless its symbol is known and return the canonical instance."""
+
+        existing = self._by_symbol.get(instrument.symbol)
+        if existing is not None:
+            return existing
+        instrument_id = self._next_id
+        self._next_id += 1
+        self._by_symbol[instrument.symbol] = instrument
+        self._ids[instrument.symbol] = instrument_id
+        self._by_id[instrument_id] = instrument
+        return instrument
+
+    def update(self, instrument: Instrument) -> Instrument:
+        """Replace the definition registered under ``instrument.symbol``, keeping its id."""
+
+        instrument_id = self.id_of(instrument.symbol)
+        self._by_symbol[instrument.symbol] = instrument
+        self._by_id[instrument_id] = instrument
+        return instrument
+
+    def unregister(self, symbol: str) -> None:
+        """Remove the instrument registered under ``symbol`` if present."""
+
+        if symbol not in self._by_symbol:
+            return
+        del self._by_symbol[symbol]
+        del self._by_id[self._ids.pop(symbol)]
+
+    def get(self, symbol: str) -> Instrument:
+        """Return the instrument registered under ``symbol``."""
+
+        try:
+            return self._by_symbol[symbol]
+        except KeyError:
+            raise KeyError(f"Unknown instrument: {symbol}") from None
+
+    def by_id(self, instrument_id: int) -> Instrument:
+        """Return the instrument with the given integer id."""
+
+        try:
+            return self._by_id[instrument_id]
+        except KeyError:
+            raise KeyError(f"Unknown instrument id: {instrument_id}") from None
+
+    def id_of(self, symbol: str) -> int:
+        """Return the integer id assigned to ``symbol``."""
+
+        try:
+            return self._ids[symbol]
+        except KeyError:
+            raise KeyError(f"Unknown instrument: {symbol}") from None
+
+    def intern(self, instrument: Instrument) -> Instrument:
+        """Return the registered instance for ``instrument`` when its symbol is known."""
+
+        return self._by_symbol.get(instrument.symbol, instrument)
+
+    @property
+    def symbols(self) -> list[str]:
+        """Return registered symbols in registration order."""
+
+        return list(self._by_symbol)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._by_symbol
+
+    def __iter__(self) -> Iterator[Instrument]:
+        return iter(list(self._by_symbol.values()))
+
+    def __len__(self) -> int:
+        return len(self._by_symbol)
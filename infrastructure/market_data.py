@@ -2,20 +2,59 @@
 from __future__ import annotations
 
 import logging
+import math
 import time
 from collections.abc import Iterable
-from datetime import datetime, timezone
-from typing import Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Mapping, Protocol
 
 import requests
 
 from config.settings import DataSourceSettings
 from domain.interfaces import MarketDataProvider
-from domain.models import Candle, Instrument
+from domain.models import Candle, CandleColumns, Instrument
+from infrastructure.rate_limit import MARKET_DATA, RateLimiter, backoff_seconds, retry_after_seconds
+from utils.memory import estimate_size
+from utils.time import to_microseconds
+from utils.validation import ensure_valid_candles
+
+
+class PayloadRecorder(Protocol):
+    """Receives every raw response payload, e.g. to record it for replay."""
+
+    def record(self, endpoint: str, params: Mapping[str, Any] | None, payload: Any) -> None:
+        """Record ``payload`` returned by ``endpoint`` for ``params``; must not block."""
+
+
+@dataclass
+class _LatestCandleCache:
+    """Last candle returned for a symbol and the validator it was served with."""
+
+    candle: Candle
+    etag: str | None = None
 
 
 class ConfigurableMarketDataClient(MarketDataProvider):
-    """Market data provider backed by an HTTP API."""
+    """Market data provider backed by an HTTP API.
+
+    Latest-candle requests are conditional: the ``ETag`` of the previous
+    response is sent as ``If-None-Match``, and a ``304 Not Modified`` (or an
+    empty ``204``) answer returns the cached candle without a payload to parse.
+
+    When a ``recorder`` is supplied, each successful response payload is handed
+    to it before parsing; unchanged responses are recorded as ``None``.
+
+    A shared ``rate_limiter`` paces requests on the client side and is told
+    about every ``429``, in which case the retry waits for the limiter rather
+    than sleeping a fixed backoff.
+
+    Historical ranges that span more than ``history_page_size`` candles are
+    split into consecutive time slices fetched concurrently by up to
+    ``history_page_workers`` threads. Every slice is retried on its own, so a
+    failing page never refetches the pages that already arrived.
+    """
 
     def __init__(
         self,
@@ -23,11 +62,16 @@ class ConfigurableMarketDataClient(MarketDataProvider):
         *,
         session: requests.Session | None = None,
         stream_source: Callable[[Instrument], Iterable[dict[str, Any]]] | None = None,
+        recorder: PayloadRecorder | None = None,
+        rate_limiter: RateLimiter | None = None,
         logger: logging.Logger | None = None,
     ) -> None:
         self._settings = settings
         self._session = session or requests.Session()
         self._stream_source = stream_source
+        self._recorder = recorder
+        self._rate_limiter = rate_limiter
+        self._latest: dict[str, _LatestCandleCache] = {}
         self._logger = logger or logging.getLogger(__name__)
 
     def stream_candles(self, instrument: Instrument) -> Iterable[Candle]:
@@ -42,15 +86,57 @@ class ConfigurableMarketDataClient(MarketDataProvider):
         """Return the latest candle using the configured REST endpoint."""
 
         endpoint = f"{self._settings.base_url.rstrip('/')}/candles/latest"
-        params = {"symbol": instrument.symbol}
-        payload = self._request_with_retries("GET", endpoint, params=params)
-        return self._parse_candle(payload, instrument)
+        symbol = instrument.symbol
+        params = {"symbol": symbol}
+        cached = self._latest.get(symbol)
+        validators = {"etag": cached.etag if cached is not None else None}
+        payload = self._request_with_retries("GET", endpoint, params=params, validators=validators)
+        if payload is None:
+            if cached is None:
+                raise ValueError(f"Empty latest candle response for {symbol}")
+            return cached.candle
+        candle = self._parse_candle(payload, instrument)
+        self._latest[symbol] = _LatestCandleCache(candle, validators["etag"])
+        return candle
 
     def get_historical_candles(
         self, instrument: Instrument, *, start: datetime, end: datetime, limit: int
     ) -> list[Candle]:
-        """Return historical candles from the configured REST endpoint."""
+        """Return the last ``limit`` candles in ``[start, end]`` from the configured REST endpoint."""
+
+        pages = self._history_pages(start, end, limit)
+        if len(pages) == 1:
+            return self._fetch_history_page(instrument, start, end, limit)
+        page_size = self._settings.history_page_size
+        workers = min(self._settings.history_page_workers, len(pages))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="history-page") as pool:
+            results = list(
+                pool.map(lambda page: self._fetch_history_page(instrument, page[0], page[1], page_size), pages)
+            )
+        # Keep one candle per timestamp in case the server returns a boundary candle twice.
+        merged = {candle.timestamp: candle for page in results for candle in page}
+        candles = [merged[timestamp] for timestamp in sorted(merged)]
+        return candles[-limit:]
 
+    def _history_pages(self, start: datetime, end: datetime, limit: int) -> list[tuple[datetime, datetime]]:
+        """Split ``[start, end]`` into slices of at most ``history_page_size`` candles."""
+
+        page_size = self._settings.history_page_size
+        interval = self._settings.candle_interval_seconds
+        expected = (end - start).total_seconds() / interval + 1
+        if limit <= page_size or expected <= page_size:
+            return [(start, end)]
+        span = timedelta(seconds=page_size * interval)
+        last_moment = timedelta(microseconds=1)
+        return [
+            (start + span * index, min(end, start + span * (index + 1) - last_moment))
+            for index in range(math.ceil(expected / page_size))
+            if start + span * index <= end
+        ]
+
+    def _fetch_history_page(
+        self, instrument: Instrument, start: datetime, end: datetime, limit: int
+    ) -> list[Candle]:
         endpoint = f"{self._settings.base_url.rstrip('/')}/candles"
         params = {
             "symbol": instrument.symbol,
@@ -60,26 +146,68 @@ class ConfigurableMarketDataClient(MarketDataProvider):
         }
         payload = self._request_with_retries("GET", endpoint, params=params)
         candles_payload = payload if isinstance(payload, list) else payload.get("candles", [])
-        return [self._parse_candle(item, instrument) for item in candles_payload]
+        columns = self._parse_columns(candles_payload, instrument)
+        # Out-of-order or duplicate candles would corrupt every indicator window.
+        ensure_valid_candles(columns, source=f"History for {instrument.symbol}")
+        return list(columns)
+
+    def memory_usage(self) -> dict[str, int]:
+        """Return the estimated bytes held by the latest-candle cache and the recorder."""
+
+        usage = {"latest_candle_cache": estimate_size(self._latest)}
+        recorder_usage = getattr(self._recorder, "memory_usage", None)
+        if recorder_usage is not None:
+            usage.update(recorder_usage())
+        return usage
+
+    def _request_with_retries(
+        self,
+        method: str,
+        url: str,
+        params: dict[str, Any] | None = None,
+        validators: dict[str, str | None] | None = None,
+    ) -> Any:
+        """Return the decoded payload, or ``None`` when the resource is unchanged.
+
+        ``validators`` carries the ``etag`` to send and receives the new one.
+        """
 
-    def _request_with_retries(self, method: str, url: str, params: dict[str, Any] | None = None) -> Any:
+        headers = None
+        if validators is not None and validators.get("etag"):
+            headers = {"If-None-Match": validators["etag"]}
         last_exc: Exception | None = None
         for attempt in range(1, self._settings.retries + 1):
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(MARKET_DATA)
             try:
                 response = self._session.request(
                     method,
                     url,
                     params=params,
+                    headers=headers,
                     timeout=self._settings.timeout_seconds,
                 )
+                status = getattr(response, "status_code", 200)
+                if status == 429 and self._rate_limiter is not None:
+                    retry_after = retry_after_seconds(getattr(response, "headers", None))
+                    self._rate_limiter.throttled(MARKET_DATA, retry_after)
+                    self._logger.warning("Attempt %s rate limited for %s %s", attempt, method, url)
+                    last_exc = requests.HTTPError("429 Too Many Requests", response=response)
+                    continue
                 response.raise_for_status()
-                return response.json()
+                payload = None if status in (204, 304) else response.json()
+                if validators is not None and payload is not None:
+                    validators["etag"] = getattr(response, "headers", {}).get("ETag")
+                if self._recorder is not None:
+                    endpoint = url[len(self._settings.base_url.rstrip("/")) :]
+                    self._recorder.record(endpoint, params, payload)
+                return payload
             except requests.RequestException as exc:  # pragma: no cover - network errors are mocked
                 last_exc = exc
                 self._logger.warning(
                     "Attempt %s failed for %s %s: %s", attempt, method, url, exc
                 )
-                time.sleep(min(2 ** attempt * 0.1, 2))
+                time.sleep(backoff_seconds(attempt, exc))
         assert last_exc is not None
         raise last_exc
 
@@ -95,6 +223,17 @@ class ConfigurableMarketDataClient(MarketDataProvider):
             volume=float(payload.get("volume")) if payload.get("volume") is not None else None,
         )
 
+    def _parse_columns(self, payloads: list[dict[str, Any]], instrument: Instrument) -> CandleColumns:
+        return CandleColumns(
+            instrument=instrument,
+            timestamps=[to_microseconds(self._parse_timestamp(item.get("timestamp"))) for item in payloads],
+            open=[float(item["open"]) for item in payloads],
+            high=[float(item["high"]) for item in payloads],
+            low=[float(item["low"]) for item in payloads],
+            close=[float(item["close"]) for item in payloads],
+            volume=[float(item["volume"]) if item.get("volume") is not None else math.nan for item in payloads],
+        )
+
     @staticmethod
     def _parse_timestamp(value: str | None) -> datetime:
         if value is None:
@@ -102,3 +241,4 @@ class ConfigurableMarketDataClient(MarketDataProvider):
         if value.endswith("Z"):
             value = value[:-1] + "+00:00"
         return datetime.fromisoformat(value).astimezone(timezone.utc)
+
@@ -0,0 +1,441 @@
+"""Local stand-in exchange for end-to-end and load testing.
+
+:class:`MockExchangeServer` serves the ``/candles``, ``/candles/latest`` and
+``/orders`` endpoints consumed by :class:`~infrastructure.market_data.ConfigurableMarketDataClient`
+and :class:`~infrastructure.order_execution.OrderExecutionClient`, so the whole
+service can run over real HTTP on one machine. Prices are a deterministic
+synthetic series per symbol, orders are filled by a :class:`PaperFillEngine`
+at the current close, latest-candle responses carry an ``ETag`` and answer
+``If-None-Match`` with ``304``, and latency, injected errors and rate limits are
+configurable.
+
+Run standalone with ``python -m infrastructure.mock_exchange --port 8080``.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+from domain.models import Candle, Instrument, Order, OrderSide
+from infrastructure.paper import PaperFillEngine
+from utils.time import utc_now
+from utils.validation import ensure_positive_number, ensure_within_range
+
+MAX_HISTORY_LIMIT = 5000
+
+
+@dataclass
+class MockExchangeSettings:
+    """Behaviour of the mock exchange.
+
+    ``latency_seconds`` (plus up to ``latency_jitter_seconds``) is added to
+    every request, ``error_rate`` is the probability of answering 503, and
+    ``rate_limit_per_second`` enables a token bucket of ``rate_limit_burst``
+    requests that answers 429 when empty.
+    """
+
+    latency_seconds: float = 0.0
+    latency_jitter_seconds: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_per_second: float | None = None
+    rate_limit_burst: int | None = None
+    slippage_bps: float = 0.0
+    candle_interval_seconds: int = 60
+    base_price: float = 100.0
+    amplitude: float = 0.02
+    period_candles: int = 60
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        ensure_within_range(self.latency_seconds, minimum=0.0, maximum=math.inf, message="Latency must not be negative")
+        ensure_within_range(
+            self.latency_jitter_seconds, minimum=0.0, maximum=math.inf, message="Latency jitter must not be negative"
+        )
+        ensure_within_range(self.error_rate, minimum=0.0, maximum=1.0, message="Error rate must be between 0 and 1")
+        if self.rate_limit_per_second is not None:
+            ensure_positive_number(self.rate_limit_per_second, "Rate limit must be positive")
+        if self.rate_limit_burst is not None:
+            ensure_positive_number(self.rate_limit_burst, "Rate limit burst must be positive")
+        ensure_positive_number(self.candle_interval_seconds, "Candle interval must be positive")
+        ensure_positive_number(self.base_price, "Base price must be positive")
+        ensure_within_range(self.amplitude, minimum=0.0, maximum=0.5, message="Amplitude must be between 0 and 0.5")
+        ensure_positive_number(self.period_candles, "Period must be positive")
+
+
+@dataclass
+class MockExchangeStats:
+    """Request counters of a running mock exchange."""
+
+    requests: int = 0
+    injected_errors: int = 0
+    rate_limited: int = 0
+    not_modified: int = 0
+    orders: int = 0
+
+
+class _TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, burst: int, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._rate = rate
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self._rate
+
+
+class MockExchange:
+    """HTTP-independent state of the mock exchange: prices, fills and fault injection."""
+
+    def __init__(
+        self,
+        settings: MockExchangeSettings | None = None,
+        *,
+        clock: Callable[[], datetime] = utc_now,
+    ) -> None:
+        self.settings = settings or MockExchangeSettings()
+        self.engine = PaperFillEngine(slippage_bps=self.settings.slippage_bps, clock=clock)
+        self.stats = MockExchangeStats()
+        self._clock = clock
+        self._random = random.Random(self.settings.seed)
+        self._lock = threading.Lock()
+        self._instruments: dict[str, Instrument] = {}
+        self._phases: dict[str, float] = {}
+        self._bucket: _TokenBucket | None = None
+        if self.settings.rate_limit_per_second is not None:
+            burst = self.settings.rate_limit_burst or max(1, math.ceil(self.settings.rate_limit_per_second))
+            self._bucket = _TokenBucket(self.settings.rate_limit_per_second, burst)
+
+    def candle(self, symbol: str, index: int) -> Candle:
+        """Return the synthetic candle number ``index`` (epoch intervals) for ``symbol``."""
+
+        settings = self.settings
+        open_ = self._mid_price(symbol, index - 1)
+        close = self._mid_price(symbol, index)
+        wick = settings.base_price * settings.amplitude * 0.05 * self._noise(symbol, index)
+        return Candle(
+            instrument=self._instrument(symbol),
+            timestamp=datetime.fromtimestamp(index * settings.candle_interval_seconds, tz=timezone.utc),
+            open=open_,
+            high=max(open_, close) + wick,
+            low=min(open_, close) - wick,
+            close=close,
+            volume=1000.0 * (1.0 + self._noise(symbol, -index)),
+        )
+
+    def current_index(self) -> int:
+        """Return the index of the candle covering the exchange clock."""
+
+        return int(self._clock().timestamp() // self.settings.candle_interval_seconds)
+
+    def latest_candle(self, symbol: str) -> Candle:
+        """Return the candle for the current interval."""
+
+        return self.candle(symbol, self.current_index())
+
+    def historical_candles(self, symbol: str, start: datetime, end: datetime, limit: int) -> list[Candle]:
+        """Return the last ``limit`` candles in ``[start, end]``, never beyond the current interval."""
+
+        interval = self.settings.candle_interval_seconds
+        first = math.ceil(start.timestamp() / interval)
+        last = min(int(end.timestamp() // interval), self.current_index())
+        first = max(first, last - min(limit, MAX_HISTORY_LIMIT) + 1)
+        return [self.candle(symbol, index) for index in range(first, last + 1)]
+
+    def submit_order(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Paper-fill an order payload at the current close and return the execution report."""
+
+        order = Order(
+            instrument=self._instrument(str(payload["symbol"])),
+            side=OrderSide(payload["side"]),
+            quantity=float(payload["quantity"]),
+            price=float(payload["price"]) if payload.get("price") is not None else None,
+        )
+        fill = self.engine.fill(order, self.latest_candle(order.instrument.symbol).close)
+        with self._lock:
+            self.stats.orders += 1
+        return {
+            "id": fill.execution_id,
+            "status": "filled",
+            "symbol": fill.symbol,
+            "side": fill.side.value,
+            "quantity": fill.quantity,
+            "price": fill.price,
+            "timestamp": _format_timestamp(fill.timestamp),
+        }
+
+    def count_not_modified(self) -> None:
+        """Count a conditional request answered with ``304 Not Modified``."""
+
+        with self._lock:
+            self.stats.not_modified += 1
+
+    def admit(self) -> tuple[int, float]:
+        """Apply fault injection to a request and return ``(status, retry_after)``.
+
+        ``status`` is 200 when the request should be served. Latency is applied
+        by the caller so that it does not hold the exchange lock.
+        """
+
+        with self._lock:
+            self.stats.requests += 1
+            failed = self.settings.error_rate > 0 and self._random.random() < self.settings.error_rate
+            if failed:
+                self.stats.injected_errors += 1
+                return 503, 0.0
+        if self._bucket is not None:
+            retry_after = self._bucket.try_acquire()
+            if retry_after > 0:
+                with self._lock:
+                    self.stats.rate_limited += 1
+                return 429, retry_after
+        return 200, 0.0
+
+    def latency(self) -> float:
+        """Return the delay to apply to the next response."""
+
+        jitter = self.settings.latency_jitter_seconds
+        if not jitter:
+            return self.settings.latency_seconds
+        with self._lock:
+            return self.settings.latency_seconds + self._random.uniform(0.0, jitter)
+
+    def _mid_price(self, symbol: str, index: int) -> float:
+        settings = self.settings
+        with self._lock:
+            phase = self._phases.get(symbol)
+            if phase is None:
+                phase = self._phases[symbol] = 2 * math.pi * self._noise(symbol, 0)
+        angle = 2 * math.pi * index / settings.period_candles + phase
+        return settings.base_price * (1 + settings.amplitude * math.sin(angle))
+
+    def _noise(self, symbol: str, index: int) -> float:
+        digest = hashlib.blake2b(f"{self.settings.seed}:{symbol}:{index}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2**64
+
+    def _instrument(self, symbol: str) -> Instrument:
+        instrument = self._instruments.get(symbol)
+        if instrument is None:
+            instrument = self._instruments.setdefault(symbol, Instrument(symbol=symbol))
+        return instrument
+
+
+def _format_timestamp(timestamp: datetime) -> str:
+    return timestamp.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _candle_payload(candle: Candle) -> dict[str, Any]:
+    return {
+        "timestamp": _format_timestamp(candle.timestamp),
+        "open": candle.open,
+        "high": candle.high,
+        "low": candle.low,
+        "close": candle.close,
+        "volume": candle.volume,
+    }
+
+
+def _parse_timestamp(value: str) -> datetime:
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class _MockExchangeHandler(BaseHTTPRequestHandler):
+    server: _MockExchangeHTTPServer
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802 - required by BaseHTTPRequestHandler
+        if not self._admit():
+            return
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        exchange = self.server.exchange
+        symbol = query.get("symbol")
+        if not symbol:
+            self._send(400, {"error": "symbol is required"})
+            return
+        try:
+            if url.path == "/candles/latest":
+                candle = exchange.latest_candle(symbol)
+                etag = f'"{symbol}-{int(candle.timestamp.timestamp())}"'
+                if self.headers.get("If-None-Match") == etag:
+                    exchange.count_not_modified()
+                    self._send(304, None, {"ETag": etag})
+                else:
+                    self._send(200, _candle_payload(candle), {"ETag": etag})
+            elif url.path == "/candles":
+                candles = exchange.historical_candles(
+                    symbol,
+                    _parse_timestamp(query["start"]),
+                    _parse_timestamp(query["end"]),
+                    int(query.get("limit", MAX_HISTORY_LIMIT)),
+                )
+                self._send(200, {"candles": [_candle_payload(candle) for candle in candles]})
+            else:
+                self._send(404, {"error": f"Unknown endpoint {url.path}"})
+        except (KeyError, ValueError) as exc:
+            self._send(400, {"error": f"Invalid request: {exc}"})
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self._admit():
+            return
+        if urlsplit(self.path).path != "/orders":
+            self._send(404, {"error": f"Unknown endpoint {self.path}"})
+            return
+        try:
+            report = self.server.exchange.submit_order(json.loads(body or b"{}"))
+        except (KeyError, TypeError, ValueError) as exc:
+            self._send(400, {"error": f"Invalid order: {exc}"})
+            return
+        self._send(200, report)
+
+    def _admit(self) -> bool:
+        exchange = self.server.exchange
+        delay = exchange.latency()
+        if delay:
+            time.sleep(delay)
+        status, retry_after = exchange.admit()
+        if status == 429:
+            self._send(429, {"error": "rate limit exceeded"}, {"Retry-After": f"{math.ceil(retry_after)}"})
+        elif status != 200:
+            self._send(status, {"error": "injected failure"})
+        return status == 200
+
+    def _send(self, status: int, payload: object, headers: dict[str, str] | None = None) -> None:
+        body = b"" if status == 304 else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - silence request logging
+        del format, args
+
+
+class _MockExchangeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], exchange: MockExchange) -> None:
+        super().__init__(address, _MockExchangeHandler)
+        self.exchange = exchange
+
+
+class MockExchangeServer:
+    """Runs a :class:`MockExchange` behind a threaded HTTP server.
+
+    Use as a context manager, or call :meth:`start` and :meth:`stop`. Port 0
+    binds a free port; :attr:`base_url` reports the address to configure as
+    ``data_source.base_url``.
+    """
+
+    def __init__(
+        self,
+        settings: MockExchangeSettings | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        clock: Callable[[], datetime] = utc_now,
+    ) -> None:
+        self.exchange = MockExchange(settings, clock=clock)
+        self._server = _MockExchangeHTTPServer((host, port), self.exchange)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL the server is listening on."""
+
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> MockExchangeServer:
+        """Serve requests on a background thread."""
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="mock-exchange", daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until interrupted."""
+
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> MockExchangeServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a local mock exchange")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latency added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency up to this value")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of answering 503")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second before answering 429")
+    parser.add_argument("--slippage-bps", type=float, default=0.0, help="Slippage applied to paper fills")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for prices and fault injection")
+    args = parser.parse_args(argv)
+
+    settings = MockExchangeSettings(
+        latency_seconds=args.latency_ms / 1000,
+        latency_jitter_seconds=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        rate_limit_per_second=args.rate_limit,
+        slippage_bps=args.slippage_bps,
+        seed=args.seed,
+    )
+    server = MockExchangeServer(settings, host=args.host, port=args.port)
+    print(f"Mock exchange listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:  # pragma: no cover - interactive shutdown
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    raise SystemExit(main())
@@ -10,20 +10,27 @@ import requests
 from config.settings import DataSourceSettings
 from domain.interfaces import OrderExecutor
 from domain.models import Order
+from infrastructure.rate_limit import ORDERS, RateLimiter, backoff_seconds, retry_after_seconds
 
 
 class OrderExecutionClient(OrderExecutor):
-    """HTTP-based order execution client with retry and logging support."""
+    """HTTP-based order execution client with retry and logging support.
+
+    Order requests draw on the ``rate_limiter`` shared with the market data
+    client, which lets them go ahead of waiting market data requests.
+    """
 
     def __init__(
         self,
         settings: DataSourceSettings,
         *,
         session: requests.Session | None = None,
+        rate_limiter: RateLimiter | None = None,
         logger: logging.Logger | None = None,
     ) -> None:
         self._settings = settings
         self._session = session or requests.Session()
+        self._rate_limiter = rate_limiter
         self._logger = logger or logging.getLogger(__name__)
 
     def execute(self, order: Order) -> str:
@@ -39,6 +46,8 @@ class OrderExecutionClient(OrderExecutor):
     def _request_with_retries(self, method: str, url: str, **kwargs: Any) -> dict[str, Any]:
         last_exc: Exception | None = None
         for attempt in range(1, self._settings.retries + 1):
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(ORDERS)
             try:
                 response = self._session.request(
                     method,
@@ -46,6 +55,12 @@ class OrderExecutionClient(OrderExecutor):
                     timeout=self._settings.timeout_seconds,
                     **kwargs,
                 )
+                if getattr(response, "status_code", 200) == 429 and self._rate_limiter is not None:
+                    retry_after = retry_after_seconds(getattr(response, "headers", None))
+                    self._rate_limiter.throttled(ORDERS, retry_after)
+                    self._logger.warning("Order request attempt %s rate limited", attempt)
+                    last_exc = requests.HTTPError("429 Too Many Requests", response=response)
+                    continue
                 response.raise_for_status()
                 return response.json()
             except requests.RequestException as exc:  # pragma: no cover - network errors mocked
@@ -54,7 +69,7 @@ class OrderExecutionClient(OrderExecutor):
                     "Order request attempt %s failed: %s", attempt, exc,
                     extra={"payload": kwargs.get("json")},
                 )
-                time.sleep(min(2 ** attempt * 0.1, 2))
+                time.sleep(backoff_seconds(attempt, exc))
         assert last_exc is not None
         raise last_exc
 
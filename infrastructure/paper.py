@@ -0,0 +1,96 @@
+"""Paper trading: simulated order fills without a broker."""
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from domain.interfaces import OrderExecutor
+from domain.models import Order, OrderSide
+from utils.time import utc_now
+from utils.validation import ensure_positive_number
+
+
+@dataclass(frozen=True)
+class PaperFill:
+    """A simulated execution of an order."""
+
+    execution_id: str
+    symbol: str
+    side: OrderSide
+    quantity: float
+    price: float
+    timestamp: datetime
+
+
+class PaperFillEngine:
+    """Fills orders immediately at a reference price adjusted for slippage.
+
+    Buys fill ``slippage_bps`` basis points above the reference price and sells
+    the same distance below it. Fills are numbered sequentially and the most
+    recent ``max_fills`` are kept in memory, so a long-running engine stays
+    bounded and can be shared by threads serving concurrent requests.
+    """
+
+    def __init__(
+        self,
+        *,
+        slippage_bps: float = 0.0,
+        max_fills: int = 10_000,
+        clock: Callable[[], datetime] = utc_now,
+    ) -> None:
+        if slippage_bps < 0:
+            raise ValueError("Slippage must not be negative")
+        ensure_positive_number(max_fills, "Fill history must be positive")
+        self._slippage = slippage_bps / 10_000
+        self._clock = clock
+        self._ids = itertools.count(1)
+        self._fills: deque[PaperFill] = deque(maxlen=max_fills)
+        self._lock = threading.Lock()
+
+    @property
+    def fills(self) -> tuple[PaperFill, ...]:
+        """Return the retained fills, oldest first."""
+
+        with self._lock:
+            return tuple(self._fills)
+
+    def fill(self, order: Order, reference_price: float | None = None) -> PaperFill:
+        """Fill ``order`` at ``reference_price``, defaulting to the order's own price."""
+
+        price = reference_price if reference_price is not None else order.price
+        if price is None or price <= 0:
+            raise ValueError(f"No price available to fill {order.instrument.symbol} order")
+        if order.quantity <= 0:
+            raise ValueError("Order quantity must be positive")
+        direction = 1.0 if order.side == OrderSide.BUY else -1.0
+        with self._lock:
+            fill = PaperFill(
+                execution_id=f"paper-{next(self._ids):08d}",
+                symbol=order.instrument.symbol,
+                side=order.side,
+                quantity=order.quantity,
+                price=price * (1 + direction * self._slippage),
+                timestamp=self._clock(),
+            )
+            self._fills.append(fill)
+        return fill
+
+
+class PaperOrderExecutor(OrderExecutor):
+    """Order executor that fills orders locally through a :class:`PaperFillEngine`."""
+
+    def __init__(self, engine: PaperFillEngine | None = None, *, logger: logging.Logger | None = None) -> None:
+        self.engine = engine or PaperFillEngine()
+        self._logger = logger or logging.getLogger(__name__)
+
+    def execute(self, order: Order) -> str:
+        """Fill the order at its limit price and return the paper execution id."""
+
+        fill = self.engine.fill(order)
+        self._logger.debug("Paper fill %s: %s %s @ %s", fill.execution_id, fill.side.value, fill.quantity, fill.price)
+        return fill.execution_id
@@ -3,12 +3,20 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Protocol
+from typing import IO, Protocol
 
 from domain.models import Order
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
 
 class ExecutionRecordWriter(Protocol):
     """Protocol describing how execution records are written."""
@@ -45,3 +53,63 @@ class ExecutionLogger:
         record = {"execution_id": execution_id, "order": order_dict}
         self._logger.info("Recording order execution %s", execution_id)
         self._writer.write(record)
+
+
+@dataclass
+class FileSignalStateStore:
+    """Persists the latest signal per key as an append-only JSON-lines file.
+
+    Each state transition appends one small line; on load the most recent
+    line per key wins. Loading also compacts the file to one line per key,
+    atomically replacing it, so it does not grow with every transition across
+    restarts. Appends and the load hold an exclusive ``flock`` on the file, so
+    processes sharing it never append to a file that is being replaced. Where
+    ``fcntl`` is unavailable the file must not be shared.
+    """
+
+    path: Path
+
+    def load(self) -> dict[str, str]:
+        state: dict[str, str] = {}
+        if not self.path.exists():
+            return state
+        lines = 0
+        with self._locked("r") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                lines += 1
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # tolerate a torn final line after a crash
+                state[entry["key"]] = entry["signal"]
+            if lines > len(state):
+                self._rewrite(state)
+        return state
+
+    def record(self, key: str, signal_type: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._locked("a") as fh:
+            fh.write(json.dumps({"key": key, "signal": signal_type}) + "\n")
+
+    @contextmanager
+    def _locked(self, mode: str) -> Iterator[IO[str]]:
+        """Open the file with an exclusive lock, reopening it if it was replaced while waiting."""
+
+        while True:
+            with self.path.open(mode, encoding="utf-8") as fh:
+                if fcntl is None:
+                    yield fh
+                    return
+                fcntl.flock(fh, fcntl.LOCK_EX)
+                if os.fstat(fh.fileno()).st_ino == os.stat(self.path).st_ino:
+                    yield fh
+                    return
+
+    def _rewrite(self, state: dict[str, str]) -> None:
+        temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with temporary.open("w", encoding="utf-8") as fh:
+            fh.writelines(json.dumps({"key": key, "signal": signal}) + "\n" for key, signal in state.items())
+        os.replace(temporary, self.path)
@@ -0,0 +1,157 @@
+"""Adaptive client-side rate limiting for the venue's HTTP API."""
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Mapping
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from config.settings import RateLimitSettings
+from utils.time import utc_now
+
+MARKET_DATA = "market_data"
+ORDERS = "orders"
+# Endpoint classes in priority order: waiting order requests go first.
+ENDPOINT_CLASSES = (ORDERS, MARKET_DATA)
+
+
+class _AdaptiveBucket:
+    """Token bucket whose rate drops on throttling and recovers over time."""
+
+    def __init__(self, rate: float, settings: RateLimitSettings, now: float) -> None:
+        self.limit = rate
+        self.rate = rate
+        self._burst = settings.burst
+        self._floor = rate * settings.min_rate_fraction
+        self._recovery_seconds = settings.recovery_seconds
+        self.tokens = float(settings.burst)
+        self._updated = now
+
+    def delay(self, now: float) -> float:
+        """Return the seconds until a token is available."""
+
+        elapsed = now - self._updated
+        if elapsed < 0:  # paused by Retry-After
+            return -elapsed + max(0.0, 1 - self.tokens) / self.rate
+        self.tokens = min(self._burst, self.tokens + elapsed * self.rate)
+        self.rate = min(self.limit, self.rate + self.limit * elapsed / self._recovery_seconds)
+        self._updated = now
+        return max(0.0, 1 - self.tokens) / self.rate
+
+    def throttle(self, now: float, retry_after: float | None) -> None:
+        self.delay(now)
+        self.rate = max(self._floor, self.rate / 2)
+        self.tokens = min(self.tokens, 0.0)
+        if retry_after:
+            self._updated = max(self._updated, now + retry_after)
+
+
+class RateLimiter:
+    """Token-bucket limiter shared by every client talking to the venue.
+
+    Each request first takes a token from the shared bucket (if a global
+    limit is configured) and from the bucket of its endpoint class. When a
+    ``429`` comes back, :meth:`throttled` halves those rates and pauses them
+    for the ``Retry-After`` period, and the rates creep back to their
+    configured values afterwards. While order requests wait, market data
+    requests leave them the last token of the shared bucket.
+    """
+
+    def __init__(self, settings: RateLimitSettings, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        now = clock()
+        self._shared = (
+            _AdaptiveBucket(settings.requests_per_second, settings, now)
+            if settings.requests_per_second is not None
+            else None
+        )
+        self._classes: dict[str, _AdaptiveBucket] = {}
+        class_rates = ((MARKET_DATA, settings.market_data_per_second), (ORDERS, settings.orders_per_second))
+        for endpoint_class, rate in class_rates:
+            if rate is not None:
+                self._classes[endpoint_class] = _AdaptiveBucket(rate, settings, now)
+        self._condition = threading.Condition()
+        self._waiting = dict.fromkeys(ENDPOINT_CLASSES, 0)
+        self.throttled_responses = 0
+
+    def rate(self, endpoint_class: str) -> float | None:
+        """Return the current effective rate for ``endpoint_class`` (``None`` when unlimited)."""
+
+        with self._condition:
+            now = self._clock()
+            buckets = self._buckets(endpoint_class)
+            for bucket in buckets:
+                bucket.delay(now)
+            rates = [bucket.rate for bucket in buckets]
+        return min(rates) if rates else None
+
+    def acquire(self, endpoint_class: str) -> float:
+        """Block until a request of ``endpoint_class`` may be sent; return the seconds waited."""
+
+        buckets = self._buckets(endpoint_class)
+        if not buckets:
+            return 0.0
+        higher = ENDPOINT_CLASSES[: ENDPOINT_CLASSES.index(endpoint_class)]
+        started = self._clock()
+        with self._condition:
+            self._waiting[endpoint_class] += 1
+            try:
+                while True:
+                    now = self._clock()
+                    delay = max(bucket.delay(now) for bucket in buckets)
+                    if self._yields_to(higher):
+                        self._condition.wait(delay or None)
+                        continue
+                    if delay <= 0:
+                        for bucket in buckets:
+                            bucket.tokens -= 1
+                        return self._clock() - started
+                    self._condition.wait(delay)
+            finally:
+                self._waiting[endpoint_class] -= 1
+                self._condition.notify_all()
+
+    def throttled(self, endpoint_class: str, retry_after: float | None = None) -> None:
+        """Slow ``endpoint_class`` down after the venue answered ``429``."""
+
+        with self._condition:
+            self.throttled_responses += 1
+            now = self._clock()
+            for bucket in self._buckets(endpoint_class):
+                bucket.throttle(now, retry_after)
+            self._condition.notify_all()
+
+    def _yields_to(self, higher: tuple[str, ...]) -> bool:
+        # Leave the last shared token to a waiting request of a higher class.
+        shared = self._shared
+        return shared is not None and shared.tokens < 2 and any(self._waiting[other] for other in higher)
+
+    def _buckets(self, endpoint_class: str) -> list[_AdaptiveBucket]:
+        if endpoint_class not in self._waiting:
+            raise ValueError(f"Unknown endpoint class: {endpoint_class}")
+        class_bucket = self._classes.get(endpoint_class)
+        return [bucket for bucket in (self._shared, class_bucket) if bucket is not None]
+
+
+def retry_after_seconds(headers: Mapping[str, Any] | None) -> float | None:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+
+    value = (headers or {}).get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - utc_now()).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_seconds(attempt: int, exc: Exception) -> float:
+    """Return the pause before retry ``attempt + 1``, honouring a ``Retry-After`` header."""
+
+    retry_after = retry_after_seconds(getattr(getattr(exc, "response", None), "headers", None))
+    return retry_after if retry_after is not None else min(2 ** attempt * 0.1, 2)
@@ -0,0 +1,284 @@
+"""Replay recorded candles from memory-mapped binary files."""
+from __future__ import annotations
+
+import math
+import mmap
+import struct
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+from domain.interfaces import MarketDataProvider
+from domain.models import Candle, Instrument
+from utils.time import from_microseconds, to_microseconds
+from utils.validation import ensure_valid_candles
+
+MAGIC = b"HBCANDL1"
+_HEADER = struct.Struct("<8s8x")
+_RECORD = struct.Struct("<qddddd")
+FILE_SUFFIX = ".candles"
+
+
+def write_candle_file(path: Path, candles: Iterable[Candle]) -> int:
+    """Write candles, strictly ordered by timestamp, to ``path`` and return the count."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    previous: int | None = None
+    with path.open("wb") as fh:
+        fh.write(_HEADER.pack(MAGIC))
+        for candle in candles:
+            timestamp = to_microseconds(candle.timestamp)
+            if previous is not None and timestamp <= previous:
+                raise ValueError(f"Candles must be strictly ordered by timestamp (row {count})")
+            volume = math.nan if candle.volume is None else candle.volume
+            fh.write(_RECORD.pack(timestamp, candle.open, candle.high, candle.low, candle.close, volume))
+            previous = timestamp
+            count += 1
+    return count
+
+
+class _TimestampColumn(Sequence[int]):
+    """Read-only view of the timestamp column used for binary search."""
+
+    def __init__(self, buffer: mmap.mmap, length: int) -> None:
+        self._buffer = buffer
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> int:  # type: ignore[override]
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return struct.unpack_from("<q", self._buffer, _HEADER.size + index * _RECORD.size)[0]
+
+
+class _RecordColumns(NamedTuple):
+    """Strided views of the interleaved record fields."""
+
+    timestamps: Sequence[int]
+    open: Sequence[float]
+    high: Sequence[float]
+    low: Sequence[float]
+    close: Sequence[float]
+
+
+class CandleFile:
+    """Memory-mapped candle file with O(log n) timestamp range lookups.
+
+    Records are decoded only when they are accessed, so opening a file costs
+    the same regardless of its size.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as fh:
+            size = fh.seek(0, 2)
+            if size < _HEADER.size:
+                raise ValueError(f"{path} is not a candle file")
+            self._buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic,) = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            self._buffer.close()
+            raise ValueError(f"{path} is not a candle file")
+        if (size - _HEADER.size) % _RECORD.size:
+            self._buffer.close()
+            raise ValueError(f"{path} is truncated")
+        self._length = (size - _HEADER.size) // _RECORD.size
+        self.timestamps = _TimestampColumn(self._buffer, self._length)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def index_at_or_after(self, timestamp: datetime) -> int:
+        """Return the index of the first candle at or after ``timestamp``."""
+
+        return bisect_left(self.timestamps, to_microseconds(timestamp))
+
+    def index_after(self, timestamp: datetime) -> int:
+        """Return the index of the first candle strictly after ``timestamp``."""
+
+        return bisect_right(self.timestamps, to_microseconds(timestamp))
+
+    def candle_at(self, index: int, instrument: Instrument) -> Candle:
+        """Decode the candle stored at ``index``."""
+
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        timestamp, open_, high, low, close, volume = _RECORD.unpack_from(
+            self._buffer, _HEADER.size + index * _RECORD.size
+        )
+        return Candle(
+            instrument=instrument,
+            timestamp=from_microseconds(timestamp),
+            open=open_,
+            high=high,
+            low=low,
+            close=close,
+            volume=None if math.isnan(volume) else volume,
+        )
+
+    def candles(self, start: int, stop: int, instrument: Instrument) -> list[Candle]:
+        """Decode candles in the index range ``[start, stop)``."""
+
+        return [self.candle_at(index, instrument) for index in range(max(start, 0), min(stop, self._length))]
+
+    def validate(self) -> None:
+        """Check every record as a batch and raise :class:`BatchValidationError` naming the bad ones."""
+
+        if not self._length:
+            return
+        if sys.byteorder != "little":
+            records = _RECORD.iter_unpack(self._buffer[_HEADER.size :])
+            ensure_valid_candles(_RecordColumns(*list(zip(*records))[:5]), source=str(self.path))
+            return
+        # Strided views over the mapped records, so nothing is copied.
+        fields = _RECORD.size // 8
+        view = memoryview(self._buffer)[_HEADER.size :]
+        integers, floats = view.cast("q"), view.cast("d")
+        columns = [integers[::fields], *(floats[index::fields] for index in range(1, 5))]
+        try:
+            ensure_valid_candles(_RecordColumns(*columns), source=str(self.path))
+        finally:
+            for column in (*columns, integers, floats, view):
+                column.release()
+
+    def close(self) -> None:
+        """Release the memory map."""
+
+        self._buffer.close()
+
+
+class ReplayMarketDataProvider(MarketDataProvider):
+    """Serves recorded candles from ``<directory>/<SYMBOL>.candles`` files.
+
+    Each instrument has a replay cursor: :meth:`get_latest_candle` returns the
+    candle under the cursor and advances it, repeating the final candle once the
+    recording is exhausted. Historical queries never return candles at or
+    beyond the cursor, so a replayed service cannot see the future. Pass
+    :meth:`now` as the service clock so bootstrap ranges refer to replay time.
+
+    Cursors start at ``start_at`` or, without it, after the first ``warm_up``
+    candles of each file, so the bootstrap finds that much history. Files are
+    only decoded where they are read; with ``validate`` each file is also
+    checked in one full batch when it is first opened.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        start_at: datetime | None = None,
+        warm_up: int = 0,
+        validate: bool = False,
+    ) -> None:
+        if warm_up < 0:
+            raise ValueError("Warm-up must not be negative")
+        self._directory = directory
+        self._start_at = start_at
+        self._warm_up = warm_up
+        self._validate = validate
+        self._files: dict[str, CandleFile] = {}
+        self._cursors: dict[str, int] = {}
+        self._now: datetime | None = start_at
+        # Files and cursors are created lazily from whichever thread asks first.
+        self._lock = threading.RLock()
+
+    def now(self) -> datetime:
+        """Return the replay clock: the newest candle served so far or the start time.
+
+        Before any candle was served without ``start_at``, this is the newest
+        warm-up candle, or the earliest recorded candle when there is no warm-up.
+        """
+
+        if self._now is not None:
+            return self._now
+        firsts: list[int] = []
+        warmed: list[int] = []
+        for path in self._directory.glob(f"*{FILE_SUFFIX}"):
+            candle_file = self._file(path.stem)
+            if len(candle_file):
+                firsts.append(candle_file.timestamps[0])
+                cursor = self._cursor(path.stem)
+                if cursor:
+                    warmed.append(candle_file.timestamps[cursor - 1])
+        if not firsts:
+            raise LookupError(f"No recorded candles in {self._directory}")
+        return from_microseconds(max(warmed) if warmed else min(firsts))
+
+    def stream_candles(self, instrument: Instrument) -> Iterator[Candle]:
+        """Yield every recorded candle from the replay cursor onwards."""
+
+        candle_file = self._file(instrument.symbol)
+        for index in range(self._cursor(instrument.symbol), len(candle_file)):
+            yield candle_file.candle_at(index, instrument)
+
+    def get_latest_candle(self, instrument: Instrument) -> Candle:
+        """Return the candle under the replay cursor and advance the cursor."""
+
+        symbol = instrument.symbol
+        candle_file = self._file(symbol)
+        if not len(candle_file):
+            raise LookupError(f"No recorded candles for {symbol}")
+        with self._lock:
+            index = min(self._cursor(symbol), len(candle_file) - 1)
+            self._cursors[symbol] = index + 1
+        candle = candle_file.candle_at(index, instrument)
+        with self._lock:
+            if self._now is None or candle.timestamp > self._now:
+                self._now = candle.timestamp
+        return candle
+
+    def get_historical_candles(
+        self, instrument: Instrument, *, start: datetime, end: datetime, limit: int
+    ) -> list[Candle]:
+        """Return up to ``limit`` most recent candles in ``[start, end]`` before the cursor."""
+
+        symbol = instrument.symbol
+        candle_file = self._file(symbol)
+        lower = candle_file.index_at_or_after(start)
+        upper = min(candle_file.index_after(end), self._cursor(symbol))
+        lower = max(lower, upper - limit)
+        return candle_file.candles(lower, upper, instrument)
+
+    def close(self) -> None:
+        """Release every memory-mapped file."""
+
+        with self._lock:
+            for candle_file in self._files.values():
+                candle_file.close()
+            self._files.clear()
+
+    def _file(self, symbol: str) -> CandleFile:
+        with self._lock:
+            candle_file = self._files.get(symbol)
+            if candle_file is None:
+                path = self._directory / f"{symbol}{FILE_SUFFIX}"
+                if not path.exists():
+                    raise LookupError(f"No recording for {symbol} in {self._directory}")
+                candle_file = CandleFile(path)
+                if self._validate:
+                    try:
+                        candle_file.validate()
+                    except ValueError:
+                        candle_file.close()
+                        raise
+                self._files[symbol] = candle_file
+            return candle_file
+
+    def _cursor(self, symbol: str) -> int:
+        with self._lock:
+            cursor = self._cursors.get(symbol)
+            if cursor is None:
+                candle_file = self._file(symbol)
+                if self._start_at is not None:
+                    cursor = candle_file.index_at_or_after(self._start_at)
+                else:
+                    cursor = min(self._warm_up, len(candle_file))
+                self._cursors[symbol] = cursor
+            return cursor
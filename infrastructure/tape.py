@@ -0,0 +1,250 @@
+"""Record raw market data responses to compressed tapes and replay them.
+
+A tape is a directory of gzip-compressed JSON-lines chunks. Each line holds
+the receive time, the endpoint, the request parameters and the raw payload
+exactly as the API returned it. Chunks are closed after ``chunk_records``
+entries, so a crash loses at most the unflushed tail of the current chunk.
+"""
+from __future__ import annotations
+
+import atexit
+import gzip
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+import zlib
+from collections import deque
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Callable, Deque
+
+from config.settings import DataSourceSettings
+from infrastructure.market_data import ConfigurableMarketDataClient
+from utils.memory import estimate_size
+
+CHUNK_SUFFIX = ".jsonl.gz"
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class TapeEntry:
+    """One recorded response."""
+
+    received_at: float
+    endpoint: str
+    params: dict[str, Any]
+    payload: Any
+
+
+class TapeRecorder:
+    """Appends response payloads to chunked gzip tapes on a background thread.
+
+    :meth:`record` only enqueues the payload, so the polling thread never
+    waits for serialisation, compression or disk I/O. When the queue is full
+    the entry is dropped and counted in :attr:`dropped` rather than blocking.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        chunk_records: int = 10_000,
+        compression_level: int = 6,
+        queue_size: int = 10_000,
+        flush_interval_seconds: float = 5.0,
+        clock: Callable[[], float] = time.time,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if chunk_records <= 0:
+            raise ValueError("Chunk size must be positive")
+        self._directory = directory
+        self._chunk_records = chunk_records
+        self._compression_level = compression_level
+        self._flush_interval = flush_interval_seconds
+        self._clock = clock
+        self._logger = logger or logging.getLogger(__name__)
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=queue_size)
+        self._prefix = datetime.now(timezone.utc).strftime("tape-%Y%m%dT%H%M%S%f")
+        self._chunks = itertools.count()
+        self._thread: threading.Thread | None = None
+        self.dropped = 0
+        self.recorded = 0
+
+    def start(self) -> TapeRecorder:
+        """Start the background writer thread."""
+
+        if self._thread is None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            self._thread = threading.Thread(target=self._write_loop, name="tape-recorder", daemon=True)
+            self._thread.start()
+        return self
+
+    def record(self, endpoint: str, params: Mapping[str, Any] | None, payload: Any) -> None:
+        """Queue a response payload for recording."""
+
+        try:
+            self._queue.put_nowait((self._clock(), endpoint, dict(params or {}), payload))
+        except queue.Full:
+            self.dropped += 1
+
+    def memory_usage(self) -> dict[str, int]:
+        """Return the estimated bytes of entries waiting to be written."""
+
+        return {"tape_queue": estimate_size(list(self._queue.queue))}
+
+    def close(self) -> None:
+        """Write out every queued entry and close the current chunk."""
+
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> TapeRecorder:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _write_loop(self) -> None:
+        chunk: IO[str] | None = None
+        written = 0
+        while True:
+            try:
+                item = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                if chunk is not None:
+                    # Sync-flush so buffered entries are readable even if the process dies.
+                    chunk.flush()
+                continue
+            if item is _STOP:
+                break
+            received_at, endpoint, params, payload = item
+            try:
+                if chunk is None:
+                    chunk = self._open_chunk()
+                line = json.dumps(
+                    {"t": received_at, "endpoint": endpoint, "params": params, "payload": payload},
+                    separators=(",", ":"),
+                    default=str,
+                )
+                chunk.write(line + "\n")
+            except Exception:  # noqa: BLE001 - recording must never stop the bot
+                self._logger.exception("Failed to record %s response", endpoint)
+                continue
+            written += 1
+            self.recorded += 1
+            if written >= self._chunk_records:
+                chunk.close()
+                chunk, written = None, 0
+        if chunk is not None:
+            chunk.close()
+
+    def _open_chunk(self) -> IO[str]:
+        path = self._directory / f"{self._prefix}-{next(self._chunks):06d}{CHUNK_SUFFIX}"
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=self._compression_level)
+
+
+def read_tape(directory: Path) -> Iterator[TapeEntry]:
+    """Yield recorded entries from every chunk in ``directory``, oldest first.
+
+    A chunk cut short by a crash is read up to its last complete entry.
+    """
+
+    for path in sorted(directory.glob(f"*{CHUNK_SUFFIX}")):
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            try:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # torn final line
+                    yield TapeEntry(entry["t"], entry["endpoint"], entry["params"], entry["payload"])
+            except (EOFError, gzip.BadGzipFile, zlib.error):
+                continue
+
+
+class TapeMarketDataProvider(ConfigurableMarketDataClient):
+    """Replays a recorded tape through the normal HTTP client code path.
+
+    Requests are answered with the next recorded payload for the same endpoint
+    and symbol, so parsing and everything downstream behave exactly as they
+    did when the tape was recorded. ``speed`` paces responses relative to the
+    recorded receive times (``1.0`` is real time, ``10.0`` ten times faster);
+    ``None`` replays as fast as possible.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        speed: float | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        monotonic: Callable[[], float] = time.monotonic,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError("Replay speed must be positive")
+        super().__init__(DataSourceSettings(base_url=""), logger=logger)
+        self._entries = read_tape(directory)
+        self._pending: dict[tuple[str, str | None], Deque[TapeEntry]] = {}
+        self._speed = speed
+        self._sleep = sleep
+        self._monotonic = monotonic
+        self._origin: tuple[float, float] | None = None
+        # Bootstrap and paging request from several threads; the tape is one shared reader.
+        self._lock = threading.Lock()
+
+    def _request_with_retries(
+        self,
+        method: str,
+        url: str,
+        params: dict[str, Any] | None = None,
+        validators: dict[str, str | None] | None = None,
+    ) -> Any:
+        with self._lock:
+            entry = self._next_entry(url, (params or {}).get("symbol"))
+        self._pace(entry.received_at)
+        return entry.payload
+
+    def memory_usage(self) -> dict[str, int]:
+        """Return the estimated bytes of the cache and of entries read ahead for other requests."""
+
+        return {**super().memory_usage(), "tape_read_ahead": estimate_size(self._pending)}
+
+    def _next_entry(self, endpoint: str, symbol: str | None) -> TapeEntry:
+        key = (endpoint, symbol)
+        pending = self._pending.get(key)
+        if pending:
+            return pending.popleft()
+        for entry in self._entries:
+            entry_key = (entry.endpoint, entry.params.get("symbol"))
+            if entry_key == key:
+                return entry
+            self._pending.setdefault(entry_key, deque()).append(entry)
+        raise LookupError(f"Tape exhausted for {endpoint} {symbol or ''}".rstrip())
+
+    def _pace(self, received_at: float) -> None:
+        if self._speed is None:
+            return
+        if self._origin is None:
+            self._origin = (received_at, self._monotonic())
+            return
+        recorded_start, replay_start = self._origin
+        delay = replay_start + (received_at - recorded_start) / self._speed - self._monotonic()
+        if delay > 0:
+            self._sleep(delay)
+
+
+def record_to_tape(directory: Path, **kwargs: Any) -> TapeRecorder:
+    """Start a :class:`TapeRecorder` that is flushed when the interpreter exits."""
+
+    recorder = TapeRecorder(directory, **kwargs).start()
+    atexit.register(recorder.close)
+    return recorder
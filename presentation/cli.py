@@ -1,33 +1,153 @@
-"""Command line interface for running the trading bot."""
+"""Command line interface for running the trading bot.
+
+Only lightweight modules are imported at module level. Adapters, strategies,
+risk managers and their third-party dependencies (``requests``, ``yaml``) are
+imported when the service is wired, so ``--help`` and argument errors return
+immediately and ``--once`` runs pay only for what they use.
+"""
 from __future__ import annotations
 
 import argparse
 import logging
+from datetime import datetime
 from pathlib import Path
-from typing import Sequence
+from typing import TYPE_CHECKING, Callable, Sequence
 
-from application.services import TradingBotService
 from config.loader import ConfigLoader
-from config.settings import TradingBotSettings
-from infrastructure.market_data import ConfigurableMarketDataClient
-from infrastructure.order_execution import OrderExecutionClient
-from infrastructure.persistence import ExecutionLogger, FileExecutionWriter
-from risk.basic import BasicRiskManager
-from strategies.sma import SMACrossoverStrategy
-from utils.time import graceful_interrupt
-
-
-def build_service(settings: TradingBotSettings) -> TradingBotService:
-    """Wire dependencies to construct a :class:`TradingBotService`."""
-
-    market_client = ConfigurableMarketDataClient(settings.data_source)
-    order_client = OrderExecutionClient(settings.data_source)
-    strategy = SMACrossoverStrategy(
-        short_window=settings.strategy.short_window,
-        long_window=settings.strategy.long_window,
-    )
-    risk_manager = BasicRiskManager(settings.risk)
-    execution_logger = ExecutionLogger(FileExecutionWriter(Path("data/executions.log")))
+from config.watcher import ConfigWatcher
+from infrastructure.persistence import ExecutionLogger, FileExecutionWriter, FileSignalStateStore
+from utils.time import IntervalScheduler, graceful_interrupt, reload_on_hangup, utc_now
+
+if TYPE_CHECKING:
+    from application.services import ServiceMetrics, TradingBotService
+    from config.settings import RiskSettings, StrategySettings, TradingBotSettings
+    from domain.interfaces import MarketDataProvider, OrderExecutor, RiskManager, Strategy
+    from domain.models import Order
+    from presentation.supervisor import ShardSupervisor
+    from risk.portfolio import PortfolioLedger
+
+EXECUTION_LOG_PATH = Path("data/executions.log")
+DATASET_PATH = Path("data/candles")
+
+
+def build_strategy(settings: StrategySettings) -> Strategy:
+    """Construct the configured trading strategy."""
+
+    from strategies.sma import SMACrossoverStrategy
+
+    strategy: Strategy
+    if settings.variants:
+        from strategies.graph import StrategyGroup
+
+        strategy = StrategyGroup([SMACrossoverStrategy(**variant) for variant in settings.variants])
+    else:
+        strategy = SMACrossoverStrategy(short_window=settings.short_window, long_window=settings.long_window)
+    if settings.signal_mode == "edge":
+        from strategies.edge import EdgeTriggeredStrategy
+
+        strategy = EdgeTriggeredStrategy(strategy, store=FileSignalStateStore(Path(settings.signal_state_path)))
+    if settings.timeframe is not None:
+        from strategies.timeframe import TimeframeStrategy
+
+        strategy = TimeframeStrategy(strategy, settings.timeframe)
+    return strategy
+
+
+def build_risk_manager(settings: RiskSettings, *, ledger: PortfolioLedger | None = None) -> RiskManager:
+    """Construct the configured risk manager, capped by portfolio limits when a ledger is given."""
+
+    from risk.basic import BasicRiskManager
+
+    risk_manager: RiskManager
+    if settings.volatility_window is not None:
+        from risk.volatility import VolatilityRiskManager
+
+        risk_manager = VolatilityRiskManager(settings)
+    else:
+        risk_manager = BasicRiskManager(settings)
+    if ledger is not None:
+        from risk.portfolio import PortfolioRiskManager
+
+        risk_manager = PortfolioRiskManager(risk_manager, ledger, settings)
+    return risk_manager
+
+
+def build_service(
+    settings: TradingBotSettings,
+    *,
+    execution_callback: Callable[[Order, str], None] | None = None,
+    cycle_callback: Callable[[ServiceMetrics], None] | None = None,
+    scheduler_factory: Callable[[float], IntervalScheduler] = IntervalScheduler,
+    settings_source: Callable[[], TradingBotSettings | None] | None = None,
+    clock: Callable[[], datetime] | None = None,
+) -> TradingBotService:
+    """Wire dependencies to construct a :class:`TradingBotService`.
+
+    ``execution_callback`` replaces the default execution journal, which lets a
+    supervisor collect executions from several worker processes in one place.
+    ``settings_source`` is polled between cycles for configuration updates,
+    such as :meth:`ConfigWatcher.poll`, which re-reads the config file.
+    ``clock`` overrides the service clock, e.g. to follow a simulated exchange.
+    Both HTTP clients share one rate limiter when ``data_source.rate_limit`` sets a limit.
+    Every execution also updates the portfolio ledger behind the risk manager,
+    which survives risk manager rebuilds on reload and tells the service which
+    instruments hold a position.
+    """
+
+    from application.services import TradingBotService
+    from risk.portfolio import PortfolioLedger
+
+    rate_limiter = None
+    if settings.data_source.rate_limit.enabled:
+        from infrastructure.rate_limit import RateLimiter
+
+        rate_limiter = RateLimiter(settings.data_source.rate_limit)
+    market_client: MarketDataProvider
+    if settings.data_source.replay_directory:
+        from infrastructure.replay import ReplayMarketDataProvider
+
+        market_client = ReplayMarketDataProvider(
+            Path(settings.data_source.replay_directory),
+            warm_up=settings.history_limit,
+            validate=settings.data_source.replay_validate,
+        )
+        clock = clock or market_client.now
+    elif settings.data_source.replay_tape_directory:
+        from infrastructure.tape import TapeMarketDataProvider
+
+        market_client = TapeMarketDataProvider(
+            Path(settings.data_source.replay_tape_directory), speed=settings.data_source.replay_speed
+        )
+    else:
+        from infrastructure.market_data import ConfigurableMarketDataClient
+
+        recorder = None
+        if settings.data_source.tape_directory:
+            from infrastructure.tape import record_to_tape
+
+            recorder = record_to_tape(Path(settings.data_source.tape_directory))
+        market_client = ConfigurableMarketDataClient(
+            settings.data_source, recorder=recorder, rate_limiter=rate_limiter
+        )
+    order_client: OrderExecutor
+    if settings.data_source.paper_trading:
+        from infrastructure.paper import PaperOrderExecutor
+
+        order_client = PaperOrderExecutor()
+    else:
+        from infrastructure.order_execution import OrderExecutionClient
+
+        order_client = OrderExecutionClient(settings.data_source, rate_limiter=rate_limiter)
+    strategy = build_strategy(settings.strategy)
+    ledger = PortfolioLedger()
+    risk_manager = build_risk_manager(settings.risk, ledger=ledger)
+    if execution_callback is None:
+        execution_callback = ExecutionLogger(FileExecutionWriter(EXECUTION_LOG_PATH)).record
+    journal_callback = execution_callback
+
+    def _record_execution(order: Order, execution_id: str) -> None:
+        ledger.record_execution(order, execution_id)
+        journal_callback(order, execution_id)
 
     return TradingBotService(
         settings=settings,
@@ -35,6 +155,27 @@ def build_service(settings: TradingBotSettings) -> TradingBotService:
         strategy=strategy,
         risk_manager=risk_manager,
         order_executor=order_client,
+        scheduler_factory=scheduler_factory,
+        execution_callback=_record_execution,
+        cycle_callback=cycle_callback,
+        settings_source=settings_source,
+        strategy_factory=build_strategy,
+        risk_factory=lambda risk_settings: build_risk_manager(risk_settings, ledger=ledger),
+        clock=clock or utc_now,
+        positions=lambda symbol: ledger.position(symbol).quantity,
+    )
+
+
+def build_supervisor(settings: TradingBotSettings, workers: int) -> ShardSupervisor:
+    """Construct a supervisor running ``workers`` sharded trading processes."""
+
+    from presentation.supervisor import ShardSupervisor
+
+    execution_logger = ExecutionLogger(FileExecutionWriter(EXECUTION_LOG_PATH))
+    return ShardSupervisor(
+        settings,
+        workers=workers,
+        service_factory=build_service,
         execution_callback=execution_logger.record,
     )
 
@@ -44,15 +185,105 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser.add_argument("--config", type=Path, default=None, help="Path to YAML configuration file")
     parser.add_argument("--log-level", default="INFO", help="Logging level")
     parser.add_argument("--once", action="store_true", help="Run a single iteration and exit")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Shard instruments across this many worker processes (ignored with --once)",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    import_parser = commands.add_parser(
+        "import-data", help="Convert a CSV or JSON-lines OHLCV file into a columnar backtest dataset"
+    )
+    import_parser.add_argument("source", type=Path, help="CSV or JSON-lines file to import")
+    import_parser.add_argument("--output", type=Path, default=DATASET_PATH, help="Dataset directory")
+    import_parser.add_argument("--symbol", default=None, help="Symbol for files without a symbol column")
+    import_parser.add_argument("--format", choices=("csv", "jsonl"), default=None, help="Input format")
+    import_parser.add_argument("--chunk-rows", type=int, default=None, help="Candles per chunk file")
+    monte_carlo_parser = commands.add_parser(
+        "monte-carlo", help="Resample backtest trades to estimate the spread of final PnL and drawdown"
+    )
+    trades_source = monte_carlo_parser.add_mutually_exclusive_group(required=True)
+    trades_source.add_argument("--trades", type=Path, help="CSV or JSON-lines file of per-trade PnL")
+    trades_source.add_argument("--dataset", type=Path, help="Backtest the configured strategy on this dataset")
+    monte_carlo_parser.add_argument("--symbols", nargs="+", default=None, help="Dataset symbols to backtest")
+    monte_carlo_parser.add_argument("--resamples", type=int, default=10_000, help="Number of resampled runs")
+    monte_carlo_parser.add_argument(
+        "--method", choices=("bootstrap", "permutation"), default="bootstrap", help="Resampling method"
+    )
+    monte_carlo_parser.add_argument("--seed", type=int, default=None, help="Random seed for repeatable results")
     return parser.parse_args(argv)
 
 
+def import_data(args: argparse.Namespace) -> int:
+    """Run the ``import-data`` subcommand."""
+
+    from utils.datasets import DEFAULT_CHUNK_ROWS, import_ohlcv
+
+    counts = import_ohlcv(
+        args.source,
+        args.output,
+        symbol=args.symbol,
+        file_format=args.format,
+        chunk_rows=args.chunk_rows or DEFAULT_CHUNK_ROWS,
+    )
+    for symbol, rows in sorted(counts.items()):
+        print(f"{symbol}: {rows} candles -> {args.output / symbol}")
+    return 0
+
+
+def monte_carlo(args: argparse.Namespace) -> int:
+    """Run the ``monte-carlo`` subcommand."""
+
+    from utils.monte_carlo import load_trade_pnls, run_monte_carlo
+
+    if args.trades is not None:
+        pnls = load_trade_pnls(args.trades)
+    else:
+        from risk.portfolio import TradePnLRecorder
+        from utils.backtesting import run_dataset_multi_backtest
+        from utils.datasets import CandleDataset
+
+        settings = ConfigLoader().load(args.config)
+        recorder = TradePnLRecorder()
+        run_dataset_multi_backtest(
+            CandleDataset(args.dataset),
+            build_strategy(settings.strategy),
+            build_risk_manager(settings.risk, ledger=recorder.ledger),
+            recorder,
+            symbols=args.symbols,
+        )
+        pnls = recorder.pnls
+    if not pnls:
+        print("No closed trades to resample")
+        return 1
+    result = run_monte_carlo(pnls, resamples=args.resamples, method=args.method, seed=args.seed)
+    print(f"{result.resamples} {result.method} resamples of {result.trades} trades")
+    print(f"{'percentile':>10} {'final pnl':>14} {'max drawdown':>14}")
+    for percent, final in result.final_pnl.percentiles.items():
+        print(f"{percent:>10} {final:>14.4f} {result.max_drawdown.percentiles[percent]:>14.4f}")
+    print(f"{'mean':>10} {result.final_pnl.mean:>14.4f} {result.max_drawdown.mean:>14.4f}")
+    print(f"probability of loss: {result.probability_of_loss:.2%}")
+    return 0
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     args = parse_args(argv)
     logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO))
+    if args.command == "import-data":
+        return import_data(args)
+    if args.command == "monte-carlo":
+        return monte_carlo(args)
     loader = ConfigLoader()
     settings = loader.load(args.config)
-    service = build_service(settings)
+    watcher: ConfigWatcher | None = None
+    if args.once:
+        service = build_service(settings)
+    elif args.workers > 1:
+        service = build_supervisor(settings, args.workers)
+    else:
+        watcher = ConfigWatcher(args.config, loader=loader)
+        service = build_service(settings, settings_source=watcher.poll)
 
     if args.once:
         service.run_once()
@@ -62,7 +293,12 @@ def main(argv: Sequence[str] | None = None) -> int:
         del signum, frame
         service.stop()
 
-    with graceful_interrupt(_handle_interrupt):
+    def _handle_hangup(signum, frame):  # noqa: ANN001 - signature defined by signal
+        del signum, frame
+        if watcher is not None:
+            watcher.request_reload()
+
+    with graceful_interrupt(_handle_interrupt), reload_on_hangup(_handle_hangup):
         try:
             service.start()
         except KeyboardInterrupt:  # pragma: no cover - handled via signal
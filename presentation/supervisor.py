@@ -0,0 +1,284 @@
+"""Multi-process supervisor sharding instruments across trading workers."""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import queue
+import signal
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, fields, replace
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Any
+
+from application.services import ServiceMetrics, TradingBotService
+from config.settings import TradingBotSettings
+from domain.models import Order
+from utils.sharding import shard_instruments
+from utils.time import IntervalScheduler
+
+ServiceFactory = Callable[..., TradingBotService]
+
+
+class _ShardLogFilter(logging.Filter):
+    """Tag worker log records with their shard before they reach the parent."""
+
+    def __init__(self, shard: int) -> None:
+        super().__init__()
+        self._suffix = f"[shard-{shard}]"
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.name = f"{record.name}{self._suffix}"
+        return True
+
+
+def _run_worker(
+    service_factory: ServiceFactory,
+    settings: TradingBotSettings,
+    shard: int,
+    stop_event: Any,
+    log_queue: Any,
+    event_queue: Any,
+    log_level: int,
+) -> None:
+    """Entry point executed inside each worker process."""
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    handler = QueueHandler(log_queue)
+    handler.addFilter(_ShardLogFilter(shard))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(log_level)
+
+    def _forward_execution(order: Order, execution_id: str) -> None:
+        event_queue.put(("execution", shard, order, execution_id))
+
+    def _forward_metrics(metrics: ServiceMetrics) -> None:
+        event_queue.put(("metrics", shard, metrics))
+
+    service = service_factory(
+        settings,
+        execution_callback=_forward_execution,
+        cycle_callback=_forward_metrics,
+        scheduler_factory=lambda interval: IntervalScheduler(interval, stop_event=stop_event),
+    )
+    service.start()
+
+
+def _add_metrics(total: ServiceMetrics, metrics: ServiceMetrics) -> ServiceMetrics:
+    return ServiceMetrics(
+        **{item.name: getattr(total, item.name) + getattr(metrics, item.name) for item in fields(ServiceMetrics)}
+    )
+
+
+def shard_settings(settings: TradingBotSettings, shard: int, symbols: list[str]) -> TradingBotSettings:
+    """Return ``settings`` for one shard, with files the shard writes moved to paths of its own.
+
+    The signal state file gets a ``.shard-<n>`` suffix before its extension and
+    memory reports go to a ``shard-<n>`` subdirectory, so workers never write
+    to each other's files.
+    """
+
+    state_path = Path(settings.strategy.signal_state_path)
+    state_path = state_path.with_name(f"{state_path.stem}.shard-{shard}{state_path.suffix}")
+    memory_directory = Path(settings.memory.output_directory) / f"shard-{shard}"
+    return replace(
+        settings,
+        instruments=list(symbols),
+        strategy=replace(settings.strategy, signal_state_path=str(state_path)),
+        memory=replace(settings.memory, output_directory=str(memory_directory)),
+    )
+
+
+@dataclass
+class WorkerState:
+    """Book-keeping for a single shard worker."""
+
+    shard: int
+    symbols: list[str]
+    process: Any = None
+    restarts: int = 0
+    next_start: float = 0.0
+    failed: bool = False
+
+
+class ShardSupervisor:
+    """Runs one :class:`TradingBotService` per shard and keeps the workers alive.
+
+    Instruments are assigned to shards with a consistent hash ring, so adding
+    or removing workers only moves a small fraction of the universe. Worker
+    logs, cycle metrics and executions are funnelled back to the parent, which
+    owns the single execution journal. Each shard keeps its signal state and
+    memory reports in files of its own (see :func:`shard_settings`), and its
+    counters keep accumulating across restarts.
+    """
+
+    def __init__(
+        self,
+        settings: TradingBotSettings,
+        *,
+        workers: int,
+        service_factory: ServiceFactory,
+        execution_callback: Callable[[Order, str], None] | None = None,
+        restart_delay_seconds: float = 1.0,
+        max_restart_delay_seconds: float = 30.0,
+        max_restarts: int | None = None,
+        poll_interval_seconds: float = 0.2,
+        context: Any = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if workers <= 0:
+            raise ValueError("Worker count must be positive")
+        self._settings = settings
+        self._service_factory = service_factory
+        self._execution_callback = execution_callback
+        self._restart_delay = restart_delay_seconds
+        self._max_restart_delay = max_restart_delay_seconds
+        self._max_restarts = max_restarts
+        self._poll_interval = poll_interval_seconds
+        self._context = context or multiprocessing.get_context("spawn")
+        self._logger = logger or logging.getLogger(__name__)
+        self._stop_event = self._context.Event()
+        self._log_queue = self._context.Queue()
+        self._event_queue = self._context.Queue()
+        self._metrics: dict[int, ServiceMetrics] = {}
+        self._previous_runs: dict[int, ServiceMetrics] = {}
+        self._workers = [
+            WorkerState(shard=shard, symbols=symbols)
+            for shard, symbols in shard_instruments(settings.instruments, workers).items()
+            if symbols
+        ]
+
+    @property
+    def workers(self) -> list[WorkerState]:
+        """Return the state of every shard that owns at least one instrument."""
+
+        return list(self._workers)
+
+    def shard_metrics(self) -> dict[int, ServiceMetrics]:
+        """Return each shard's metrics, including those of its runs before a restart."""
+
+        shards = self._metrics.keys() | self._previous_runs.keys()
+        return {
+            shard: _add_metrics(
+                self._previous_runs.get(shard, ServiceMetrics()), self._metrics.get(shard, ServiceMetrics())
+            )
+            for shard in shards
+        }
+
+    def aggregate_metrics(self) -> ServiceMetrics:
+        """Return the sum of the metrics of all shards."""
+
+        total = ServiceMetrics()
+        for metrics in self.shard_metrics().values():
+            total = _add_metrics(total, metrics)
+        return total
+
+    def start(self) -> None:
+        """Start all workers and supervise them until :meth:`stop` is called."""
+
+        listener = QueueListener(self._log_queue, *logging.getLogger().handlers, respect_handler_level=True)
+        listener.start()
+        self._logger.info("Starting %s trading workers", len(self._workers))
+        try:
+            for worker in self._workers:
+                self._spawn(worker)
+            while not self._stop_event.is_set():
+                self._drain_events(timeout=self._poll_interval)
+                self._supervise()
+        finally:
+            self._shutdown()
+            listener.stop()
+
+    def stop(self) -> None:
+        """Ask all workers to finish their current cycle and exit."""
+
+        self._logger.info("Stopping trading workers")
+        self._stop_event.set()
+
+    def _spawn(self, worker: WorkerState) -> None:
+        worker.process = self._context.Process(
+            target=_run_worker,
+            name=f"trading-shard-{worker.shard}",
+            args=(
+                self._service_factory,
+                shard_settings(self._settings, worker.shard, worker.symbols),
+                worker.shard,
+                self._stop_event,
+                self._log_queue,
+                self._event_queue,
+                logging.getLogger().getEffectiveLevel(),
+            ),
+            daemon=True,
+        )
+        worker.process.start()
+        self._logger.info("Started shard %s with %s instruments", worker.shard, len(worker.symbols))
+
+    def _supervise(self) -> None:
+        now = time.monotonic()
+        for worker in self._workers:
+            if worker.failed or worker.process is None:
+                continue
+            if worker.process.is_alive():
+                continue
+            if worker.next_start == 0.0:
+                worker.process.join()
+                if self._max_restarts is not None and worker.restarts >= self._max_restarts:
+                    worker.failed = True
+                    self._logger.error(
+                        "Shard %s exited with code %s; restart limit reached", worker.shard, worker.process.exitcode
+                    )
+                    continue
+                delay = min(self._restart_delay * 2 ** worker.restarts, self._max_restart_delay)
+                worker.next_start = now + delay
+                self._logger.warning(
+                    "Shard %s exited with code %s; restarting in %.1fs",
+                    worker.shard,
+                    worker.process.exitcode,
+                    delay,
+                )
+            elif now >= worker.next_start:
+                worker.restarts += 1
+                worker.next_start = 0.0
+                last_run = self._metrics.pop(worker.shard, None)
+                if last_run is not None:
+                    self._previous_runs[worker.shard] = _add_metrics(
+                        self._previous_runs.get(worker.shard, ServiceMetrics()), last_run
+                    )
+                self._spawn(worker)
+
+    def _drain_events(self, *, timeout: float) -> None:
+        try:
+            event = self._event_queue.get(timeout=timeout)
+        except queue.Empty:
+            return
+        while True:
+            self._handle_event(event)
+            try:
+                event = self._event_queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _handle_event(self, event: tuple) -> None:
+        kind, shard = event[0], event[1]
+        if kind == "metrics":
+            self._metrics[shard] = event[2]
+        elif kind == "execution" and self._execution_callback is not None:
+            try:
+                self._execution_callback(event[2], event[3])
+            except Exception as exc:  # noqa: BLE001
+                self._logger.exception("Failed to record execution from shard %s: %s", shard, exc)
+
+    def _shutdown(self) -> None:
+        self._stop_event.set()
+        deadline = time.monotonic() + max(self._settings.poll_interval_seconds, 5.0)
+        for worker in self._workers:
+            if worker.process is None:
+                continue
+            worker.process.join(timeout=max(0.0, deadline - time.monotonic()))
+            if worker.process.is_alive():
+                self._logger.warning("Terminating unresponsive shard %s", worker.shard)
+                worker.process.terminate()
+                worker.process.join()
+        self._drain_events(timeout=0.0)
@@ -2,13 +2,38 @@
 
 from collections.abc import Sequence
 from dataclasses import dataclass
+from decimal import ROUND_CEILING, ROUND_FLOOR
+from itertools import count, repeat
 
 from config.settings import RiskSettings
 from domain.interfaces import RiskAssessment, RiskManager
-from domain.models import Candle, Order, OrderSide, SignalType, TradingSignal
+from domain.models import Candle, CandleColumns, Instrument, Order, OrderBatch, OrderSide, SignalType, TradingSignal
 from utils.validation import ensure_positive_number
 
 
+_SIDES = {SignalType.BUY: OrderSide.BUY, SignalType.SELL: OrderSide.SELL}
+
+
+def protective_levels(
+    instrument: Instrument, price: float, side: OrderSide, stop_loss: float, take_profit: float
+) -> tuple[float | None, float | None]:
+    """Round ``stop_loss`` and ``take_profit`` onto the instrument's tick grid.
+
+    Both levels are rounded away from the entry ``price`` and kept at least one
+    tick from it, so they never meet on the same tick. A level that would end
+    at or below zero is dropped (``None``).
+    """
+
+    tick = instrument.tick_size
+    if side == OrderSide.BUY:
+        stop = instrument.round_price(min(stop_loss, price - tick), ROUND_FLOOR)
+        target = instrument.round_price(max(take_profit, price + tick), ROUND_CEILING)
+    else:
+        stop = instrument.round_price(max(stop_loss, price + tick), ROUND_CEILING)
+        target = instrument.round_price(min(take_profit, price - tick), ROUND_FLOOR)
+    return (stop if stop > 0 else None), (target if target > 0 else None)
+
+
 @dataclass
 class BasicRiskAssessment:
     """Concrete risk assessment structure used within the application."""
@@ -32,9 +57,9 @@ class BasicRiskManager(RiskManager):
             return BasicRiskAssessment(approved=False, reason="Hold signal", order=None)
         last_candle = candles[-1]
         price = last_candle.close
-        quantity = min(self._settings.max_position_size, self._settings.max_position_size * (signal.strength or 1.0))
+        quantity = self._position_size(signal)
         side = OrderSide.BUY if signal.signal_type == SignalType.BUY else OrderSide.SELL
-        stop_loss, take_profit = self._derive_protection_levels(price, side)
+        stop_loss, take_profit = self._derive_protection_levels(signal.instrument, price, side)
         order = Order(
             instrument=signal.instrument,
             side=side,
@@ -45,11 +70,36 @@ class BasicRiskManager(RiskManager):
         )
         return BasicRiskAssessment(approved=True, reason=None, order=order)
 
-    def _derive_protection_levels(self, price: float, side: OrderSide) -> tuple[float | None, float | None]:
+    def assess_batch(self, signal_types: Sequence[SignalType], columns: CandleColumns) -> OrderBatch:
+        """Size and protect an order for every non-hold signal, one row per candle."""
+
+        closes = columns.close
+        sides = [_SIDES.get(signal_type) for signal_type in signal_types]
+        stop_losses: list[float | None] = [None] * len(sides)
+        take_profits: list[float | None] = [None] * len(sides)
+        for index, side, price in zip(count(), sides, closes):
+            if side is not None:
+                stop_losses[index], take_profits[index] = self._derive_protection_levels(columns.instrument, price, side)
+        return OrderBatch(
+            instrument=columns.instrument,
+            sides=sides,
+            quantities=list(repeat(self._settings.max_position_size, len(sides))),
+            prices=closes,
+            stop_losses=stop_losses,
+            take_profits=take_profits,
+            reasons=[None if side is not None else "Hold signal" for side in sides],
+        )
+
+    def _position_size(self, signal: TradingSignal) -> float:
+        return min(self._settings.max_position_size, self._settings.max_position_size * (signal.strength or 1.0))
+
+    def _derive_protection_levels(
+        self, instrument: Instrument, price: float, side: OrderSide
+    ) -> tuple[float | None, float | None]:
         if side == OrderSide.BUY:
             stop_loss = price * (1 - self._settings.stop_loss_pct)
             take_profit = price * (1 + self._settings.take_profit_pct)
         else:
             stop_loss = price * (1 + self._settings.stop_loss_pct)
             take_profit = price * (1 - self._settings.take_profit_pct)
-        return stop_loss, take_profit
+        return protective_levels(instrument, price, side, stop_loss, take_profit)
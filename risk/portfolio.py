@@ -0,0 +1,170 @@
+"""Portfolio-level position tracking and exposure limits."""
+from __future__ import annotations
+
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+
+from config.settings import RiskSettings
+from domain.interfaces import RiskAssessment, RiskManager
+from domain.models import Candle, Order, OrderSide, TradingSignal
+from risk.basic import BasicRiskAssessment
+
+_EPSILON = 1e-12
+
+
+@dataclass(frozen=True)
+class Position:
+    """Net position held in a single instrument."""
+
+    quantity: float = 0.0
+    average_price: float = 0.0
+    realized_pnl: float = 0.0
+
+    @property
+    def notional(self) -> float:
+        """Return the absolute exposure valued at the average entry price."""
+
+        return abs(self.quantity) * self.average_price
+
+
+class PortfolioLedger:
+    """Incrementally maintained positions and exposure across all instruments.
+
+    :meth:`record_execution` matches the service's execution callback, so the
+    ledger is updated once per fill. Every query is O(1) and never rescans the
+    trade history.
+    """
+
+    def __init__(self) -> None:
+        self._positions: dict[str, Position] = {}
+        self._gross_exposure = 0.0
+        self._net_exposure = 0.0
+        self._realized_pnl = 0.0
+        self._lock = threading.Lock()
+
+    def record_execution(self, order: Order, execution_id: str) -> None:
+        """Apply an executed order to the instrument position and aggregate exposure."""
+
+        del execution_id
+        symbol = order.instrument.symbol
+        with self._lock:
+            current = self._positions.get(symbol, Position())
+            price = order.price if order.price is not None else current.average_price
+            delta = order.quantity if order.side == OrderSide.BUY else -order.quantity
+            updated = self._apply_fill(current, delta, price)
+            self._positions[symbol] = updated
+            self._gross_exposure += updated.notional - current.notional
+            self._net_exposure += (
+                updated.quantity * updated.average_price - current.quantity * current.average_price
+            )
+            self._realized_pnl += updated.realized_pnl - current.realized_pnl
+
+    def position(self, symbol: str) -> Position:
+        """Return the current position in ``symbol`` (flat if never traded)."""
+
+        return self._positions.get(symbol, Position())
+
+    @property
+    def gross_exposure(self) -> float:
+        """Return the sum of absolute notional exposure across instruments."""
+
+        return self._gross_exposure
+
+    @property
+    def net_exposure(self) -> float:
+        """Return long minus short notional exposure across instruments."""
+
+        return self._net_exposure
+
+    @property
+    def realized_pnl(self) -> float:
+        """Return realized profit and loss summed over all instruments."""
+
+        return self._realized_pnl
+
+    @staticmethod
+    def _apply_fill(position: Position, delta: float, price: float) -> Position:
+        quantity = position.quantity
+        if abs(quantity) < _EPSILON or (quantity > 0) == (delta > 0):
+            total = abs(quantity) + abs(delta)
+            average = (abs(quantity) * position.average_price + abs(delta) * price) / total
+            return Position(quantity + delta, average, position.realized_pnl)
+        closed = min(abs(delta), abs(quantity))
+        direction = 1.0 if quantity > 0 else -1.0
+        realized = position.realized_pnl + (price - position.average_price) * closed * direction
+        remaining = quantity + delta
+        if abs(remaining) < _EPSILON:
+            return Position(0.0, 0.0, realized)
+        if (remaining > 0) == (quantity > 0):
+            return Position(remaining, position.average_price, realized)
+        return Position(remaining, price, realized)
+
+
+class TradePnLRecorder:
+    """Backtest executor that fills orders into a ledger and keeps each fill's realized PnL.
+
+    Only fills that close (part of) a position realize PnL, so :attr:`pnls`
+    holds one entry per closing trade, ready for Monte Carlo resampling.
+    """
+
+    def __init__(self, ledger: PortfolioLedger | None = None) -> None:
+        self.ledger = ledger if ledger is not None else PortfolioLedger()
+        self.pnls: list[float] = []
+        self._fills = 0
+
+    def submit(self, order: Order) -> None:
+        """Fill ``order`` at its price and record any PnL it realized."""
+
+        self._fills += 1
+        before = self.ledger.realized_pnl
+        self.ledger.record_execution(order, f"backtest-{self._fills}")
+        realized = self.ledger.realized_pnl - before
+        if abs(realized) > _EPSILON:
+            self.pnls.append(realized)
+
+
+class PortfolioRiskManager(RiskManager):
+    """Caps orders from an inner risk manager by current positions and exposure.
+
+    Orders that would push the net position beyond ``max_position_size`` or
+    gross exposure beyond ``max_total_exposure`` are shrunk to the remaining
+    capacity, or rejected when none is left. Orders that reduce a position are
+    always allowed.
+    """
+
+    def __init__(self, inner: RiskManager, ledger: PortfolioLedger, settings: RiskSettings) -> None:
+        self._inner = inner
+        self._ledger = ledger
+        self._settings = settings
+
+    def assess(self, signal: TradingSignal, candles: Sequence[Candle]) -> RiskAssessment:
+        """Return the inner assessment with quantity limited by portfolio capacity."""
+
+        assessment = self._inner.assess(signal, candles)
+        order = assessment.order
+        if not assessment.approved or order is None:
+            return assessment
+        position = self._ledger.position(order.instrument.symbol)
+        quantity = self._allowed_quantity(order, position)
+        if quantity <= _EPSILON:
+            return BasicRiskAssessment(approved=False, reason="Position or exposure limit reached", order=None)
+        if quantity < order.quantity:
+            order = replace(order, quantity=quantity)
+        return BasicRiskAssessment(approved=True, reason=assessment.reason, order=order)
+
+    def _allowed_quantity(self, order: Order, position: Position) -> float:
+        limit = self._settings.max_position_size
+        if order.side == OrderSide.BUY:
+            capacity = limit - position.quantity
+            reducing = max(0.0, -position.quantity)
+        else:
+            capacity = limit + position.quantity
+            reducing = max(0.0, position.quantity)
+        quantity = min(order.quantity, capacity)
+        max_exposure = self._settings.max_total_exposure
+        price = order.price or position.average_price
+        if max_exposure is not None and price > 0 and quantity > reducing:
+            headroom = max(0.0, max_exposure - self._ledger.gross_exposure)
+            quantity = min(quantity, reducing + headroom / price)
+        return max(0.0, quantity)
@@ -0,0 +1,98 @@
+"""Volatility-scaled risk management."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+
+from config.settings import RiskSettings
+from domain.interfaces import RiskAssessment
+from domain.models import Candle, CandleColumns, Order, OrderSide, SignalType, TradingSignal
+from risk.basic import BasicRiskAssessment, BasicRiskManager, protective_levels
+from utils.indicators import AverageTrueRange, candles_since
+
+
+class _VolatilityState:
+    """Streaming ATR for one instrument and the last candle it consumed."""
+
+    def __init__(self, window: int) -> None:
+        self.atr = AverageTrueRange(window)
+        self.last_timestamp: datetime | None = None
+
+
+class VolatilityRiskManager(BasicRiskManager):
+    """Places stops and sizes positions from a per-instrument average true range.
+
+    Stop-loss and take-profit sit ``stop_loss_atr_multiple`` and
+    ``take_profit_atr_multiple`` ATRs away from the entry price. When
+    ``risk_per_trade`` is set, the quantity is capped so that hitting the stop
+    loses at most that amount. The ATR consumes only candles it has not seen,
+    so each assessment costs O(1) per new candle. Until enough history has
+    accumulated the fixed percentage levels of :class:`BasicRiskManager` apply;
+    they also replace any level whose ATR distance would reach zero or below.
+    Levels are rounded away from the entry onto the instrument's tick grid, and
+    ``risk_per_trade`` is applied to the rounded stop.
+    """
+
+    def __init__(self, settings: RiskSettings) -> None:
+        super().__init__(settings)
+        if settings.volatility_window is None:
+            raise ValueError("Volatility window must be configured")
+        self._window = settings.volatility_window
+        self._states: dict[str, _VolatilityState] = {}
+
+    def average_true_range(self, symbol: str) -> float | None:
+        """Return the latest ATR tracked for ``symbol``."""
+
+        state = self._states.get(symbol)
+        return state.atr.value if state is not None else None
+
+    def assess(self, signal: TradingSignal, candles: Sequence[Candle]) -> RiskAssessment:
+        """Evaluate a signal using volatility-scaled stops and position size."""
+
+        atr = self._update_volatility(signal.instrument.symbol, candles)
+        if signal.signal_type == SignalType.HOLD:
+            return BasicRiskAssessment(approved=False, reason="Hold signal", order=None)
+        if not atr:
+            return super().assess(signal, candles)
+        price = candles[-1].close
+        side = OrderSide.BUY if signal.signal_type == SignalType.BUY else OrderSide.SELL
+        stop_distance = atr * self._settings.stop_loss_atr_multiple
+        target_distance = atr * self._settings.take_profit_atr_multiple
+        if side == OrderSide.BUY:
+            stop_loss = price - stop_distance if stop_distance < price else price * (1 - self._settings.stop_loss_pct)
+            take_profit = price + target_distance
+        else:
+            stop_loss = price + stop_distance
+            fixed_target = price * (1 - self._settings.take_profit_pct)
+            take_profit = price - target_distance if target_distance < price else fixed_target
+        stop_loss, take_profit = protective_levels(signal.instrument, price, side, stop_loss, take_profit)
+        quantity = self._position_size(signal)
+        if self._settings.risk_per_trade is not None:
+            worst_exit = stop_loss if stop_loss is not None else 0.0
+            quantity = min(quantity, self._settings.risk_per_trade / abs(price - worst_exit))
+        order = Order(
+            instrument=signal.instrument,
+            side=side,
+            quantity=quantity,
+            price=price,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            metadata={"atr": atr},
+        )
+        return BasicRiskAssessment(approved=True, reason=None, order=order)
+
+    def assess_batch(self, signal_types: Sequence[SignalType], columns: CandleColumns) -> None:
+        """Return ``None``: the streaming ATR is per-candle state, so batches use :meth:`assess`."""
+
+        return None
+
+    def _update_volatility(self, symbol: str, candles: Sequence[Candle]) -> float | None:
+        state = self._states.get(symbol)
+        if state is None:
+            state = self._states[symbol] = _VolatilityState(self._window)
+        fresh = candles_since(candles, state.last_timestamp)
+        for candle in fresh:
+            state.atr.update(candle)
+        if fresh:
+            state.last_timestamp = fresh[-1].timestamp
+        return state.atr.value
@@ -0,0 +1,89 @@
+"""Edge-triggered signal filtering."""
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping, Sequence
+from typing import Protocol
+
+from domain.interfaces import Strategy
+from domain.models import Candle, SignalType, TradingSignal
+
+
+class SignalStateStore(Protocol):
+    """Protocol describing durable storage of the last signal per key."""
+
+    def load(self) -> Mapping[str, str]:
+        """Return the last recorded signal type value for every key."""
+
+    def record(self, key: str, signal_type: str) -> None:
+        """Persist ``signal_type`` as the latest state for ``key``."""
+
+
+class EdgeTriggeredStrategy(Strategy):
+    """Emits a signal only when the wrapped strategy changes its mind.
+
+    While the inner strategy keeps returning the same signal, for example BUY
+    during a whole up-trend, this wrapper returns HOLD after the first BUY, so
+    orders are sent on crossovers instead of on every cycle. A BUY or SELL
+    only becomes the instrument's state once :meth:`signal_executed` reports
+    that its order went through, so a signal whose order was rejected or
+    failed fires again on the next evaluation. The state is kept in a
+    :class:`SignalStateStore`, so a restart does not re-fire a trend that was
+    already acted upon. A restored BUY or SELL is not overwritten by HOLD until
+    the inner strategy has produced a BUY or SELL for the key again, because
+    after a restart its HOLDs usually only mean it is still warming up on too
+    little history.
+    """
+
+    def __init__(self, inner: Strategy, *, store: SignalStateStore | None = None) -> None:
+        self._inner = inner
+        self._store = store
+        self._state: dict[str, SignalType] = {}
+        self._pending: dict[str, TradingSignal] = {}
+        self._lock = threading.Lock()
+        if store is not None:
+            self._state = {key: SignalType(value) for key, value in store.load().items()}
+        self._restored = {key for key, signal_type in self._state.items() if signal_type != SignalType.HOLD}
+
+    def generate_signal(self, candles: Sequence[Candle]) -> TradingSignal:
+        """Return the inner signal on a state transition, otherwise HOLD."""
+
+        return self._edge(candles[-1].instrument.symbol, self._inner.generate_signal(candles))
+
+    def generate_signals(self, candles: Sequence[Candle]) -> Sequence[TradingSignal]:
+        """Apply edge detection to every signal of a composite inner strategy."""
+
+        signals = self._inner.generate_signals(candles)
+        return [
+            self._edge(signal.instrument.symbol if index == 0 else f"{signal.instrument.symbol}#{index}", signal)
+            for index, signal in enumerate(signals)
+        ]
+
+    def signal_executed(self, signal: TradingSignal) -> None:
+        """Make ``signal``, as returned by this strategy, the state of its key once its order executed."""
+
+        with self._lock:
+            key = next((key for key, pending in self._pending.items() if pending is signal), None)
+            if key is None:
+                return
+            del self._pending[key]
+            self._commit(key, signal.signal_type)
+
+    def _edge(self, key: str, signal: TradingSignal) -> TradingSignal:
+        with self._lock:
+            self._pending.pop(key, None)
+            if signal.signal_type == SignalType.HOLD and key in self._restored:
+                return signal  # still warming up since the restart
+            self._restored.discard(key)
+            if signal.signal_type == self._state.get(key):
+                return TradingSignal(instrument=signal.instrument, signal_type=SignalType.HOLD)
+            if signal.signal_type == SignalType.HOLD:
+                self._commit(key, SignalType.HOLD)
+            else:
+                self._pending[key] = signal
+        return signal
+
+    def _commit(self, key: str, signal_type: SignalType) -> None:
+        self._state[key] = signal_type
+        if self._store is not None:
+            self._store.record(key, signal_type.value)
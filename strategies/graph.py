@@ -0,0 +1,82 @@
+"""Shared indicator computation for running many strategies per instrument."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from typing import Any
+
+from domain.interfaces import IndicatorStrategy, Strategy
+from domain.models import Candle, SignalType, TradingSignal
+from utils.indicators import Indicator, IndicatorSpec, candles_since, create_indicator
+
+
+class IndicatorGraph:
+    """Deduplicated set of streaming indicators for a single instrument.
+
+    Each distinct :class:`IndicatorSpec` is instantiated once, and every
+    indicator consumes each candle exactly once, however many strategies read
+    its value.
+    """
+
+    def __init__(self, specs: Iterable[IndicatorSpec]) -> None:
+        self._nodes: dict[IndicatorSpec, Indicator] = {spec: create_indicator(spec) for spec in dict.fromkeys(specs)}
+        self._values: dict[IndicatorSpec, Any] = dict.fromkeys(self._nodes)
+        self._last_timestamp: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def values(self) -> dict[IndicatorSpec, Any]:
+        """Return the current value of every indicator."""
+
+        return self._values
+
+    def update(self, candles: Sequence[Candle]) -> dict[IndicatorSpec, Any]:
+        """Feed candles not seen before and return the current indicator values."""
+
+        fresh = candles_since(candles, self._last_timestamp)
+        if not fresh:
+            return self._values
+        nodes = self._nodes.items()
+        for candle in fresh:
+            for spec, indicator in nodes:
+                self._values[spec] = indicator.update(candle)
+        self._last_timestamp = fresh[-1].timestamp
+        return self._values
+
+
+class StrategyGroup(Strategy):
+    """Runs several indicator strategies over one shared indicator graph per instrument."""
+
+    def __init__(self, strategies: Sequence[IndicatorStrategy]) -> None:
+        if not strategies:
+            raise ValueError("At least one strategy is required")
+        self._strategies = tuple(strategies)
+        self._specs = tuple(dict.fromkeys(spec for strategy in strategies for spec in strategy.required_indicators()))
+        self._graphs: dict[str, IndicatorGraph] = {}
+
+    @property
+    def indicator_count(self) -> int:
+        """Return the number of distinct indicators evaluated per instrument."""
+
+        return len(self._specs)
+
+    def generate_signals(self, candles: Sequence[Candle]) -> Sequence[TradingSignal]:
+        """Return one signal per member strategy, in the order they were supplied."""
+
+        instrument = candles[-1].instrument
+        graph = self._graphs.get(instrument.symbol)
+        if graph is None:
+            graph = self._graphs[instrument.symbol] = IndicatorGraph(self._specs)
+        values = graph.update(candles)
+        return [strategy.evaluate(instrument, values) for strategy in self._strategies]
+
+    def generate_signal(self, candles: Sequence[Candle]) -> TradingSignal:
+        """Return the first actionable member signal, or HOLD when none is."""
+
+        signals = self.generate_signals(candles)
+        for signal in signals:
+            if signal.signal_type != SignalType.HOLD:
+                return signal
+        return signals[0]
@@ -1,14 +1,22 @@
 """Strategy implementations."""
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
+from itertools import count
+from math import fsum
 from statistics import mean
+from typing import Any
 
-from domain.interfaces import Strategy
-from domain.models import Candle, SignalType, TradingSignal
+from domain.interfaces import IndicatorStrategy
+from domain.models import Candle, CandleColumns, Instrument, SignalType, TradingSignal
+from utils.indicators import IndicatorSpec
 
+# Batch averages are within a few ulps of ``statistics.mean``; closer crossings
+# are recomputed exactly so both paths agree on ties.
+_TIE_TOLERANCE = 1e-12
 
-class SMACrossoverStrategy(Strategy):
+
+class SMACrossoverStrategy(IndicatorStrategy):
     """Generates trading signals based on simple moving average crossovers."""
 
     def __init__(self, *, short_window: int, long_window: int) -> None:
@@ -18,6 +26,8 @@ class SMACrossoverStrategy(Strategy):
             raise ValueError("Short window must be smaller than long window")
         self._short_window = short_window
         self._long_window = long_window
+        self._short_spec = IndicatorSpec("sma", short_window)
+        self._long_spec = IndicatorSpec("sma", long_window)
 
     def generate_signal(self, candles: Sequence[Candle]) -> TradingSignal:
         """Return a trading signal based on the latest crossover state."""
@@ -26,13 +36,55 @@ class SMACrossoverStrategy(Strategy):
             return TradingSignal(instrument=candles[-1].instrument, signal_type=SignalType.HOLD)
         short_avg = self._moving_average(candles[-self._short_window :])
         long_avg = self._moving_average(candles[-self._long_window :])
+        return TradingSignal(instrument=candles[-1].instrument, signal_type=self._crossover(short_avg, long_avg))
+
+    def generate_signal_batch(self, columns: CandleColumns) -> Sequence[SignalType]:
+        """Return the crossover signal at every candle of ``columns``.
+
+        Each window is summed with ``math.fsum`` over a slice of the close
+        column, so the work per candle runs in C instead of building candles
+        and calling :meth:`generate_signal`.
+        """
+
+        closes = columns.close
+        signals = [SignalType.HOLD] * min(len(closes), self._long_window - 1)
+        short_avgs = self._rolling_means(closes, self._short_window)
+        long_avgs = self._rolling_means(closes, self._long_window)
+        offset = self._long_window - self._short_window
+        for short_avg, long_avg, end in zip(short_avgs[offset:], long_avgs, count(self._long_window)):
+            if abs(short_avg - long_avg) <= _TIE_TOLERANCE * abs(long_avg):
+                short_avg = mean(closes[end - self._short_window : end])
+                long_avg = mean(closes[end - self._long_window : end])
+            signals.append(self._crossover(short_avg, long_avg))
+        return signals
+
+    def required_indicators(self) -> Sequence[IndicatorSpec]:
+        """Return the short and long moving averages used by the crossover."""
+
+        return (self._short_spec, self._long_spec)
+
+    def evaluate(self, instrument: Instrument, indicators: Mapping[IndicatorSpec, Any]) -> TradingSignal:
+        """Return the crossover signal from precomputed moving averages."""
+
+        short_avg = indicators.get(self._short_spec)
+        long_avg = indicators.get(self._long_spec)
+        if short_avg is None or long_avg is None:
+            return TradingSignal(instrument=instrument, signal_type=SignalType.HOLD)
+        return TradingSignal(instrument=instrument, signal_type=self._crossover(short_avg, long_avg))
+
+    @staticmethod
+    def _crossover(short_avg: float, long_avg: float) -> SignalType:
         if short_avg > long_avg:
-            signal_type = SignalType.BUY
-        elif short_avg < long_avg:
-            signal_type = SignalType.SELL
-        else:
-            signal_type = SignalType.HOLD
-        return TradingSignal(instrument=candles[-1].instrument, signal_type=signal_type)
+            return SignalType.BUY
+        if short_avg < long_avg:
+            return SignalType.SELL
+        return SignalType.HOLD
+
+    @staticmethod
+    def _rolling_means(closes: Sequence[float], window: int) -> list[float]:
+        ends = range(window, len(closes) + 1)
+        sums = map(fsum, map(closes.__getitem__, map(slice, range(len(ends)), ends)))
+        return [total / window for total in sums]
 
     @staticmethod
     def _moving_average(window: Sequence[Candle]) -> float:
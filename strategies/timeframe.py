@@ -0,0 +1,68 @@
+"""Run strategies on bars resampled from the base candle stream."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import timedelta
+
+from domain.interfaces import Strategy
+from domain.models import Candle, SignalType, TradingSignal
+from utils.resampling import ResamplingHub
+from utils.time import parse_timeframe
+
+
+class TimeframeStrategy(Strategy):
+    """Feeds the wrapped strategy bars of a higher timeframe.
+
+    Base candles are aggregated incrementally, so no extra market data is
+    requested. The inner strategy is evaluated once per completed bar and the
+    wrapper returns HOLD in between; with ``include_partial`` it is instead
+    evaluated on every base candle with the open bar appended, which suits
+    window-based strategies but not streaming indicator graphs, since the open
+    bar keeps its start timestamp while it changes. Pass the same
+    :class:`ResamplingHub` to several wrappers to share their resampling.
+    """
+
+    def __init__(
+        self,
+        inner: Strategy,
+        timeframe: str | timedelta,
+        *,
+        hub: ResamplingHub | None = None,
+        include_partial: bool = False,
+    ) -> None:
+        self._inner = inner
+        self.timeframe = parse_timeframe(timeframe)
+        self._hub = hub or ResamplingHub()
+        self._include_partial = include_partial
+        self._evaluated: dict[str, int] = {}
+
+    def generate_signal(self, candles: Sequence[Candle]) -> TradingSignal:
+        """Return the inner signal for the resampled bars, or HOLD between bars."""
+
+        signals = self.generate_signals(candles)
+        if not signals:
+            raise ValueError("A signal needs at least one candle to name its instrument")
+        return signals[0]
+
+    def generate_signals(self, candles: Sequence[Candle]) -> Sequence[TradingSignal]:
+        """Return every inner signal for the resampled bars, HOLD between bars, or nothing without candles."""
+
+        resampler = self._hub.update(candles, self.timeframe)
+        if resampler is None:
+            return ()
+        instrument = candles[-1].instrument
+        bars = resampler.window(include_partial=self._include_partial)
+        if not self._include_partial:
+            if not bars or self._evaluated.get(instrument.symbol) == resampler.completed:
+                return (TradingSignal(instrument=instrument, signal_type=SignalType.HOLD),)
+            self._evaluated[instrument.symbol] = resampler.completed
+        if not bars:
+            return (TradingSignal(instrument=instrument, signal_type=SignalType.HOLD),)
+        return self._inner.generate_signals(bars)
+
+    def signal_executed(self, signal: TradingSignal) -> None:
+        """Pass the execution of an inner signal on to the inner strategy."""
+
+        signal_executed = getattr(self._inner, "signal_executed", None)
+        if signal_executed is not None:
+            signal_executed(signal)
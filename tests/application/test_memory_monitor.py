@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+import tracemalloc
+
+from application.memory import MemoryMonitor
+from config.settings import MemorySettings
+
+
+def test_monitor_reports_on_interval_and_writes_snapshot_diffs(tmp_path):
+    settings = MemorySettings(enabled=True, report_interval_cycles=2, output_directory=str(tmp_path), snapshot_top=5)
+    sizes = {"history.EURUSD": 1000, "strategy": 200}
+    monitor = MemoryMonitor(settings, components=lambda: sizes)
+    monitor.start()
+    try:
+        assert monitor.check(1) is None
+        first = monitor.check(2)
+        sizes["history.EURUSD"] = 3000
+        retained = [bytearray(1024) for _ in range(100)]
+        second = monitor.check(4)
+    finally:
+        monitor.stop()
+    del retained
+
+    assert not tracemalloc.is_tracing()
+    assert first.total_bytes == 1200 and second.total_bytes == 3200
+    assert second.traced_bytes is not None
+    lines = [json.loads(line) for line in (tmp_path / "memory.jsonl").read_text().splitlines()]
+    assert [line["cycle"] for line in lines] == [2, 4]
+    assert lines[1]["components"]["history.EURUSD"] == 3000
+    assert (tmp_path / "snapshot-00000002.txt").read_text().startswith("# Largest allocation sites")
+    diff = (tmp_path / "snapshot-00000004.txt").read_text()
+    assert diff.startswith("# Allocation growth since the previous snapshot")
+    assert "test_memory_monitor.py" in diff
+
+
+def test_budget_warns_and_trims(tmp_path, caplog):
+    trimmed = []
+    settings = MemorySettings(
+        enabled=True,
+        report_interval_cycles=1,
+        output_directory=str(tmp_path),
+        tracemalloc=False,
+        budget_bytes=500,
+        budget_action="trim",
+    )
+    monitor = MemoryMonitor(settings, components=lambda: {"history.EURUSD": 800}, trim=lambda: trimmed.append(True))
+    monitor.check(1)
+    assert trimmed == [True]
+    assert "exceeds the budget of 500 bytes; largest components: history.EURUSD=800" in caplog.text
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from application.pipeline import Pipeline, StageSpec
+
+
+def test_items_with_the_same_key_keep_their_order():
+    seen: dict[str, list[int]] = {}
+    lock = threading.Lock()
+
+    def record(item):
+        key, value = item
+        time.sleep(0.0005 * (value % 3))
+        with lock:
+            seen.setdefault(key, []).append(value)
+
+    pipeline = Pipeline(
+        [StageSpec("double", lambda item: (item[0], item[1] * 2), workers=3), StageSpec("record", record, workers=2)]
+    )
+    for value in range(30):
+        key = f"K{value % 4}"
+        pipeline.submit(key, (key, value))
+    assert pipeline.join(timeout=5)
+    pipeline.close()
+
+    assert sum(len(values) for values in seen.values()) == 30
+    for values in seen.values():
+        assert values == sorted(values)
+
+
+def test_slow_stage_applies_backpressure_and_reports_stall_time():
+    release = threading.Event()
+
+    def slow(item):
+        release.wait(5)
+        return item
+
+    pipeline = Pipeline([StageSpec("fast", lambda item: item, queue_size=1), StageSpec("slow", slow, queue_size=1)])
+    producer = threading.Thread(target=lambda: [pipeline.submit("key", index) for index in range(6)])
+    producer.start()
+    time.sleep(0.1)
+    # slow holds one item and one waits in its queue; fast blocks on the third,
+    # so the producer cannot get further than fast's own queue.
+    assert producer.is_alive()
+    depths = {stats.name: stats.queue_depth for stats in pipeline.stats()}
+    assert depths == {"fast": 1, "slow": 1}
+
+    release.set()
+    producer.join(5)
+    assert pipeline.join(timeout=5)
+    pipeline.close()
+    stats = {stats.name: stats for stats in pipeline.stats()}
+    assert stats["fast"].stalled_seconds > 0
+    assert stats["slow"].processed == 6
+
+
+def test_handler_errors_are_counted_and_do_not_stop_the_stage(caplog):
+    results = []
+
+    def fragile(item):
+        if item == 2:
+            raise RuntimeError("boom")
+        return item
+
+    pipeline = Pipeline([StageSpec("fragile", fragile), StageSpec("sink", results.append)])
+    for item in range(4):
+        pipeline.submit("key", item)
+    assert pipeline.join(timeout=5)
+    pipeline.close()
+
+    assert results == [0, 1, 3]
+    assert pipeline.stats()[0].errors == 1
+    assert "boom" in caplog.text
+
+
+def test_close_drains_queued_items_and_rejects_new_ones():
+    results = []
+    pipeline = Pipeline([StageSpec("sleep", lambda item: time.sleep(0.001) or item), StageSpec("sink", results.append)])
+    for item in range(20):
+        pipeline.submit("key", item)
+    pipeline.close()
+
+    assert results == list(range(20))
+    with pytest.raises(RuntimeError):
+        pipeline.submit("key", 0)
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
 
 from application.services import TradingBotService
-from config.settings import TradingBotSettings
-from domain.interfaces import RiskAssessment
+from config.settings import (
+    BootstrapSettings,
+    CycleSettings,
+    PipelineSettings,
+    RiskSettings,
+    StrategySettings,
+    TradingBotSettings,
+)
+from domain.interfaces import RiskAssessment, Strategy
 from domain.models import Candle, Instrument, Order, OrderSide, SignalType, TradingSignal
-from risk.basic import BasicRiskAssessment
+from risk.basic import BasicRiskAssessment, BasicRiskManager
+from risk.portfolio import PortfolioLedger, PortfolioRiskManager
 
 
 class StubMarketData:
@@ -27,10 +38,10 @@ class StubMarketData:
         return self.latest
 
     def get_historical_candles(self, instrument, *, start, end, limit):
-        return [self.latest]
+        return [replace(self.latest, timestamp=self.latest.timestamp - timedelta(minutes=1))]
 
 
-class StubStrategy:
+class StubStrategy(Strategy):
     def generate_signal(self, candles):
         return TradingSignal(instrument=candles[-1].instrument, signal_type=SignalType.BUY)
 
@@ -93,7 +104,7 @@ def test_run_once_rejects_signal():
 
 
 def test_run_cycle_handles_strategy_error(caplog):
-    class FaultyStrategy:
+    class FaultyStrategy(Strategy):
         def generate_signal(self, candles):
             raise RuntimeError("boom")
 
@@ -108,3 +119,466 @@ def test_run_cycle_handles_strategy_error(caplog):
     service.run_once()
     assert not executor.orders
     assert any("failed" in message for message in caplog.text.splitlines())
+
+
+def test_cycle_callback_receives_metrics():
+    snapshots = []
+    service = TradingBotService(
+        settings=TradingBotSettings(instruments=["EURUSD"], history_limit=1, poll_interval_seconds=1),
+        market_data=StubMarketData(),
+        strategy=StubStrategy(),
+        risk_manager=StubRiskManager(),
+        order_executor=StubOrderExecutor(),
+        cycle_callback=snapshots.append,
+    )
+    service.run_once()
+    assert len(snapshots) == 1
+    assert snapshots[0].cycles == 1
+    assert snapshots[0].orders_executed == 1
+    assert service.metrics == snapshots[0]
+
+
+def test_service_uses_configured_instrument_definitions():
+    requested: list[Instrument] = []
+
+    class RecordingMarketData(StubMarketData):
+        def get_latest_candle(self, instrument):
+            requested.append(instrument)
+            return self.latest
+
+    service = TradingBotService(
+        settings=TradingBotSettings(
+            instruments=["EURUSD"],
+            history_limit=1,
+            poll_interval_seconds=1,
+            instrument_details={"EURUSD": {"tick_size": 0.0001}},
+        ),
+        market_data=RecordingMarketData(),
+        strategy=StubStrategy(),
+        risk_manager=StubRiskManager(),
+        order_executor=StubOrderExecutor(),
+    )
+    service.run_once()
+    service.run_once()
+    assert requested[0].tick_size == 0.0001
+    assert requested[0] is requested[1]
+
+
+def test_apply_settings_bootstraps_only_new_instruments_and_rebuilds_changed_parts():
+    history_requests: list[str] = []
+
+    class RecordingMarketData(StubMarketData):
+        def get_historical_candles(self, instrument, *, start, end, limit):
+            history_requests.append(instrument.symbol)
+            return [self.latest]
+
+    built: list[str] = []
+    original_strategy = StubStrategy()
+    original_risk = StubRiskManager()
+    settings = TradingBotSettings(instruments=["EURUSD", "GBPUSD"], history_limit=5, poll_interval_seconds=1)
+    service = TradingBotService(
+        settings=settings,
+        market_data=RecordingMarketData(),
+        strategy=original_strategy,
+        risk_manager=original_risk,
+        order_executor=StubOrderExecutor(),
+        strategy_factory=lambda _settings: built.append("strategy") or StubStrategy(),
+        risk_factory=lambda _settings: built.append("risk") or StubRiskManager(),
+    )
+    service.run_once()
+    history_requests.clear()
+
+    updated = TradingBotSettings(instruments=["EURUSD", "USDJPY"], history_limit=5, poll_interval_seconds=2)
+    updated.risk.max_position_size = 3
+    service.apply_settings(updated)
+
+    assert history_requests == ["USDJPY"]
+    assert built == ["risk"]
+    assert service._strategy is original_strategy
+    assert service._risk_manager is not original_risk
+    assert set(service._contexts) == {"EURUSD", "USDJPY"}
+    assert service._scheduler.interval_seconds == 2
+
+
+def test_reload_with_changed_instrument_details_keeps_the_instrument_id():
+    settings = TradingBotSettings(instruments=["EURUSD", "GBPUSD"], history_limit=5, poll_interval_seconds=1)
+    service = TradingBotService(
+        settings=settings,
+        market_data=StubMarketData(),
+        strategy=StubStrategy(),
+        risk_manager=StubRiskManager(),
+        order_executor=StubOrderExecutor(),
+    )
+    instrument_id = service._registry.id_of("EURUSD")
+
+    updated = replace(settings, instrument_details={"EURUSD": {"tick_size": 0.0001}})
+    service.apply_settings(updated)
+
+    assert service._registry.id_of("EURUSD") == instrument_id
+    assert service._registry.by_id(instrument_id).tick_size == 0.0001
+
+
+def test_failed_reload_keeps_running_configuration():
+    def failing_factory(_settings):
+        raise ValueError("bad window")
+
+    settings = TradingBotSettings(instruments=["EURUSD"], history_limit=1, poll_interval_seconds=1)
+    updated = TradingBotSettings(instruments=["EURUSD", "GBPUSD"], history_limit=1, poll_interval_seconds=1)
+    updated.strategy.short_window = 2
+    pending = [updated]
+    executor = StubOrderExecutor()
+    service = TradingBotService(
+        settings=settings,
+        market_data=StubMarketData(),
+        strategy=StubStrategy(),
+        risk_manager=StubRiskManager(),
+        order_executor=executor,
+        settings_source=lambda: pending.pop() if pending else None,
+        strategy_factory=failing_factory,
+    )
+    service.run_once()
+    assert service._registry.symbols == ["EURUSD"]
+    assert len(executor.orders) == 1
+
+
+def test_run_cycle_executes_every_signal_from_composite_strategy():
+    class CompositeStrategy(StubStrategy):
+        def generate_signals(self, candles):
+            return [self.generate_signal(candles), self.generate_signal(candles)]
+
+    executor = StubOrderExecutor()
+    service = TradingBotService(
+        settings=TradingBotSettings(instruments=["EURUSD"], history_limit=1, poll_interval_seconds=1),
+        market_data=StubMarketData(),
+        strategy=CompositeStrategy(),
+        risk_manager=StubRiskManager(),
+        order_executor=executor,
+    )
+    service.run_once()
+    assert len(executor.orders) == 2
+    assert service.metrics.signals == 2
+
+
+def test_unchanged_latest_candle_is_not_evaluated_again():
+    executor = StubOrderExecutor()
+    service = TradingBotService(
+        settings=TradingBotSettings(instruments=["EURUSD"], history_limit=5, poll_interval_seconds=1),
+        market_data=StubMarketData(),
+        strategy=StubStrategy(),
+        risk_manager=StubRiskManager(),
+        order_executor=executor,
+    )
+    service.run_once()
+    service._run_cycle()
+    assert len(executor.orders) == 1
+    assert service.metrics.stale_candles == 1
+    assert service.metrics.candles == 1
+
+
+def test_pipeline_processes_every_instrument_and_drains_on_stop():
+    class PerInstrumentMarketData(StubMarketData):
+        def get_latest_candle(self, instrument):
+            return replace(self.latest, instrument=instrument)
+
+        def get_historical_candles(self, instrument, *, start, end, limit):
+            history = super().get_historical_candles(instrument, start=start, end=end, limit=limit)
+            return [replace(candle, instrument=instrument) for candle in history]
+
+    symbols = [f"SYM{index}" for index in range(6)]
+    executor = StubOrderExecutor()
+    service = TradingBotService(
+        settings=TradingBotSettings(
+            instruments=symbols,
+            history_limit=5,
+            poll_interval_seconds=1,
+            pipeline=PipelineSettings(enabled=True, fetch_workers=3),
+        ),
+        market_data=PerInstrumentMarketData(),
+        strategy=StubStrategy(),
+        risk_manager=StubRiskManager(),
+        order_executor=executor,
+    )
+    service.run_once()
+
+    assert sorted(order.instrument.symbol for order in executor.orders) == symbols
+    metrics = service.metrics
+    assert metrics.cycles == 1
+    assert metrics.orders_executed == len(symbols)
+    assert service.pipeline_stats() == []  # closed after the run
+
+
+def test_pipeline_checks_portfolio_exposure_against_executed_orders():
+    class PerInstrumentMarketData(StubMarketData):
+        def get_latest_candle(self, instrument):
+            return replace(self.latest, instrument=instrument)
+
+    class SlowOrderExecutor(StubOrderExecutor):
+        def execute(self, order: Order) -> str:
+            time.sleep(0.05)  # let the other instrument reach the risk manager meanwhile
+            return super().execute(order)
+
+    risk = RiskSettings(max_position_size=1, max_total_exposure=1.05)
+    ledger = PortfolioLedger()
+    executor = SlowOrderExecutor()
+    service = TradingBotService(
+        settings=TradingBotSettings(
+            instruments=["A", "B"],
+            history_limit=5,
+            poll_interval_seconds=1,
+            risk=risk,
+            pipeline=PipelineSettings(enabled=True, fetch_workers=2, evaluate_workers=2),
+        ),
+        market_data=PerInstrumentMarketData(),
+        strategy=StubStrategy(),
+        risk_manager=PortfolioRiskManager(BasicRiskManager(risk), ledger, risk),
+        order_executor=executor,
+        execution_callback=ledger.record_execution,
+    )
+    service.run_once()
+
+    assert len(executor.orders) == 1
+    assert sum(order.quantity * order.price for order in executor.orders) <= risk.max_total_exposure
+
+
+def test_memory_usage_and_trimming():
+    service = TradingBotService(
+        settings=TradingBotSettings(instruments=["EURUSD"], history_limit=8, poll_interval_seconds=1),
+        market_data=StubMarketData(),
+        strategy=StubStrategy(),
+        risk_manager=StubRiskManager(),
+        order_executor=StubOrderExecutor(),
+    )
+    service.run_once()
+    usage = service.memory_usage()
+    assert usage["history.EURUSD"] > 0
+    assert {"instruments", "strategy", "risk_manager", "order_executor", "market_data"} <= set(usage)
+
+    assert service.trim_history(2) == 0  # two candles fit into half of the history limit
+    assert service.trim_history(2) == 0
+    assert service.trim_history(1) == 1
+
+
+def test_cycle_deadline_defers_instruments_and_prioritises_open_positions():
+    elapsed = [0.0]
+    latest = [datetime(2024, 1, 1, tzinfo=timezone.utc)]
+    fetched: list[str] = []
+
+    class SlowMarketData(StubMarketData):
+        def get_latest_candle(self, instrument):
+            fetched.append(instrument.symbol)
+            elapsed[0] += 3
+            latest[0] += timedelta(minutes=1)
+            return replace(self.latest, instrument=instrument, timestamp=latest[0])
+
+    class BuyDStrategy(Strategy):
+        def generate_signal(self, candles):
+            signal_type = SignalType.BUY if candles[-1].instrument.symbol == "D" else SignalType.HOLD
+            return TradingSignal(instrument=candles[-1].instrument, signal_type=signal_type)
+
+    class HoldRejectingRiskManager(StubRiskManager):
+        def assess(self, signal, candles) -> RiskAssessment:
+            if signal.signal_type == SignalType.HOLD:
+                return BasicRiskAssessment(approved=False, reason="hold", order=None)
+            return super().assess(signal, candles)
+
+    executor = StubOrderExecutor()
+    ledger = PortfolioLedger()
+    service = TradingBotService(
+        settings=TradingBotSettings(
+            instruments=["A", "B", "C", "D"],
+            history_limit=5,
+            poll_interval_seconds=10,
+            cycle=CycleSettings(deadline_fraction=0.5),
+        ),
+        market_data=SlowMarketData(),
+        strategy=BuyDStrategy(),
+        risk_manager=HoldRejectingRiskManager(),
+        order_executor=executor,
+        execution_callback=ledger.record_execution,
+        timer=lambda: elapsed[0],
+        positions=lambda symbol: ledger.position(symbol).quantity,
+    )
+
+    service.run_once()
+    assert fetched == ["A", "B"]
+    service._run_cycle()
+    assert fetched[2:] == ["C", "D"]  # deferred instruments go first
+    assert [order.instrument.symbol for order in executor.orders] == ["D"]
+    service._run_cycle()
+    assert fetched[4:] == ["D", "A"]  # the open position goes before the deferred ones
+
+    metrics = service.metrics
+    assert metrics.deadline_misses == 3
+    assert metrics.deferred_instruments == 6
+    assert metrics.cycles == 3
+
+
+def test_cycle_without_deadline_processes_every_instrument_in_order():
+    fetched: list[str] = []
+
+    class RecordingMarketData(StubMarketData):
+        def get_latest_candle(self, instrument):
+            fetched.append(instrument.symbol)
+            return replace(self.latest, instrument=instrument)
+
+    service = TradingBotService(
+        settings=TradingBotSettings(instruments=["A", "B", "C"], history_limit=5, poll_interval_seconds=1),
+        market_data=RecordingMarketData(),
+        strategy=StubStrategy(),
+        risk_manager=StubRiskManager(),
+        order_executor=StubOrderExecutor(),
+    )
+    service.run_once()
+
+    assert fetched == ["A", "B", "C"]
+    assert service.metrics.deadline_misses == 0
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_background_bootstrap_lets_loaded_instruments_trade_first():
+    release_b = threading.Event()
+    fetched: list[str] = []
+
+    class GatedMarketData(StubMarketData):
+        def get_latest_candle(self, instrument):
+            fetched.append(instrument.symbol)
+            return replace(self.latest, instrument=instrument)
+
+        def get_historical_candles(self, instrument, *, start, end, limit):
+            if instrument.symbol == "B":
+                release_b.wait(5)
+            if instrument.symbol == "C":
+                raise RuntimeError("history unavailable")
+            history = super().get_historical_candles(instrument, start=start, end=end, limit=limit)
+            return [replace(candle, instrument=instrument) for candle in history]
+
+    service = TradingBotService(
+        settings=TradingBotSettings(
+            instruments=["A", "B", "C"],
+            history_limit=5,
+            poll_interval_seconds=1,
+            bootstrap=BootstrapSettings(background=True),
+        ),
+        market_data=GatedMarketData(),
+        strategy=StubStrategy(),
+        risk_manager=StubRiskManager(),
+        order_executor=StubOrderExecutor(),
+    )
+    service._start_background_bootstrap()
+    try:
+        _wait_for(lambda: service.bootstrap_status().loaded == 2)
+        status = service.bootstrap_status()
+        assert status.pending == ("B",)
+        assert status.failed == ("C",)
+        assert not status.complete
+
+        service._run_cycle()
+        assert sorted(fetched) == ["A", "C"]
+
+        release_b.set()
+        _wait_for(lambda: service.bootstrap_status().complete)
+        service._run_cycle()
+        assert sorted(fetched[2:]) == ["A", "B", "C"]
+    finally:
+        release_b.set()
+        service._stop_background_bootstrap()
+
+    status = service.bootstrap_status()
+    assert status.total == 3
+    assert status.ready == ()  # one candle of history is less than the default long window
+    assert set(status.warming_up) == {"A", "B", "C"}
+
+
+def test_blocking_bootstrap_loads_instruments_in_parallel():
+    barrier = threading.Barrier(3, timeout=5)
+
+    class ConcurrentMarketData(StubMarketData):
+        def get_historical_candles(self, instrument, *, start, end, limit):
+            barrier.wait()  # only passes when all three loads run at once
+            return super().get_historical_candles(instrument, start=start, end=end, limit=limit)
+
+    service = TradingBotService(
+        settings=TradingBotSettings(
+            instruments=["A", "B", "C"],
+            history_limit=1,
+            poll_interval_seconds=1,
+            strategy=StrategySettings(short_window=1, long_window=2),
+        ),
+        market_data=ConcurrentMarketData(),
+        strategy=StubStrategy(),
+        risk_manager=StubRiskManager(),
+        order_executor=StubOrderExecutor(),
+    )
+    service._bootstrap_history()
+
+    status = service.bootstrap_status()
+    assert status.complete
+    assert status.ready == ("A", "B", "C")
+
+
+def test_blocking_bootstrap_survives_a_failed_instrument():
+    class FailingMarketData(StubMarketData):
+        def get_latest_candle(self, instrument):
+            return replace(self.latest, instrument=instrument)
+
+        def get_historical_candles(self, instrument, *, start, end, limit):
+            if instrument.symbol == "B":
+                raise ConnectionError("history unavailable")
+            history = super().get_historical_candles(instrument, start=start, end=end, limit=limit)
+            return [replace(candle, instrument=instrument) for candle in history]
+
+    executor = StubOrderExecutor()
+    service = TradingBotService(
+        settings=TradingBotSettings(
+            instruments=["A", "B", "C"],
+            history_limit=5,
+            poll_interval_seconds=1,
+            strategy=StrategySettings(short_window=1, long_window=2),
+        ),
+        market_data=FailingMarketData(),
+        strategy=StubStrategy(),
+        risk_manager=StubRiskManager(),
+        order_executor=executor,
+    )
+    service.run_once()
+
+    status = service.bootstrap_status()
+    assert status.failed == ("B",)
+    assert status.ready == ("A", "C")
+    assert sorted(order.instrument.symbol for order in executor.orders) == ["A", "B", "C"]
+
+
+def test_cycle_deadline_ignores_the_business_clock():
+    now = [datetime(2024, 1, 1, tzinfo=timezone.utc)]
+
+    class ReplayLikeMarketData(StubMarketData):
+        def get_latest_candle(self, instrument):
+            now[0] += timedelta(minutes=1)  # a replay clock jumps a candle per fetch
+            return replace(self.latest, instrument=instrument, timestamp=now[0])
+
+    service = TradingBotService(
+        settings=TradingBotSettings(
+            instruments=["A", "B", "C", "D"],
+            history_limit=5,
+            poll_interval_seconds=10,
+            cycle=CycleSettings(deadline_fraction=0.5),
+        ),
+        market_data=ReplayLikeMarketData(),
+        strategy=StubStrategy(),
+        risk_manager=StubRiskManager(),
+        order_executor=StubOrderExecutor(),
+        clock=lambda: now[0],
+        timer=lambda: 0.0,
+    )
+    service.run_once()
+    for _ in range(4):
+        service._run_cycle()
+
+    assert service.metrics.deadline_misses == 0
+    assert service.metrics.candles == 20
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import yaml
+
+from config.watcher import ConfigWatcher
+
+
+def _write(path: Path, data: dict, *, mtime_offset: int = 0) -> None:
+    path.write_text(yaml.safe_dump(data))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset))
+
+
+def test_poll_returns_none_until_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    _write(path, {"instruments": ["EURUSD"]})
+    watcher = ConfigWatcher(path)
+    assert watcher.poll() is None
+    _write(path, {"instruments": ["EURUSD", "GBPUSD"]}, mtime_offset=1_000_000_000)
+    settings = watcher.poll()
+    assert settings is not None
+    assert settings.instruments == ["EURUSD", "GBPUSD"]
+    assert watcher.poll() is None
+
+
+def test_request_reload_forces_reload(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    _write(path, {"instruments": ["EURUSD"]})
+    watcher = ConfigWatcher(path)
+    watcher.request_reload()
+    assert watcher.poll() is not None
+    assert watcher.poll() is None
+
+
+def test_invalid_file_is_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    _write(path, {"instruments": ["EURUSD"]})
+    watcher = ConfigWatcher(path)
+    path.write_text("instruments: [unterminated")
+    watcher.request_reload()
+    assert watcher.poll() is None
@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 
 import pytest
 
-from domain.models import Candle, Instrument, Order, OrderSide, SignalType, TradingSignal
+from domain.models import Candle, CandleColumns, Instrument, Order, OrderSide, SignalType, TradingSignal
 
 
 def test_instrument_requires_symbol():
@@ -40,3 +40,22 @@ def test_order_validates_stop_levels(sample_instrument: Instrument) -> None:
             stop_loss=2.0,
             take_profit=1.5,
         )
+
+
+def test_instrument_rounds_price_to_tick_size() -> None:
+    instrument = Instrument(symbol="EURUSD", tick_size=0.00005)
+    assert instrument.round_price(1.234567) == 1.23455
+    assert Instrument(symbol="ES", tick_size=0.25).round_price(4500.1) == 4500.0
+
+
+def test_candle_columns_require_equal_lengths():
+    with pytest.raises(ValueError):
+        CandleColumns(
+            instrument=Instrument(symbol="EURUSD"),
+            timestamps=[0, 1],
+            open=[1.0],
+            high=[1.0],
+            low=[1.0],
+            close=[1.0],
+            volume=[1.0],
+        )
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pytest
+
+from domain.models import Instrument
+from domain.registry import InstrumentRegistry
+
+
+def test_from_config_applies_details():
+    registry = InstrumentRegistry.from_config(
+        ["EURUSD", "BTCUSD"],
+        {"EURUSD": {"name": "Euro/USD", "tick_size": 0.00001, "metadata": {"asset_class": "fx"}}},
+    )
+    eurusd = registry.get("EURUSD")
+    assert eurusd.name == "Euro/USD"
+    assert eurusd.tick_size == pytest.approx(0.00001)
+    assert eurusd.metadata["asset_class"] == "fx"
+    assert registry.get("BTCUSD").tick_size == pytest.approx(0.01)
+
+
+def test_lookup_by_symbol_and_id_returns_same_instance():
+    registry = InstrumentRegistry.from_config(["EURUSD", "GBPUSD"])
+    instrument_id = registry.id_of("GBPUSD")
+    assert registry.by_id(instrument_id) is registry.get("GBPUSD")
+    assert registry.intern(Instrument(symbol="GBPUSD")) is registry.get("GBPUSD")
+    assert [instrument.symbol for instrument in registry] == ["EURUSD", "GBPUSD"]
+
+
+def test_ids_are_not_reused_after_unregister():
+    registry = InstrumentRegistry.from_config(["EURUSD"])
+    first_id = registry.id_of("EURUSD")
+    registry.unregister("EURUSD")
+    assert "EURUSD" not in registry
+    registry.register(Instrument(symbol="EURUSD"))
+    assert registry.id_of("EURUSD") != first_id
+    with pytest.raises(KeyError):
+        registry.by_id(first_id)
+
+
+def test_register_keeps_existing_instance():
+    registry = InstrumentRegistry()
+    original = registry.register(Instrument(symbol="EURUSD", tick_size=0.0001))
+    assert registry.register(Instrument(symbol="EURUSD")) is original
+    assert len(registry) == 1
+
+
+def test_update_replaces_definition_and_keeps_id():
+    registry = InstrumentRegistry([Instrument(symbol="EURUSD"), Instrument(symbol="GBPUSD")])
+    instrument_id = registry.id_of("GBPUSD")
+    updated = registry.update(Instrument(symbol="GBPUSD", tick_size=0.0001))
+    assert registry.get("GBPUSD") is updated
+    assert registry.by_id(instrument_id) is updated
+    assert registry.id_of("GBPUSD") == instrument_id
+    with pytest.raises(KeyError):
+        registry.update(Instrument(symbol="USDJPY"))
+
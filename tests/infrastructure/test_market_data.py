@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 
 import pytest
+import requests
 
-from config.settings import DataSourceSettings
+from config.settings import DataSourceSettings, RateLimitSettings
 from domain.models import Instrument
 from infrastructure.market_data import ConfigurableMarketDataClient
+from infrastructure.rate_limit import RateLimiter
+from utils.validation import BatchValidationError
 
 
 class DummyResponse:
@@ -92,3 +98,127 @@ def test_stream_candles_uses_source():
     )
     candle = next(iter(client.stream_candles(instrument)))
     assert candle.instrument.symbol == "EURUSD"
+
+
+def test_latest_candle_uses_conditional_requests():
+    class ConditionalResponse(DummyResponse):
+        def __init__(self, payload, status_code=200, etag=None):
+            super().__init__(payload)
+            self.status_code = status_code
+            self.headers = {"ETag": etag} if etag else {}
+
+    class ConditionalSession:
+        def __init__(self):
+            self.headers = []
+            self.responses = [
+                ConditionalResponse(
+                    {"timestamp": "2024-01-01T00:00:00Z", "open": 1.0, "high": 1.1, "low": 0.9, "close": 1.05},
+                    etag='"v1"',
+                ),
+                ConditionalResponse(None, status_code=304, etag='"v1"'),
+            ]
+
+        def request(self, method, url, params=None, headers=None, timeout=None):
+            self.headers.append(headers)
+            return self.responses.pop(0)
+
+    session = ConditionalSession()
+    client = ConfigurableMarketDataClient(DataSourceSettings(base_url="http://test"), session=session)
+    first = client.get_latest_candle(Instrument(symbol="EURUSD"))
+    second = client.get_latest_candle(Instrument(symbol="EURUSD"))
+    assert second is first
+    assert session.headers == [None, {"If-None-Match": '"v1"'}]
+
+
+def test_rate_limited_response_throttles_the_shared_limiter():
+    class RateLimitedResponse(DummyResponse):
+        status_code = 429
+        headers = {"Retry-After": "0"}
+
+        def raise_for_status(self):  # pragma: no cover - not reached
+            raise AssertionError("429 should be handled by the limiter")
+
+    class Session(DummySession):
+        def request(self, method, url, params=None, timeout=None, **kwargs):
+            if not self.calls:
+                self.calls.append({"method": method, "url": url})
+                return RateLimitedResponse(None)
+            return super().request(method, url, params=params, timeout=timeout, **kwargs)
+
+    limiter = RateLimiter(RateLimitSettings(requests_per_second=1000))
+    session = Session([{"timestamp": "2024-01-01T00:00:00Z", "open": 1.0, "high": 1.1, "low": 0.9, "close": 1.05}])
+    client = ConfigurableMarketDataClient(
+        DataSourceSettings(base_url="http://test"), session=session, rate_limiter=limiter
+    )
+    candle = client.get_latest_candle(Instrument(symbol="EURUSD"))
+    assert candle.close == pytest.approx(1.05)
+    assert len(session.calls) == 2
+    assert limiter.throttled_responses == 1
+
+
+def test_long_history_is_fetched_in_parallel_pages_and_only_failed_pages_are_retried():
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    lock = threading.Lock()
+    calls: list[str] = []
+    active = [0, 0]  # current, peak
+
+    class PagedSession:
+        def request(self, method, url, params=None, timeout=None, **kwargs):
+            with lock:
+                calls.append(params["start"])
+                active[0] += 1
+                active[1] = max(active)
+                first_attempt = calls.count(params["start"]) == 1
+            try:
+                time.sleep(0.02)
+                if params["start"] == (start + timedelta(minutes=20)).isoformat() and first_attempt:
+                    raise requests.ConnectionError("connection reset")
+                page_start = datetime.fromisoformat(params["start"])
+                page_end = datetime.fromisoformat(params["end"])
+                minutes = range(
+                    math.ceil((page_start - start).total_seconds() / 60),
+                    int((page_end - start).total_seconds() // 60) + 1,
+                )
+                # Every page repeats the candle before it, as an inclusive server might.
+                rows = [minute for minute in range(minutes.start - 1, minutes.stop) if 0 <= minute < 45]
+                return DummyResponse([_candle_payload(start + timedelta(minutes=minute)) for minute in rows])
+            finally:
+                with lock:
+                    active[0] -= 1
+
+    settings = DataSourceSettings(base_url="http://test", history_page_size=10, history_page_workers=3)
+    client = ConfigurableMarketDataClient(settings, session=PagedSession())
+    candles = client.get_historical_candles(
+        Instrument(symbol="EURUSD"), start=start, end=start + timedelta(minutes=44), limit=40
+    )
+
+    assert [candle.timestamp for candle in candles] == [start + timedelta(minutes=m) for m in range(5, 45)]
+    assert len(calls) == 6  # five pages, and the failed one once more
+    assert calls.count((start + timedelta(minutes=20)).isoformat()) == 2
+    assert active[1] > 1
+
+
+def test_unordered_history_is_reported_by_row():
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    session = DummySession([[_candle_payload(start + timedelta(minutes=1)), _candle_payload(start)]])
+    client = ConfigurableMarketDataClient(DataSourceSettings(base_url="http://test"), session=session)
+    with pytest.raises(BatchValidationError, match="History for EURUSD row 1: timestamps must be strictly increasing"):
+        client.get_historical_candles(Instrument(symbol="EURUSD"), start=start, end=start + timedelta(hours=1), limit=5)
+
+
+def test_short_history_uses_a_single_request():
+    session = DummySession([[_candle_payload(datetime(2024, 1, 1, tzinfo=timezone.utc))]])
+    settings = DataSourceSettings(base_url="http://test", history_page_size=10)
+    client = ConfigurableMarketDataClient(settings, session=session)
+    client.get_historical_candles(
+        Instrument(symbol="EURUSD"),
+        start=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        end=datetime(2024, 1, 2, tzinfo=timezone.utc),
+        limit=10,
+    )
+    assert len(session.calls) == 1
+    assert session.calls[0]["params"]["limit"] == 10
+
+
+def _candle_payload(timestamp: datetime) -> dict:
+    return {"timestamp": timestamp.isoformat(), "open": 1.0, "high": 1.1, "low": 0.9, "close": 1.05}
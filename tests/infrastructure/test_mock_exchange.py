@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+from config.settings import DataSourceSettings
+from domain.models import Instrument, Order, OrderSide
+from infrastructure.market_data import ConfigurableMarketDataClient
+from infrastructure.mock_exchange import MockExchange, MockExchangeServer, MockExchangeSettings
+from infrastructure.order_execution import OrderExecutionClient
+
+NOW = datetime(2024, 1, 1, 12, 0, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def server():
+    with MockExchangeServer(clock=lambda: NOW) as running:
+        yield running
+
+
+def test_clients_round_trip_against_mock_exchange(server):
+    settings = DataSourceSettings(base_url=server.base_url, retries=1)
+    instrument = Instrument(symbol="EURUSD")
+    market = ConfigurableMarketDataClient(settings)
+    latest = market.get_latest_candle(instrument)
+    assert latest.timestamp == datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+    history = market.get_historical_candles(instrument, start=NOW - timedelta(hours=1), end=NOW, limit=10)
+    assert len(history) == 10
+    assert history[-1] == latest
+    assert [candle.timestamp for candle in history] == sorted(candle.timestamp for candle in history)
+
+    executor = OrderExecutionClient(settings)
+    execution_id = executor.execute(Order(instrument=instrument, side=OrderSide.BUY, quantity=1.5, price=1.0))
+    fill = server.exchange.engine.fills[0]
+    assert fill.execution_id == execution_id
+    assert fill.price == pytest.approx(latest.close)
+    assert server.exchange.stats.orders == 1
+
+
+def test_synthetic_prices_are_deterministic_and_valid():
+    first = MockExchange(MockExchangeSettings(seed=7))
+    second = MockExchange(MockExchangeSettings(seed=7))
+    candles = [first.candle("EURUSD", index) for index in range(100)]
+    assert candles == [second.candle("EURUSD", index) for index in range(100)]
+    assert candles[1].open == candles[0].close
+    assert first.candle("GBPUSD", 5) != candles[5]
+
+
+def test_history_never_includes_future_candles():
+    exchange = MockExchange(clock=lambda: NOW)
+    candles = exchange.historical_candles("EURUSD", NOW - timedelta(minutes=5), NOW + timedelta(hours=1), 100)
+    assert candles[-1].timestamp == datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    assert len(candles) == 5
+
+
+def test_injected_errors_and_rate_limits():
+    failing = MockExchangeServer(MockExchangeSettings(error_rate=1.0))
+    limited = MockExchangeServer(MockExchangeSettings(rate_limit_per_second=1, rate_limit_burst=2))
+    with failing, limited:
+        assert requests.get(f"{failing.base_url}/candles/latest", params={"symbol": "X"}).status_code == 503
+        statuses = [
+            requests.get(f"{limited.base_url}/candles/latest", params={"symbol": "X"}).status_code for _ in range(3)
+        ]
+    assert statuses == [200, 200, 429]
+    assert failing.exchange.stats.injected_errors == 1
+    assert limited.exchange.stats.rate_limited == 1
+
+
+def test_rejects_invalid_orders(server):
+    response = requests.post(f"{server.base_url}/orders", json={"symbol": "EURUSD", "side": "hold", "quantity": 1})
+    assert response.status_code == 400
+    assert server.exchange.engine.fills == ()
+
+
+def test_latest_candle_supports_if_none_match(server):
+    url = f"{server.base_url}/candles/latest"
+    first = requests.get(url, params={"symbol": "EURUSD"})
+    second = requests.get(url, params={"symbol": "EURUSD"}, headers={"If-None-Match": first.headers["ETag"]})
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.content == b""
+    assert server.exchange.stats.not_modified == 1
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from domain.models import Instrument, Order, OrderSide
+from infrastructure.paper import PaperFillEngine, PaperOrderExecutor
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _order(side=OrderSide.BUY, price=100.0):
+    return Order(instrument=Instrument(symbol="EURUSD"), side=side, quantity=2.0, price=price)
+
+
+def test_fill_engine_applies_slippage_against_the_trader():
+    engine = PaperFillEngine(slippage_bps=10, clock=lambda: NOW)
+    buy = engine.fill(_order(OrderSide.BUY))
+    sell = engine.fill(_order(OrderSide.SELL), reference_price=200.0)
+    assert buy.price == pytest.approx(100.1)
+    assert sell.price == pytest.approx(199.8)
+    assert (buy.execution_id, sell.execution_id) == ("paper-00000001", "paper-00000002")
+    assert engine.fills == (buy, sell)
+    assert buy.timestamp == NOW
+
+
+def test_fill_engine_keeps_only_the_most_recent_fills():
+    engine = PaperFillEngine(max_fills=2)
+    fills = [engine.fill(_order()) for _ in range(5)]
+    assert engine.fills == tuple(fills[-2:])
+    assert fills[-1].execution_id == "paper-00000005"
+
+
+def test_fill_engine_requires_a_price():
+    with pytest.raises(ValueError):
+        PaperFillEngine().fill(_order(price=None))
+
+
+def test_paper_executor_returns_fill_ids():
+    executor = PaperOrderExecutor()
+    execution_id = executor.execute(_order())
+    assert executor.engine.fills[0].execution_id == execution_id
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import json
+import threading
 from pathlib import Path
 
+import pytest
+
 from domain.models import Instrument, Order, OrderSide
-from infrastructure.persistence import ExecutionLogger, FileExecutionWriter
+from infrastructure.persistence import ExecutionLogger, FileExecutionWriter, FileSignalStateStore
 
 
 def test_execution_logger_writes_file(tmp_path: Path) -> None:
@@ -15,3 +18,48 @@ def test_execution_logger_writes_file(tmp_path: Path) -> None:
     data = [json.loads(line) for line in path.read_text().splitlines()]
     assert data[0]["execution_id"] == "abc"
     assert data[0]["order"]["side"] == "buy"
+
+
+def test_signal_state_store_keeps_latest_value_per_key(tmp_path: Path) -> None:
+    path = tmp_path / "state" / "signals.jsonl"
+    store = FileSignalStateStore(path)
+    assert store.load() == {}
+    store.record("EURUSD", "buy")
+    store.record("GBPUSD", "sell")
+    store.record("EURUSD", "hold")
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write('{"key": "USDJPY", "sig')
+    assert FileSignalStateStore(path).load() == {"EURUSD": "hold", "GBPUSD": "sell"}
+
+
+def test_signal_state_store_compacts_on_load(tmp_path: Path) -> None:
+    path = tmp_path / "signals.jsonl"
+    store = FileSignalStateStore(path)
+    for signal in ("buy", "hold", "sell", "hold", "buy"):
+        store.record("EURUSD", signal)
+    store.record("GBPUSD", "sell")
+
+    assert store.load() == {"EURUSD": "buy", "GBPUSD": "sell"}
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+    assert FileSignalStateStore(path).load() == {"EURUSD": "buy", "GBPUSD": "sell"}
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_signal_state_store_keeps_appends_made_during_compaction(tmp_path: Path) -> None:
+    pytest.importorskip("fcntl")
+    path = tmp_path / "signals.jsonl"
+    appender = threading.Thread(target=FileSignalStateStore(path).record, args=("GBPUSD", "sell"))
+
+    class SlowCompaction(FileSignalStateStore):
+        def _rewrite(self, state: dict[str, str]) -> None:
+            appender.start()
+            appender.join(0.1)  # another process appends while the file is being compacted
+            super()._rewrite(state)
+
+    store = SlowCompaction(path)
+    store.record("EURUSD", "buy")
+    store.record("EURUSD", "sell")
+    assert store.load() == {"EURUSD": "sell"}
+    appender.join()
+
+    assert FileSignalStateStore(path).load() == {"EURUSD": "sell", "GBPUSD": "sell"}
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+from email.utils import format_datetime
+
+import pytest
+
+from config.settings import RateLimitSettings
+from infrastructure.rate_limit import MARKET_DATA, ORDERS, RateLimiter, retry_after_seconds
+from utils.time import utc_now
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_requests_are_paced_to_the_configured_rate():
+    limiter = RateLimiter(RateLimitSettings(market_data_per_second=100, burst=1))
+    started = time.perf_counter()
+    for _ in range(6):
+        limiter.acquire(MARKET_DATA)
+    assert time.perf_counter() - started >= 0.045
+    assert limiter.acquire(ORDERS) == 0.0  # no limit for orders
+
+
+def test_throttling_halves_the_rate_and_recovers_over_time():
+    clock = FakeClock()
+    limiter = RateLimiter(
+        RateLimitSettings(requests_per_second=40, burst=2, min_rate_fraction=0.25, recovery_seconds=10), clock=clock
+    )
+    limiter.throttled(MARKET_DATA, retry_after=1.0)
+    assert limiter.rate(MARKET_DATA) == pytest.approx(20)
+    assert limiter.rate(ORDERS) == pytest.approx(20)  # the shared budget is throttled
+    for _ in range(3):
+        limiter.throttled(MARKET_DATA)
+    assert limiter.rate(MARKET_DATA) == pytest.approx(10)  # floor
+
+    clock.now = 1.0 + 2.5  # Retry-After, then a quarter of the recovery time
+    assert limiter.rate(MARKET_DATA) == pytest.approx(20)
+    clock.now += 60
+    assert limiter.rate(MARKET_DATA) == pytest.approx(40)
+    assert limiter.throttled_responses == 4
+
+
+def test_retry_after_pauses_requests():
+    limiter = RateLimiter(RateLimitSettings(requests_per_second=1000, burst=5))
+    limiter.throttled(MARKET_DATA, retry_after=0.1)
+    assert limiter.acquire(MARKET_DATA) >= 0.09
+
+
+def test_orders_go_ahead_of_waiting_market_data_requests():
+    limiter = RateLimiter(RateLimitSettings(requests_per_second=20, burst=1))
+    limiter.acquire(MARKET_DATA)
+    completed: list[str] = []
+
+    def request(endpoint_class: str) -> None:
+        limiter.acquire(endpoint_class)
+        completed.append(endpoint_class)
+
+    market = threading.Thread(target=request, args=(MARKET_DATA,))
+    market.start()
+    time.sleep(0.01)
+    order = threading.Thread(target=request, args=(ORDERS,))
+    order.start()
+    market.join(2)
+    order.join(2)
+    assert completed == [ORDERS, MARKET_DATA]
+
+
+def test_retry_after_parses_seconds_and_http_dates():
+    assert retry_after_seconds({"Retry-After": "2"}) == 2.0
+    later = format_datetime(utc_now() + timedelta(seconds=30), usegmt=True)
+    assert 25 < retry_after_seconds({"Retry-After": later}) <= 30
+    assert retry_after_seconds({"Retry-After": "soon"}) is None
+    assert retry_after_seconds(None) is None
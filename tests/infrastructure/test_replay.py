@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import struct
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from application.services import TradingBotService
+from config.settings import TradingBotSettings
+from domain.interfaces import Strategy
+from domain.models import Candle, Instrument, Order, SignalType, TradingSignal
+from infrastructure.replay import CandleFile, ReplayMarketDataProvider, write_candle_file
+from risk.basic import BasicRiskAssessment
+from utils.validation import BatchValidationError
+
+EURUSD = Instrument(symbol="EURUSD")
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _candles(count: int) -> list[Candle]:
+    return [
+        Candle(
+            instrument=EURUSD,
+            timestamp=BASE + timedelta(minutes=index),
+            open=1.0 + index,
+            high=1.5 + index,
+            low=0.5 + index,
+            close=1.0 + index,
+            volume=None if index % 2 else float(index),
+        )
+        for index in range(count)
+    ]
+
+
+def _record(directory: Path, count: int) -> list[Candle]:
+    candles = _candles(count)
+    write_candle_file(directory / "EURUSD.candles", candles)
+    return candles
+
+
+def test_candle_file_round_trips_and_searches(tmp_path: Path) -> None:
+    candles = _record(tmp_path, 100)
+    candle_file = CandleFile(tmp_path / "EURUSD.candles")
+    assert len(candle_file) == 100
+    assert candle_file.candles(0, 100, EURUSD) == candles
+    assert candle_file.index_at_or_after(BASE + timedelta(minutes=10)) == 10
+    assert candle_file.index_after(BASE + timedelta(minutes=10, seconds=30)) == 11
+    candle_file.close()
+
+
+def test_write_rejects_unordered_candles(tmp_path: Path) -> None:
+    candles = _candles(3)
+    with pytest.raises(ValueError):
+        write_candle_file(tmp_path / "bad.candles", [candles[1], candles[0]])
+
+
+def test_replay_validates_recorded_candles_when_opened(tmp_path: Path) -> None:
+    _record(tmp_path, 10)
+    path = tmp_path / "EURUSD.candles"
+    data = bytearray(path.read_bytes())
+    record = struct.Struct("<qddddd")
+    offset = 16 + 7 * record.size
+    timestamp, open_, high, low, close, volume = record.unpack_from(data, offset)
+    record.pack_into(data, offset, timestamp, open_, high, -1.0, close, volume)
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(BatchValidationError) as excinfo:
+        ReplayMarketDataProvider(tmp_path, validate=True).get_latest_candle(EURUSD)
+    assert [error.row for error in excinfo.value.errors] == [7]
+    unchecked = ReplayMarketDataProvider(tmp_path)
+    assert unchecked.get_latest_candle(EURUSD).close == 1.0
+    unchecked.close()
+
+
+def test_corrupt_file_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "EURUSD.candles"
+    path.write_bytes(b"not a candle file")
+    with pytest.raises(ValueError):
+        CandleFile(path)
+
+
+def test_latest_candle_advances_and_history_never_looks_ahead(tmp_path: Path) -> None:
+    candles = _record(tmp_path, 10)
+    provider = ReplayMarketDataProvider(tmp_path, start_at=BASE + timedelta(minutes=5))
+    history = provider.get_historical_candles(EURUSD, start=BASE, end=BASE + timedelta(days=1), limit=3)
+    assert history == candles[2:5]
+    assert provider.get_latest_candle(EURUSD) == candles[5]
+    assert provider.get_latest_candle(EURUSD) == candles[6]
+    assert provider.now() == candles[6].timestamp
+    assert list(provider.stream_candles(EURUSD)) == candles[7:]
+    for _ in range(5):
+        last = provider.get_latest_candle(EURUSD)
+    assert last == candles[-1]
+
+
+def test_warm_up_serves_the_first_rows_as_history(tmp_path: Path) -> None:
+    candles = _record(tmp_path, 10)
+    provider = ReplayMarketDataProvider(tmp_path, warm_up=4)
+    assert provider.now() == candles[3].timestamp
+    history = provider.get_historical_candles(EURUSD, start=BASE, end=provider.now(), limit=10)
+    assert history == candles[:4]
+    assert provider.get_latest_candle(EURUSD) == candles[4]
+    provider.close()
+
+
+def test_service_runs_against_replay(tmp_path: Path) -> None:
+    _record(tmp_path, 30)
+    provider = ReplayMarketDataProvider(tmp_path, start_at=BASE + timedelta(minutes=20))
+    seen: list[int] = []
+
+    class LengthStrategy(Strategy):
+        def generate_signal(self, candles):
+            seen.append(len(candles))
+            return TradingSignal(instrument=candles[-1].instrument, signal_type=SignalType.HOLD)
+
+    class RejectAll:
+        def assess(self, signal, candles):
+            return BasicRiskAssessment(approved=False, reason="hold", order=None)
+
+    class NoExecutor:
+        def execute(self, order: Order) -> str:  # pragma: no cover - never approved
+            raise AssertionError
+
+    service = TradingBotService(
+        settings=TradingBotSettings(instruments=["EURUSD"], history_limit=10, poll_interval_seconds=1),
+        market_data=provider,
+        strategy=LengthStrategy(),
+        risk_manager=RejectAll(),
+        order_executor=NoExecutor(),
+        clock=provider.now,
+    )
+    service.run_once()
+    assert seen == [10]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import gzip
+from datetime import datetime, timezone
+
+from config.settings import DataSourceSettings
+from domain.models import Instrument
+from infrastructure.market_data import ConfigurableMarketDataClient
+from infrastructure.tape import TapeMarketDataProvider, TapeRecorder, read_tape
+
+
+class DummyResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):  # noqa: D401 - compatibility shim
+        return None
+
+    def json(self):
+        return self._payload
+
+
+class DummySession:
+    def __init__(self, payloads):
+        self.payloads = payloads
+
+    def request(self, method, url, params=None, timeout=None, **kwargs):
+        return DummyResponse(self.payloads.pop(0))
+
+
+def _candle(minute, close):
+    return {
+        "timestamp": f"2024-01-01T00:{minute:02d}:00Z",
+        "open": close,
+        "high": close + 0.1,
+        "low": close - 0.1,
+        "close": close,
+    }
+
+
+def test_recorded_responses_replay_through_the_client(tmp_path):
+    instrument = Instrument(symbol="EURUSD")
+    times = iter([100.0, 101.0, 102.0])
+    session = DummySession([[_candle(0, 1.0)], _candle(1, 1.1), _candle(2, 1.2)])
+    with TapeRecorder(tmp_path, chunk_records=2, clock=lambda: next(times)) as recorder:
+        client = ConfigurableMarketDataClient(
+            DataSourceSettings(base_url="http://exchange/api/"), session=session, recorder=recorder
+        )
+        live = [
+            client.get_historical_candles(
+                instrument,
+                start=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                end=datetime(2024, 1, 2, tzinfo=timezone.utc),
+                limit=10,
+            )[0],
+            client.get_latest_candle(instrument),
+            client.get_latest_candle(instrument),
+        ]
+    assert recorder.recorded == 3
+    assert len(list(tmp_path.glob("*.jsonl.gz"))) == 2
+    entries = list(read_tape(tmp_path))
+    assert [entry.endpoint for entry in entries] == ["/candles", "/candles/latest", "/candles/latest"]
+    assert entries[0].params["limit"] == 10
+
+    sleeps = []
+    replay = TapeMarketDataProvider(tmp_path, speed=2.0, sleep=sleeps.append, monotonic=lambda: 0.0)
+    # Requests for an endpoint are answered in recorded order even if interleaved differently.
+    latest = replay.get_latest_candle(instrument)
+    later = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    history = replay.get_historical_candles(instrument, start=later, end=later, limit=1)
+    assert [history[0], latest, replay.get_latest_candle(instrument)] == live
+    assert sleeps == [0.5]
+
+
+def test_read_tape_tolerates_truncated_chunk(tmp_path):
+    with TapeRecorder(tmp_path) as recorder:
+        recorder.record("/candles/latest", {"symbol": "EURUSD"}, _candle(0, 1.0))
+        recorder.record("/candles/latest", {"symbol": "EURUSD"}, _candle(1, 1.1))
+    (chunk,) = tmp_path.glob("*.jsonl.gz")
+    data = chunk.read_bytes()
+    chunk.write_bytes(data[:-8])  # drop the gzip trailer, as after a crash
+    assert len(list(read_tape(tmp_path))) == 2
+    assert gzip.decompress(data).count(b"\n") == 2
+
+
+def test_recorder_drops_instead_of_blocking(tmp_path):
+    recorder = TapeRecorder(tmp_path, queue_size=1)
+    recorder.record("/candles/latest", None, {})
+    recorder.record("/candles/latest", None, {})
+    assert recorder.dropped == 1
+    recorder.start()
+    recorder.close()
+    assert recorder.recorded == 1
+
+
+def test_parallel_bootstrap_replays_every_symbol_from_one_tape(tmp_path):
+    from application.services import TradingBotService
+    from config.settings import BootstrapSettings, TradingBotSettings
+
+    symbols = [f"SYM{index:02d}" for index in range(16)]
+    session = DummySession([[_candle(minute, index + 1 + minute / 100) for minute in range(5)] for index in range(16)])
+    with TapeRecorder(tmp_path) as recorder:
+        client = ConfigurableMarketDataClient(
+            DataSourceSettings(base_url="http://exchange/api/"), session=session, recorder=recorder
+        )
+        for symbol in symbols:
+            client.get_historical_candles(
+                Instrument(symbol=symbol),
+                start=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                end=datetime(2024, 1, 2, tzinfo=timezone.utc),
+                limit=5,
+            )
+
+    for _ in range(5):
+        service = TradingBotService(
+            settings=TradingBotSettings(instruments=symbols, history_limit=5, bootstrap=BootstrapSettings(workers=8)),
+            market_data=TapeMarketDataProvider(tmp_path),
+            strategy=None,
+            risk_manager=None,
+            order_executor=None,
+        )
+        service._bootstrap_history()
+        for index, symbol in enumerate(symbols):
+            closes = [candle.close for candle in service._contexts[symbol].candles]
+            assert closes == [index + 1 + minute / 100 for minute in range(5)]
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from types import SimpleNamespace
 
+import pytest
+
 from config.settings import TradingBotSettings
 from contextlib import contextmanager
 
@@ -23,7 +25,7 @@ def test_main_runs_once(monkeypatch):
             raise AssertionError("Should not start")
 
     dummy_service = DummyService()
-    monkeypatch.setattr(cli, "build_service", lambda _settings: dummy_service)
+    monkeypatch.setattr(cli, "build_service", lambda _settings, **_kwargs: dummy_service)
 
     exit_code = cli.main(["--once"])
     assert exit_code == 0
@@ -48,7 +50,7 @@ def test_main_handles_interrupt(monkeypatch):
             self.stop_called = True
 
     dummy_service = DummyService()
-    monkeypatch.setattr(cli, "build_service", lambda _settings: dummy_service)
+    monkeypatch.setattr(cli, "build_service", lambda _settings, **_kwargs: dummy_service)
 
     @contextmanager
     def fake_graceful(handler):
@@ -60,3 +62,63 @@ def test_main_handles_interrupt(monkeypatch):
     exit_code = cli.main([])
     assert exit_code == 0
     assert dummy_service.stop_called
+
+
+def test_main_starts_supervisor_for_multiple_workers(monkeypatch):
+    settings = TradingBotSettings(instruments=["EURUSD", "GBPUSD"], poll_interval_seconds=1)
+    monkeypatch.setattr(cli, "ConfigLoader", lambda: SimpleNamespace(load=lambda path: settings))
+    started: list[int] = []
+
+    class DummySupervisor:
+        def start(self) -> None:
+            started.append(1)
+
+        def stop(self) -> None:  # pragma: no cover - not used
+            raise AssertionError
+
+    monkeypatch.setattr(cli, "build_supervisor", lambda _settings, workers: DummySupervisor())
+    monkeypatch.setattr(cli, "build_service", lambda _settings: pytest.fail("single service built"))
+
+    assert cli.main(["--workers", "2"]) == 0
+    assert started == [1]
+
+
+def test_import_data_subcommand_writes_dataset(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(cli.ConfigLoader, "load", lambda *_args, **_kwargs: pytest.fail("config must not load"))
+    source = tmp_path / "prices.csv"
+    source.write_text("timestamp,open,high,low,close\n2024-01-01T00:00:00Z,1,1.2,0.9,1.1\n", encoding="utf-8")
+    output = tmp_path / "dataset"
+
+    assert cli.main(["import-data", str(source), "--symbol", "EURUSD", "--output", str(output)]) == 0
+
+    assert (output / "EURUSD" / "manifest.json").exists()
+    assert "EURUSD: 1 candles" in capsys.readouterr().out
+
+
+def test_monte_carlo_subcommand_resamples_trade_file(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(cli.ConfigLoader, "load", lambda *_args, **_kwargs: pytest.fail("config must not load"))
+    trades = tmp_path / "trades.csv"
+    trades.write_text("pnl\n1.0\n-0.5\n2.0\n-1.0\n", encoding="utf-8")
+
+    assert cli.main(["monte-carlo", "--trades", str(trades), "--resamples", "200", "--seed", "3"]) == 0
+
+    output = capsys.readouterr().out
+    assert "200 bootstrap resamples of 4 trades" in output
+    assert "probability of loss" in output
+
+
+def test_monte_carlo_subcommand_backtests_dataset(tmp_path, monkeypatch, capsys):
+    from utils.datasets import DatasetWriter
+
+    settings = TradingBotSettings(instruments=["EURUSD"], poll_interval_seconds=1)
+    settings.strategy.short_window, settings.strategy.long_window = 2, 4
+    monkeypatch.setattr(cli, "ConfigLoader", lambda: SimpleNamespace(load=lambda path: settings))
+    closes = [1.0, 1.1, 1.2, 1.3, 1.2, 1.0, 0.9, 0.8, 0.9, 1.1, 1.3, 1.4, 1.2, 1.0, 0.8, 0.7] * 4
+    writer = DatasetWriter(tmp_path / "dataset", "EURUSD")
+    for index, close in enumerate(closes):
+        writer.append(1_704_067_200 + 60 * index, close, close + 0.05, close - 0.05, close)
+    writer.close()
+
+    assert cli.main(["monte-carlo", "--dataset", str(tmp_path / "dataset"), "--resamples", "100"]) == 0
+
+    assert "100 bootstrap resamples of" in capsys.readouterr().out
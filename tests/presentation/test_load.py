@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from benchmarks import load
+
+
+def test_load_run_completes_requested_cycles():
+    result = load.run_load(instruments=3, cycles=3, history_limit=25)
+    assert result.cycles == 3
+    assert result.errors == 0
+    assert len(result.cycle_seconds) == 3
+    assert result.requests >= 3 * 3 + 3
+
+
+def test_pipelined_load_run_fills_the_same_orders():
+    sequential = load.run_load(instruments=4, cycles=3, history_limit=25)
+    pipelined = load.run_load(instruments=4, cycles=3, history_limit=25, pipeline=True)
+    assert pipelined.cycles == 3
+    assert pipelined.errors == 0
+    assert pipelined.orders == sequential.orders
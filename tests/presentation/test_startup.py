@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from benchmarks import startup
+
+
+def test_cli_import_defers_heavy_dependencies():
+    _, loaded = startup.measure_import(runs=1)
+    assert loaded == []
+
+
+def test_build_service_imports_only_the_configured_adapters():
+    loaded = startup.modules_after_build("instruments: [EURUSD]\n")
+    assert sorted(loaded) == sorted(set(startup.HEAVY_MODULES) - {"presentation.supervisor"})
+
+
+def test_build_service_imports_paper_and_volatility_adapters_on_demand():
+    loaded = startup.modules_after_build(
+        "instruments: [EURUSD]\n"
+        "data_source: {paper_trading: true}\n"
+        "risk: {volatility_window: 14}\n"
+    )
+    assert "infrastructure.paper" in loaded
+    assert "risk.volatility" in loaded
+    assert "infrastructure.order_execution" not in loaded
+    assert not set(loaded) & {"infrastructure.replay", "infrastructure.tape", "presentation.supervisor"}
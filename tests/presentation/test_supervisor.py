@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+from pathlib import Path
+
+from application.services import ServiceMetrics
+from config.settings import TradingBotSettings
+from domain.models import Instrument, Order, OrderSide
+from presentation.supervisor import ShardSupervisor, shard_settings
+
+
+class FakeService:
+    crash_marker: Path | None = None
+
+    def __init__(self, settings, *, execution_callback, cycle_callback, scheduler_factory):
+        self._settings = settings
+        self._execution_callback = execution_callback
+        self._cycle_callback = cycle_callback
+        self._scheduler = scheduler_factory(0.01)
+
+    def start(self) -> None:
+        marker = FakeService.crash_marker
+        if marker is not None and not marker.exists():
+            marker.write_text("crashed")
+            raise SystemExit(1)
+        for symbol in self._settings.instruments:
+            order = Order(instrument=Instrument(symbol=symbol), side=OrderSide.BUY, quantity=1)
+            self._execution_callback(order, f"exec-{symbol}")
+        self._cycle_callback(ServiceMetrics(cycles=1, orders_executed=len(self._settings.instruments)))
+        self._scheduler.run(lambda: None)
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def _run_supervisor(supervisor: ShardSupervisor, predicate) -> None:
+    thread = threading.Thread(target=supervisor.start, daemon=True)
+    thread.start()
+    _wait_for(predicate)
+    supervisor.stop()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+
+
+def test_supervisor_aggregates_executions_and_metrics():
+    FakeService.crash_marker = None
+    symbols = [f"SYM{index}" for index in range(12)]
+    recorded: list[tuple[Order, str]] = []
+    supervisor = ShardSupervisor(
+        TradingBotSettings(instruments=symbols, poll_interval_seconds=1),
+        workers=3,
+        service_factory=FakeService,
+        execution_callback=lambda order, execution_id: recorded.append((order, execution_id)),
+        poll_interval_seconds=0.01,
+        context=multiprocessing.get_context("fork"),
+    )
+    _run_supervisor(
+        supervisor,
+        lambda: len(recorded) == len(symbols) and len(supervisor.shard_metrics()) == len(supervisor.workers),
+    )
+    assert sorted(execution_id for _order, execution_id in recorded) == sorted(f"exec-{s}" for s in symbols)
+    assert supervisor.aggregate_metrics().orders_executed == len(symbols)
+
+
+def test_supervisor_restarts_crashed_worker(tmp_path: Path):
+    FakeService.crash_marker = tmp_path / "crashed"
+    recorded: list[str] = []
+    supervisor = ShardSupervisor(
+        TradingBotSettings(instruments=["EURUSD"], poll_interval_seconds=1),
+        workers=1,
+        service_factory=FakeService,
+        execution_callback=lambda _order, execution_id: recorded.append(execution_id),
+        restart_delay_seconds=0.01,
+        poll_interval_seconds=0.01,
+        context=multiprocessing.get_context("fork"),
+    )
+    _run_supervisor(supervisor, lambda: bool(recorded))
+    assert recorded == ["exec-EURUSD"]
+    assert supervisor.workers[0].restarts == 1
+
+
+class ReportThenCrashService(FakeService):
+    def start(self) -> None:
+        self._cycle_callback(ServiceMetrics(cycles=1, orders_executed=2))
+        marker = FakeService.crash_marker
+        if marker is not None and not marker.exists():
+            marker.write_text("crashed")
+            raise SystemExit(1)
+        self._execution_callback(Order(instrument=Instrument(symbol="EURUSD"), side=OrderSide.BUY, quantity=1), "done")
+        self._scheduler.run(lambda: None)
+
+
+def test_supervisor_keeps_counters_of_restarted_workers(tmp_path: Path):
+    FakeService.crash_marker = tmp_path / "crashed"
+    recorded: list[str] = []
+    supervisor = ShardSupervisor(
+        TradingBotSettings(instruments=["EURUSD"], poll_interval_seconds=1),
+        workers=1,
+        service_factory=ReportThenCrashService,
+        execution_callback=lambda _order, execution_id: recorded.append(execution_id),
+        restart_delay_seconds=0.01,
+        poll_interval_seconds=0.01,
+        context=multiprocessing.get_context("fork"),
+    )
+    _run_supervisor(supervisor, lambda: bool(recorded) and supervisor.aggregate_metrics().cycles == 2)
+    assert supervisor.aggregate_metrics().cycles == 2
+    assert supervisor.shard_metrics()[supervisor.workers[0].shard].orders_executed == 4
+
+
+def test_shard_settings_give_each_shard_its_own_files():
+    settings = TradingBotSettings(instruments=["EURUSD", "GBPUSD"])
+    first = shard_settings(settings, 0, ["EURUSD"])
+    second = shard_settings(settings, 1, ["GBPUSD"])
+    assert first.instruments == ["EURUSD"]
+    assert first.strategy.signal_state_path == str(Path("data/signal_state.shard-0.jsonl"))
+    assert second.strategy.signal_state_path == str(Path("data/signal_state.shard-1.jsonl"))
+    assert first.memory.output_directory == str(Path("data/memory/shard-0"))
+    assert settings.strategy.signal_state_path == "data/signal_state.jsonl"
@@ -5,19 +5,19 @@ from datetime import datetime, timezone
 import pytest
 
 from config.settings import RiskSettings
-from domain.models import Candle, Instrument, SignalType, TradingSignal
+from domain.models import Candle, CandleColumns, Instrument, SignalType, TradingSignal
 from risk.basic import BasicRiskManager
 
 
-def _candles(price: float) -> list[Candle]:
+def _candles(price: float, spread: float = 0.1) -> list[Candle]:
     instrument = Instrument(symbol="EURUSD")
     return [
         Candle(
             instrument=instrument,
             timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
             open=price,
-            high=price + 0.1,
-            low=price - 0.1,
+            high=price + spread,
+            low=price - spread,
             close=price,
         )
     ]
@@ -42,3 +42,52 @@ def test_buy_signal_creates_order():
     assert order.quantity == pytest.approx(1.0)
     assert order.stop_loss == pytest.approx(1.2 * (1 - 0.05))
     assert order.take_profit == pytest.approx(1.2 * (1 + 0.1))
+
+
+def test_assess_batch_matches_per_candle_assessments():
+    settings = RiskSettings(max_position_size=2.0, stop_loss_pct=0.01, take_profit_pct=0.03)
+    manager = BasicRiskManager(settings)
+    candles = [candle for price in (1.1, 1.25, 0.95, 1.05) for candle in _candles(price)]
+    columns = CandleColumns.from_candles(candles[0].instrument, candles)
+    signal_types = [SignalType.BUY, SignalType.HOLD, SignalType.SELL, SignalType.BUY]
+
+    batch = manager.assess_batch(signal_types, columns)
+
+    for index, signal_type in enumerate(signal_types):
+        signal = TradingSignal(instrument=candles[0].instrument, signal_type=signal_type)
+        assessment = manager.assess(signal, candles[: index + 1])
+        assert batch.order(index) == assessment.order
+        assert (batch.sides[index] is not None) == assessment.approved
+    assert batch.reasons[1] == "Hold signal"
+
+
+def test_protection_levels_are_rounded_to_the_tick_size():
+    manager = BasicRiskManager(RiskSettings(stop_loss_pct=0.013, take_profit_pct=0.027))
+    instrument = Instrument(symbol="ES", tick_size=0.25)
+    signal = TradingSignal(instrument=instrument, signal_type=SignalType.BUY)
+    candle = Candle(
+        instrument=instrument,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        open=100.0,
+        high=100.0,
+        low=100.0,
+        close=100.0,
+    )
+    order = manager.assess(signal, [candle]).order
+    assert (order.stop_loss, order.take_profit) == (98.5, 102.75)
+
+
+@pytest.mark.parametrize(
+    ("price", "side", "expected"),
+    [
+        (0.1, SignalType.BUY, (0.09, 0.11)),
+        (0.1, SignalType.SELL, (0.11, 0.09)),
+        (0.004, SignalType.BUY, (None, 0.02)),
+        (0.004, SignalType.SELL, (0.02, None)),
+    ],
+)
+def test_protection_levels_stay_a_tick_from_low_prices(price, side, expected):
+    manager = BasicRiskManager(RiskSettings())
+    signal = TradingSignal(instrument=Instrument(symbol="EURUSD"), signal_type=side)
+    order = manager.assess(signal, _candles(price, spread=0.0)).order
+    assert (order.stop_loss, order.take_profit) == expected
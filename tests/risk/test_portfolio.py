@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from config.settings import RiskSettings
+from domain.models import Candle, Instrument, Order, OrderSide, SignalType, TradingSignal
+from risk.basic import BasicRiskManager
+from risk.portfolio import PortfolioLedger, PortfolioRiskManager, TradePnLRecorder
+
+EURUSD = Instrument(symbol="EURUSD")
+
+
+def _order(side: OrderSide, quantity: float, price: float, instrument: Instrument = EURUSD) -> Order:
+    return Order(instrument=instrument, side=side, quantity=quantity, price=price)
+
+
+def _candles(price: float, instrument: Instrument = EURUSD) -> list[Candle]:
+    return [
+        Candle(
+            instrument=instrument,
+            timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            open=price,
+            high=price + 0.1,
+            low=price - 0.1,
+            close=price,
+        )
+    ]
+
+
+def test_ledger_tracks_average_price_and_realized_pnl():
+    ledger = PortfolioLedger()
+    ledger.record_execution(_order(OrderSide.BUY, 1, 10.0), "1")
+    ledger.record_execution(_order(OrderSide.BUY, 1, 12.0), "2")
+    position = ledger.position("EURUSD")
+    assert position.quantity == pytest.approx(2)
+    assert position.average_price == pytest.approx(11.0)
+    assert ledger.gross_exposure == pytest.approx(22.0)
+
+    ledger.record_execution(_order(OrderSide.SELL, 3, 15.0), "3")
+    position = ledger.position("EURUSD")
+    assert position.quantity == pytest.approx(-1)
+    assert position.average_price == pytest.approx(15.0)
+    assert position.realized_pnl == pytest.approx(8.0)
+    assert ledger.realized_pnl == pytest.approx(8.0)
+    assert ledger.gross_exposure == pytest.approx(15.0)
+    assert ledger.net_exposure == pytest.approx(-15.0)
+
+
+def test_ledger_aggregates_exposure_across_instruments():
+    ledger = PortfolioLedger()
+    ledger.record_execution(_order(OrderSide.BUY, 2, 10.0), "1")
+    ledger.record_execution(_order(OrderSide.SELL, 1, 5.0, Instrument(symbol="GBPUSD")), "2")
+    assert ledger.gross_exposure == pytest.approx(25.0)
+    assert ledger.net_exposure == pytest.approx(15.0)
+    ledger.record_execution(_order(OrderSide.SELL, 2, 11.0), "3")
+    assert ledger.position("EURUSD").quantity == pytest.approx(0)
+    assert ledger.gross_exposure == pytest.approx(5.0)
+
+
+def test_risk_manager_stops_buying_at_position_limit():
+    ledger = PortfolioLedger()
+    settings = RiskSettings(max_position_size=2)
+    manager = PortfolioRiskManager(BasicRiskManager(settings), ledger, settings)
+    buy = TradingSignal(instrument=EURUSD, signal_type=SignalType.BUY, strength=0.75)
+
+    first = manager.assess(buy, _candles(1.2))
+    assert first.approved
+    ledger.record_execution(first.order, "1")
+
+    second = manager.assess(buy, _candles(1.2))
+    assert second.approved
+    assert second.order.quantity == pytest.approx(0.5)
+    assert second.order.stop_loss == first.order.stop_loss
+    ledger.record_execution(second.order, "2")
+
+    third = manager.assess(buy, _candles(1.2))
+    assert not third.approved
+
+    sell = manager.assess(TradingSignal(instrument=EURUSD, signal_type=SignalType.SELL), _candles(1.2))
+    assert sell.approved
+
+
+def test_risk_manager_limits_total_exposure():
+    ledger = PortfolioLedger()
+    settings = RiskSettings(max_position_size=10, max_total_exposure=15.0)
+    manager = PortfolioRiskManager(BasicRiskManager(settings), ledger, settings)
+    ledger.record_execution(_order(OrderSide.BUY, 1, 10.0, Instrument(symbol="GBPUSD")), "1")
+    assessment = manager.assess(TradingSignal(instrument=EURUSD, signal_type=SignalType.BUY), _candles(2.0))
+    assert assessment.approved
+    assert assessment.order.quantity == pytest.approx(2.5)
+
+
+def test_hold_signal_passes_through_inner_rejection():
+    settings = RiskSettings()
+    manager = PortfolioRiskManager(BasicRiskManager(settings), PortfolioLedger(), settings)
+    assessment = manager.assess(TradingSignal(instrument=EURUSD, signal_type=SignalType.HOLD), _candles(1.0))
+    assert not assessment.approved
+    assert assessment.reason == "Hold signal"
+
+
+def test_trade_recorder_keeps_realized_pnl_of_closing_fills():
+    recorder = TradePnLRecorder()
+
+    recorder.submit(_order(OrderSide.BUY, 2, 1.0))
+    recorder.submit(_order(OrderSide.SELL, 1, 1.5))
+    recorder.submit(_order(OrderSide.SELL, 1, 0.75))
+
+    assert recorder.pnls == pytest.approx([0.5, -0.25])
+    assert recorder.ledger.position("EURUSD").quantity == 0.0
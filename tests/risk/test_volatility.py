@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from config.settings import RiskSettings
+from domain.models import Candle, Instrument, SignalType, TradingSignal
+from risk.volatility import VolatilityRiskManager
+from utils.indicators import AverageTrueRange
+
+EURUSD = Instrument(symbol="EURUSD")
+
+
+def _candles(count: int, spread: float, price: float = 10.0) -> list[Candle]:
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        Candle(
+            instrument=EURUSD,
+            timestamp=base + timedelta(minutes=index),
+            open=price,
+            high=price + spread,
+            low=price - spread,
+            close=price,
+        )
+        for index in range(count)
+    ]
+
+
+def _buy() -> TradingSignal:
+    return TradingSignal(instrument=EURUSD, signal_type=SignalType.BUY)
+
+
+def test_stops_scale_with_average_true_range():
+    settings = RiskSettings(volatility_window=3, stop_loss_atr_multiple=2, take_profit_atr_multiple=3)
+    calm = VolatilityRiskManager(settings).assess(_buy(), _candles(5, spread=0.1)).order
+    wild = VolatilityRiskManager(settings).assess(_buy(), _candles(5, spread=1.0)).order
+    assert calm.stop_loss == pytest.approx(10.0 - 2 * 0.2)
+    assert calm.take_profit == pytest.approx(10.0 + 3 * 0.2)
+    assert wild.stop_loss == pytest.approx(10.0 - 2 * 2.0)
+
+
+def test_risk_per_trade_caps_quantity():
+    settings = RiskSettings(max_position_size=100, volatility_window=3, stop_loss_atr_multiple=2, risk_per_trade=4.0)
+    order = VolatilityRiskManager(settings).assess(_buy(), _candles(5, spread=0.5)).order
+    assert order.quantity == pytest.approx(4.0 / (2 * 1.0))
+
+
+@pytest.mark.parametrize("signal_type", [SignalType.BUY, SignalType.SELL])
+def test_levels_stay_positive_when_the_atr_distance_exceeds_the_price(signal_type):
+    settings = RiskSettings(
+        max_position_size=100,
+        volatility_window=3,
+        stop_loss_atr_multiple=20,
+        take_profit_atr_multiple=20,
+        stop_loss_pct=0.05,
+        take_profit_pct=0.1,
+        risk_per_trade=1.0,
+    )
+    signal = TradingSignal(instrument=EURUSD, signal_type=signal_type)
+    order = VolatilityRiskManager(settings).assess(signal, _candles(5, spread=0.5)).order
+    assert order.stop_loss > 0 and order.take_profit > 0
+    if signal_type == SignalType.BUY:
+        assert order.stop_loss == pytest.approx(10.0 * 0.95)
+        assert order.quantity == pytest.approx(1.0 / 0.5)
+    else:
+        assert order.take_profit == pytest.approx(10.0 * 0.9)
+        assert order.stop_loss == pytest.approx(10.0 + 20 * 1.0)
+
+
+def test_low_price_levels_round_away_from_entry_and_cap_on_the_rounded_stop():
+    settings = RiskSettings(
+        max_position_size=100,
+        volatility_window=3,
+        stop_loss_atr_multiple=2,
+        take_profit_atr_multiple=3,
+        risk_per_trade=0.001,
+    )
+    order = VolatilityRiskManager(settings).assess(_buy(), _candles(5, spread=0.0015, price=0.1)).order
+    assert (order.stop_loss, order.take_profit) == (0.09, 0.11)
+    assert order.quantity == pytest.approx(0.001 / (0.1 - 0.09))
+
+
+def test_sub_tick_price_drops_the_stop_and_caps_on_the_whole_price():
+    settings = RiskSettings(max_position_size=100, volatility_window=3, risk_per_trade=0.001)
+    order = VolatilityRiskManager(settings).assess(_buy(), _candles(5, spread=0.0001, price=0.004)).order
+    assert order.stop_loss is None
+    assert order.take_profit == 0.02
+    assert order.quantity == pytest.approx(0.001 / 0.004)
+
+
+def test_falls_back_to_fixed_levels_during_warm_up():
+    settings = RiskSettings(volatility_window=10, stop_loss_pct=0.05)
+    order = VolatilityRiskManager(settings).assess(_buy(), _candles(3, spread=0.5)).order
+    assert order.stop_loss == pytest.approx(10.0 * 0.95)
+
+
+def test_atr_is_updated_incrementally_across_assessments():
+    settings = RiskSettings(volatility_window=3)
+    manager = VolatilityRiskManager(settings)
+    candles = _candles(4, spread=0.2) + _candles(8, spread=0.6)[4:]
+    for end in range(1, len(candles) + 1):
+        manager.assess(TradingSignal(instrument=EURUSD, signal_type=SignalType.HOLD), candles[max(0, end - 3) : end])
+    expected = AverageTrueRange(3)
+    for candle in candles:
+        expected.update(candle)
+    assert manager.average_true_range("EURUSD") == pytest.approx(expected.value)
+
+
+def test_requires_volatility_window():
+    with pytest.raises(ValueError):
+        VolatilityRiskManager(RiskSettings())
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from domain.models import Candle, Instrument, SignalType, TradingSignal
+from strategies.edge import EdgeTriggeredStrategy
+from strategies.sma import SMACrossoverStrategy
+
+
+class ScriptedStrategy:
+    def __init__(self, signal_types: list[SignalType]) -> None:
+        self._signal_types = list(signal_types)
+
+    def generate_signal(self, candles):
+        return TradingSignal(instrument=candles[-1].instrument, signal_type=self._signal_types.pop(0))
+
+    def generate_signals(self, candles):
+        return (self.generate_signal(candles),)
+
+
+class MemoryStore:
+    def __init__(self) -> None:
+        self.records: list[tuple[str, str]] = []
+
+    def load(self):
+        return dict(self.records)
+
+    def record(self, key: str, signal_type: str) -> None:
+        self.records.append((key, signal_type))
+
+
+def _candles(symbol: str = "EURUSD") -> list[Candle]:
+    return [
+        Candle(
+            instrument=Instrument(symbol=symbol),
+            timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            open=1.0,
+            high=1.1,
+            low=0.9,
+            close=1.0,
+        )
+    ]
+
+
+def _executed(strategy: EdgeTriggeredStrategy, candles: list[Candle]) -> TradingSignal:
+    signal = strategy.generate_signal(candles)
+    strategy.signal_executed(signal)
+    return signal
+
+
+def test_only_state_transitions_are_emitted():
+    inner = ScriptedStrategy([SignalType.BUY, SignalType.BUY, SignalType.BUY, SignalType.SELL, SignalType.SELL])
+    strategy = EdgeTriggeredStrategy(inner)
+    emitted = [_executed(strategy, _candles()).signal_type for _ in range(5)]
+    assert emitted == [SignalType.BUY, SignalType.HOLD, SignalType.HOLD, SignalType.SELL, SignalType.HOLD]
+
+
+def test_state_is_tracked_per_instrument():
+    strategy = EdgeTriggeredStrategy(ScriptedStrategy([SignalType.BUY, SignalType.BUY]))
+    assert strategy.generate_signal(_candles("EURUSD")).signal_type == SignalType.BUY
+    assert strategy.generate_signal(_candles("GBPUSD")).signal_type == SignalType.BUY
+
+
+def test_state_survives_restart():
+    store = MemoryStore()
+    _executed(EdgeTriggeredStrategy(ScriptedStrategy([SignalType.BUY]), store=store), _candles())
+    restarted = EdgeTriggeredStrategy(ScriptedStrategy([SignalType.BUY, SignalType.SELL]), store=store)
+    assert _executed(restarted, _candles()).signal_type == SignalType.HOLD
+    assert _executed(restarted, _candles()).signal_type == SignalType.SELL
+    assert store.records == [("EURUSD", "buy"), ("EURUSD", "sell")]
+
+
+def test_signal_fires_again_until_its_order_executes():
+    store = MemoryStore()
+    strategy = EdgeTriggeredStrategy(ScriptedStrategy([SignalType.BUY] * 4), store=store)
+
+    assert strategy.generate_signal(_candles()).signal_type == SignalType.BUY  # rejected by risk
+    assert store.records == []
+    restarted = EdgeTriggeredStrategy(ScriptedStrategy([SignalType.BUY] * 3), store=store)
+    assert restarted.generate_signal(_candles()).signal_type == SignalType.BUY  # order failed
+    assert _executed(restarted, _candles()).signal_type == SignalType.BUY
+    assert restarted.generate_signal(_candles()).signal_type == SignalType.HOLD
+    assert store.records == [("EURUSD", "buy")]
+
+
+def test_warm_up_after_restart_keeps_the_persisted_state():
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rising = [
+        Candle(
+            instrument=Instrument(symbol="EURUSD"),
+            timestamp=start + timedelta(minutes=index),
+            open=1.0 + index / 10,
+            high=1.0 + index / 10,
+            low=1.0 + index / 10,
+            close=1.0 + index / 10,
+        )
+        for index in range(6)
+    ]
+    store = MemoryStore()
+    first = EdgeTriggeredStrategy(SMACrossoverStrategy(short_window=2, long_window=4), store=store)
+    assert _executed(first, rising[:5]).signal_type == SignalType.BUY
+
+    restarted = EdgeTriggeredStrategy(SMACrossoverStrategy(short_window=2, long_window=4), store=store)
+    emitted = [_executed(restarted, rising[:end]).signal_type for end in range(1, 7)]
+    assert emitted == [SignalType.HOLD] * 6
+    assert store.records == [("EURUSD", "buy")]
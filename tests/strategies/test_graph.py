@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from domain.models import Candle, Instrument, SignalType
+from strategies.graph import IndicatorGraph, StrategyGroup
+from strategies.sma import SMACrossoverStrategy
+from utils.indicators import IndicatorSpec
+
+
+def _build_candles(prices: list[float]) -> list[Candle]:
+    instrument = Instrument(symbol="EURUSD")
+    base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        Candle(
+            instrument=instrument,
+            timestamp=base_time + timedelta(minutes=index),
+            open=price,
+            high=price + 0.1,
+            low=price - 0.1,
+            close=price,
+        )
+        for index, price in enumerate(prices)
+    ]
+
+
+def test_group_shares_identical_indicators():
+    group = StrategyGroup(
+        [
+            SMACrossoverStrategy(short_window=2, long_window=4),
+            SMACrossoverStrategy(short_window=2, long_window=6),
+            SMACrossoverStrategy(short_window=4, long_window=6),
+        ]
+    )
+    assert group.indicator_count == 3
+
+
+def test_group_signals_match_standalone_strategies():
+    members = [SMACrossoverStrategy(short_window=2, long_window=4), SMACrossoverStrategy(short_window=3, long_window=5)]
+    group = StrategyGroup(members)
+    candles = _build_candles([5, 4, 3, 2, 1, 2, 3, 4, 5, 6, 5, 4])
+    for end in range(1, len(candles) + 1):
+        window = candles[:end]
+        expected = [member.generate_signal(window).signal_type for member in members]
+        assert [signal.signal_type for signal in group.generate_signals(window)] == expected
+
+
+def test_graph_consumes_each_candle_once():
+    graph = IndicatorGraph([IndicatorSpec("sma", 2), IndicatorSpec("sma", 2)])
+    candles = _build_candles([1, 2, 3])
+    graph.update(candles)
+    values = graph.update(candles)
+    assert len(graph) == 1
+    assert values[IndicatorSpec("sma", 2)] == 2.5
+
+
+def test_group_generate_signal_prefers_actionable_signal():
+    group = StrategyGroup([SMACrossoverStrategy(short_window=2, long_window=10), SMACrossoverStrategy(short_window=2, long_window=4)])
+    signal = group.generate_signal(_build_candles([1, 2, 3, 4, 5]))
+    assert signal.signal_type == SignalType.BUY
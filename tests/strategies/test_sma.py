@@ -4,7 +4,7 @@ from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from domain.models import Candle, Instrument, SignalType
+from domain.models import Candle, CandleColumns, Instrument, SignalType
 from strategies.sma import SMACrossoverStrategy
 
 
@@ -48,3 +48,26 @@ def test_generate_signal_sell_when_short_below_long():
 def test_invalid_window_configuration():
     with pytest.raises(ValueError):
         SMACrossoverStrategy(short_window=5, long_window=5)
+
+
+
+def _batch_and_per_candle_signals(prices: list[float]) -> tuple[list[SignalType], list[SignalType]]:
+    strategy = SMACrossoverStrategy(short_window=3, long_window=7)
+    candles = _build_candles(prices)
+    columns = CandleColumns.from_candles(candles[0].instrument, candles)
+    expected = [strategy.generate_signal(candles[: index + 1]).signal_type for index in range(len(candles))]
+    return list(strategy.generate_signal_batch(columns)), expected
+
+
+def test_generate_signal_batch_matches_per_candle_signals():
+    batch, expected = _batch_and_per_candle_signals([1.0 + 0.01 * ((i * 37) % 23) - 0.002 * i for i in range(120)])
+
+    assert batch == expected
+    assert {SignalType.BUY, SignalType.SELL} <= set(expected)
+
+
+def test_generate_signal_batch_reproduces_ties_on_flat_prices():
+    batch, expected = _batch_and_per_candle_signals([1.1] * 30 + [1.2, 1.1] * 20)
+
+    assert batch == expected
+    assert SignalType.HOLD in expected[7:]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from domain.interfaces import Strategy
+from domain.models import Candle, Instrument, SignalType, TradingSignal
+from strategies.timeframe import TimeframeStrategy
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+INSTRUMENT = Instrument(symbol="EURUSD")
+
+
+class RecordingStrategy(Strategy):
+    def __init__(self) -> None:
+        self.windows = []
+
+    def generate_signal(self, candles):
+        self.windows.append(candles)
+        return TradingSignal(instrument=candles[-1].instrument, signal_type=SignalType.BUY)
+
+
+def _history(minutes: int) -> list[Candle]:
+    return [
+        Candle(
+            instrument=INSTRUMENT,
+            timestamp=START + timedelta(minutes=minute),
+            open=1.0,
+            high=1.0 + minute / 100,
+            low=1.0,
+            close=1.0,
+        )
+        for minute in range(minutes)
+    ]
+
+
+def test_inner_strategy_runs_once_per_completed_bar():
+    inner = RecordingStrategy()
+    strategy = TimeframeStrategy(inner, "5m")
+    history = _history(16)
+    signals = [strategy.generate_signal(history[: index + 1]) for index in range(len(history))]
+
+    assert [signal.signal_type for signal in signals].count(SignalType.BUY) == 3
+    assert [len(window) for window in inner.windows] == [1, 2, 3]
+    assert inner.windows[-1][-1].timestamp == START + timedelta(minutes=10)
+    assert inner.windows[-1][-1].high == history[14].high
+
+
+def test_partial_mode_evaluates_every_base_candle():
+    inner = RecordingStrategy()
+    strategy = TimeframeStrategy(inner, "5m", include_partial=True)
+    history = _history(7)
+    for index in range(len(history)):
+        strategy.generate_signal(history[: index + 1])
+    assert len(inner.windows) == 7
+    assert [len(window) for window in inner.windows[-2:]] == [2, 2]
+
+
+def test_empty_candles_produce_no_signals():
+    strategy = TimeframeStrategy(RecordingStrategy(), "5m")
+    assert strategy.generate_signals([]) == ()
+    with pytest.raises(ValueError):
+        strategy.generate_signal([])
+
@@ -1,13 +1,28 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-from domain.models import Candle, Instrument, Order, OrderSide, SignalType, TradingSignal
-from risk.basic import BasicRiskAssessment
-from utils.backtesting import BacktestResult, run_backtest
+import pytest
 
+from config.settings import RiskSettings
+from domain.interfaces import Strategy
+from domain.models import Candle, CandleColumns, Instrument, Order, OrderSide, SignalType, TradingSignal
+from risk.basic import BasicRiskAssessment, BasicRiskManager
+from risk.portfolio import PortfolioRiskManager, TradePnLRecorder
+from risk.volatility import VolatilityRiskManager
+from strategies.sma import SMACrossoverStrategy
+from utils.backtesting import (
+    BacktestResult,
+    merge_candle_streams,
+    run_backtest,
+    run_dataset_backtest,
+    run_dataset_multi_backtest,
+    run_multi_backtest,
+)
+from utils.datasets import CandleDataset, write_columns
 
-class DummyStrategy:
+
+class DummyStrategy(Strategy):
     def generate_signal(self, candles):  # noqa: D401 - part of protocol
         price = candles[-1].close
         if price > 1.0:
@@ -58,3 +73,163 @@ def test_run_backtest_collects_trades():
     assert result.trades == 2
     assert result.rejected == 1
     assert len(collector.orders) == 2
+
+
+def test_run_dataset_backtest_reads_requested_range(tmp_path):
+    candles = _candles()
+    write_columns(tmp_path, CandleColumns.from_candles(candles[0].instrument, candles))
+    collector = Collector()
+    result = run_dataset_backtest(
+        CandleDataset(tmp_path),
+        "EURUSD",
+        DummyStrategy(),
+        DummyRiskManager(),
+        collector,
+        start=candles[1].timestamp,
+    )
+    assert result == BacktestResult(trades=2, signals=2, rejected=0)
+
+
+def test_batch_backtest_matches_per_candle_backtest(monkeypatch):
+    instrument = Instrument(symbol="EURUSD")
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    prices = [1.0 + 0.01 * ((index * 37) % 23) for index in range(200)]
+    candles = [
+        Candle(
+            instrument=instrument,
+            timestamp=start + timedelta(minutes=index),
+            open=price,
+            high=price + 0.1,
+            low=price - 0.1,
+            close=price,
+        )
+        for index, price in enumerate(prices)
+    ]
+    strategy = SMACrossoverStrategy(short_window=3, long_window=8)
+    risk_manager = BasicRiskManager(RiskSettings(max_position_size=1.5))
+    per_candle = Collector()
+    expected = run_backtest(candles, strategy, risk_manager, per_candle)
+
+    monkeypatch.setattr(SMACrossoverStrategy, "generate_signal", lambda *_: pytest.fail("batch path not used"))
+    batched = Collector()
+    result = run_backtest(CandleColumns.from_candles(instrument, candles), strategy, risk_manager, batched)
+
+    assert result == expected
+    assert batched.orders == per_candle.orders
+    assert expected.trades > 0
+
+
+
+class OrderRecorder(TradePnLRecorder):
+    def __init__(self) -> None:
+        super().__init__()
+        self.orders: list[Order] = []
+
+    def submit(self, order: Order) -> None:
+        self.orders.append(order)
+        super().submit(order)
+
+
+def _risk_managers():
+    settings = RiskSettings(max_position_size=1.5, volatility_window=5, max_total_exposure=10.0)
+    yield "basic", lambda ledger: BasicRiskManager(settings)
+    yield "volatility", lambda ledger: VolatilityRiskManager(settings)
+    yield "portfolio", lambda ledger: PortfolioRiskManager(BasicRiskManager(settings), ledger, settings)
+
+
+@pytest.mark.parametrize(
+    "build_risk_manager", [build for _, build in _risk_managers()], ids=[name for name, _ in _risk_managers()]
+)
+def test_columns_and_candles_give_the_same_orders_for_every_risk_manager(build_risk_manager):
+    instrument = Instrument(symbol="EURUSD")
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    opens = [100 + (index * 7) % 11 for index in range(120)]
+    closes = [101 + (index * 13) % 9 for index in range(120)]
+    candles = [
+        Candle(
+            instrument=instrument,
+            timestamp=start + timedelta(minutes=index),
+            open=open_,
+            high=max(open_, close) + 1 + index % 3,
+            low=min(open_, close) - 1 - index % 4,
+            close=close,
+        )
+        for index, (open_, close) in enumerate(zip(opens, closes))
+    ]
+    strategy = SMACrossoverStrategy(short_window=3, long_window=8)
+    results = []
+    for source in (candles, CandleColumns.from_candles(instrument, candles)):
+        recorder = OrderRecorder()
+        result = run_backtest(source, strategy, build_risk_manager(recorder.ledger), recorder)
+        results.append((result, recorder.orders, recorder.pnls))
+    assert results[0] == results[1]
+    assert results[0][0].trades > 0
+
+
+def _stream(symbol: str, minutes: list[int], price: float = 1.1) -> list[Candle]:
+    instrument = Instrument(symbol=symbol)
+    return [
+        Candle(
+            instrument=instrument,
+            timestamp=datetime(2024, 1, 1, 0, minute, tzinfo=timezone.utc),
+            open=price,
+            high=price + 0.1,
+            low=price - 0.1,
+            close=price,
+        )
+        for minute in minutes
+    ]
+
+
+def test_merge_candle_streams_orders_events_by_time():
+    merged = merge_candle_streams({"A": _stream("A", [0, 2, 4]), "B": _stream("B", [1, 2, 3]), "C": []})
+    assert [(symbol, candle.timestamp.minute) for symbol, candle in merged] == [
+        ("A", 0),
+        ("B", 1),
+        ("A", 2),
+        ("B", 2),
+        ("B", 3),
+        ("A", 4),
+    ]
+
+
+def test_multi_backtest_keeps_per_symbol_windows_and_totals():
+    class WindowRecorder(DummyStrategy):
+        def __init__(self) -> None:
+            self.windows: list[tuple[str, int]] = []
+
+        def generate_signal(self, candles):
+            assert len({candle.instrument.symbol for candle in candles}) == 1
+            self.windows.append((candles[-1].instrument.symbol, len(candles)))
+            return super().generate_signal(candles)
+
+    strategy = WindowRecorder()
+    collector = Collector()
+    result = run_multi_backtest(
+        {"EURUSD": _stream("EURUSD", [0, 1, 2]), "GBPUSD": _stream("GBPUSD", [1, 3], price=0.9)},
+        strategy,
+        DummyRiskManager(),
+        collector,
+        window=2,
+    )
+    assert strategy.windows == [("EURUSD", 1), ("EURUSD", 2), ("GBPUSD", 1), ("EURUSD", 2), ("GBPUSD", 2)]
+    assert result.per_symbol["EURUSD"] == BacktestResult(trades=3, signals=3, rejected=0)
+    assert result.per_symbol["GBPUSD"] == BacktestResult(trades=0, signals=2, rejected=2)
+    assert result.aggregate == BacktestResult(trades=3, signals=5, rejected=2)
+    assert result.candles == 5
+    assert result.last_timestamp.minute == 3
+    assert [order.instrument.symbol for order in collector.orders] == ["EURUSD"] * 3
+
+
+def test_dataset_multi_backtest_streams_every_symbol(tmp_path):
+    for symbol, price in (("EURUSD", 1.1), ("GBPUSD", 0.9)):
+        candles = _stream(symbol, list(range(30)), price=price)
+        write_columns(tmp_path, CandleColumns.from_candles(candles[0].instrument, candles), chunk_rows=7)
+
+    dataset = CandleDataset(tmp_path)
+    assert list(dataset.iter_candles("EURUSD")) == list(dataset.read("EURUSD"))
+    start = datetime(2024, 1, 1, 0, 10, tzinfo=timezone.utc)
+    result = run_dataset_multi_backtest(dataset, DummyStrategy(), DummyRiskManager(), Collector(), start=start)
+    assert result.per_symbol["EURUSD"].trades == 20
+    assert result.per_symbol["GBPUSD"].rejected == 20
+    assert result.first_timestamp.minute == 10
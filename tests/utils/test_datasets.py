@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from domain.models import Candle, CandleColumns, Instrument
+from utils.datasets import CandleDataset, DatasetWriter, import_ohlcv, write_columns
+from utils.validation import BatchValidationError
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _candles(count: int) -> list[Candle]:
+    instrument = Instrument(symbol="EURUSD")
+    return [
+        Candle(
+            instrument=instrument,
+            timestamp=START + timedelta(minutes=index),
+            open=1.0 + index / 100,
+            high=1.2 + index / 100,
+            low=0.9 + index / 100,
+            close=1.1 + index / 100,
+            volume=None if index % 3 else float(index),
+        )
+        for index in range(count)
+    ]
+
+
+def test_round_trip_preserves_candles(tmp_path):
+    candles = _candles(25)
+    written = write_columns(tmp_path, CandleColumns.from_candles(candles[0].instrument, candles), chunk_rows=10)
+    dataset = CandleDataset(tmp_path)
+    assert written == 25
+    assert dataset.symbols() == ["EURUSD"]
+    assert [chunk.rows for chunk in dataset.chunks("EURUSD")] == [10, 10, 5]
+    assert list(dataset.read("EURUSD")) == candles
+
+
+def test_range_read_only_opens_overlapping_chunks(tmp_path):
+    candles = _candles(30)
+    write_columns(tmp_path, CandleColumns.from_candles(candles[0].instrument, candles), chunk_rows=10)
+    (tmp_path / "EURUSD" / "chunk-000000.bin").write_bytes(b"corrupt")  # must not be touched
+
+    columns = CandleDataset(tmp_path).read(
+        "EURUSD", start=START + timedelta(minutes=12), end=START + timedelta(minutes=21, seconds=30)
+    )
+    assert list(columns) == candles[12:22]
+    assert list(columns.close) == [candle.close for candle in candles[12:22]]
+
+
+def test_writer_rejects_out_of_order_rows(tmp_path):
+    writer = DatasetWriter(tmp_path, "EURUSD")
+    writer.append(2, 1.0, 1.0, 1.0, 1.0)
+    writer.append(1, 1.0, 1.0, 1.0, 1.0)
+    with pytest.raises(ValueError, match="row 1"):
+        writer.close()
+
+
+
+def test_failed_rewrite_keeps_existing_data(tmp_path):
+    candles = _candles(15)
+    write_columns(tmp_path, CandleColumns.from_candles(candles[0].instrument, candles), chunk_rows=10)
+    writer = DatasetWriter(tmp_path, "EURUSD", chunk_rows=2)
+    writer.append(1, 1.0, 1.0, 1.0, 1.0)
+    writer.append(2, 1.0, 1.0, 1.0, 1.0)
+    with pytest.raises(BatchValidationError):
+        writer.append(3, 1.0, 1.0, 1.0, 1.0)
+        writer.append(2, 1.0, 1.0, 1.0, 1.0)
+
+    assert list(CandleDataset(tmp_path).read("EURUSD")) == candles
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["EURUSD"]
+
+
+def test_writer_reports_invalid_rows_across_chunks(tmp_path):
+    writer = DatasetWriter(tmp_path, "EURUSD", chunk_rows=3)
+    for timestamp in range(3):
+        writer.append(timestamp, 1.0, 1.0, 1.0, 1.0)
+    writer.append(2, 1.0, 1.0, 1.0, 1.0)  # not after the previous chunk
+    writer.append(4, 1.0, 0.5, 0.9, 1.0)
+    with pytest.raises(BatchValidationError) as excinfo:
+        writer.close()
+    assert [(error.row, error.message) for error in excinfo.value.errors] == [
+        (3, "timestamps must be strictly increasing"),
+        (4, "high/low must bound open/close prices"),
+    ]
+
+
+def test_import_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "prices.csv"
+    csv_path.write_text(
+        "timestamp,symbol,open,high,low,close,volume\n"
+        "2024-01-01T00:00:00Z,EURUSD,1.0,1.2,0.9,1.1,10\n"
+        "2024-01-01T00:01:00Z,GBPUSD,2.0,2.2,1.9,2.1,\n"
+        "2024-01-01T00:02:00Z,EURUSD,1.1,1.3,1.0,1.2,11\n",
+        encoding="utf-8",
+    )
+    jsonl_path = tmp_path / "prices.jsonl"
+    jsonl_path.write_text(
+        "\n".join(
+            json.dumps({"timestamp": 1704067200 + 60 * index, "open": 3, "high": 3, "low": 3, "close": 3})
+            for index in range(3)
+        ),
+        encoding="utf-8",
+    )
+    output = tmp_path / "dataset"
+
+    assert import_ohlcv(csv_path, output) == {"EURUSD": 2, "GBPUSD": 1}
+    assert import_ohlcv(jsonl_path, output, symbol="XAUUSD") == {"XAUUSD": 3}
+
+    dataset = CandleDataset(output)
+    assert dataset.symbols() == ["EURUSD", "GBPUSD", "XAUUSD"]
+    eurusd = list(dataset.read("EURUSD"))
+    assert [candle.close for candle in eurusd] == [1.1, 1.2]
+    assert eurusd[0].volume == 10
+    assert list(dataset.read("GBPUSD"))[0].volume is None
+    assert list(dataset.read("XAUUSD"))[0].timestamp == START
+
+
+def test_import_reports_bad_rows(tmp_path):
+    source = tmp_path / "bad.csv"
+    source.write_text("timestamp,open,high,low,close\n2024-01-01T00:00:00Z,1,0.5,0.9,1\n", encoding="utf-8")
+    with pytest.raises(ValueError, match=r"bad.csv \(EURUSD\) row 1: high/low"):
+        import_ohlcv(source, tmp_path / "dataset", symbol="EURUSD")
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import math
+import random
+from statistics import mean, pstdev
+
+import pytest
+
+from domain.models import Candle, Instrument
+from utils.indicators import (
+    INDICATORS,
+    AverageTrueRange,
+    BollingerBandsIndicator,
+    ExponentialMovingAverage,
+    IndicatorSpec,
+    RelativeStrengthIndex,
+    SimpleMovingAverage,
+    candles_since,
+    compute_batch,
+    create_indicator,
+)
+
+
+def _candles(closes: list[float]) -> list[Candle]:
+    instrument = Instrument(symbol="EURUSD")
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        Candle(
+            instrument=instrument,
+            timestamp=base + timedelta(minutes=index),
+            open=close,
+            high=close + 0.5,
+            low=close - 0.5,
+            close=close,
+        )
+        for index, close in enumerate(closes)
+    ]
+
+
+def test_simple_moving_average_matches_window_mean():
+    closes = [float(value) for value in range(1, 40)]
+    sma = SimpleMovingAverage(5)
+    for index, candle in enumerate(_candles(closes)):
+        value = sma.update(candle)
+        if index < 4:
+            assert value is None
+        else:
+            assert value == pytest.approx(mean(closes[index - 4 : index + 1]))
+
+
+def test_create_indicator_uses_spec():
+    indicator = create_indicator(IndicatorSpec("sma", 3))
+    assert isinstance(indicator, SimpleMovingAverage)
+    with pytest.raises(ValueError):
+        create_indicator(IndicatorSpec("unknown", 3))
+
+
+def test_candles_since_returns_only_newer_candles():
+    candles = _candles([1, 2, 3, 4])
+    assert list(candles_since(candles, None)) == candles
+    assert list(candles_since(candles, candles[1].timestamp)) == candles[2:]
+    assert list(candles_since(candles, candles[-1].timestamp)) == []
+
+
+def _random_walk(length: int, seed: int = 7) -> list[float]:
+    rng = random.Random(seed)
+    closes = [100.0]
+    for _ in range(length - 1):
+        closes.append(max(1.0, closes[-1] + rng.uniform(-1, 1)))
+    return closes
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        IndicatorSpec("sma", 10),
+        IndicatorSpec("ema", 10),
+        IndicatorSpec("rsi", 14),
+        IndicatorSpec("atr", 14),
+        IndicatorSpec("bollinger", 20, (2.0,)),
+    ],
+)
+def test_batch_mode_matches_streaming_mode(spec: IndicatorSpec):
+    candles = _candles(_random_walk(3000))
+    indicator = create_indicator(spec)
+    streamed = [indicator.update(candle) for candle in candles]
+    batched = compute_batch(
+        spec,
+        closes=[candle.close for candle in candles],
+        highs=[candle.high for candle in candles],
+        lows=[candle.low for candle in candles],
+    )
+    assert batched == streamed
+    assert streamed[-1] == indicator.value
+
+
+def test_every_registered_indicator_is_covered():
+    assert set(INDICATORS) == {"sma", "ema", "rsi", "atr", "bollinger"}
+
+
+def test_ema_is_seeded_with_simple_average():
+    values = ExponentialMovingAverage.batch(3, closes=[1.0, 2.0, 3.0, 4.0])
+    assert values[:2] == [None, None]
+    assert values[2] == pytest.approx(2.0)
+    assert values[3] == pytest.approx(2.0 + 0.5 * (4.0 - 2.0))
+
+
+def test_rsi_extremes_and_range():
+    assert RelativeStrengthIndex.batch(3, closes=[1.0, 2.0, 3.0, 4.0, 5.0])[-1] == 100.0
+    assert RelativeStrengthIndex.batch(3, closes=[5.0, 4.0, 3.0, 2.0])[-1] == 0.0
+    values = [value for value in RelativeStrengthIndex.batch(14, closes=_random_walk(500)) if value is not None]
+    assert all(0.0 <= value <= 100.0 for value in values)
+
+
+def test_atr_matches_naive_wilder_average():
+    candles = _candles(_random_walk(60))
+    true_ranges = [candles[0].high - candles[0].low] + [
+        max(c.high - c.low, abs(c.high - p.close), abs(c.low - p.close)) for p, c in zip(candles, candles[1:])
+    ]
+    expected = mean(true_ranges[:5])
+    for true_range in true_ranges[5:]:
+        expected = (expected * 4 + true_range) / 5
+    atr = AverageTrueRange(5)
+    for candle in candles:
+        atr.update(candle)
+    assert atr.value == pytest.approx(expected)
+
+
+def test_atr_batch_requires_range_columns():
+    with pytest.raises(ValueError):
+        AverageTrueRange.batch(5, closes=[1.0, 2.0])
+
+
+def test_bollinger_bands_match_population_deviation():
+    closes = _random_walk(40)
+    bands = BollingerBandsIndicator.batch(20, 2.0, closes=closes)[-1]
+    window = closes[-20:]
+    assert bands.middle == pytest.approx(mean(window))
+    assert bands.upper - bands.middle == pytest.approx(2.0 * pstdev(window))
+    assert math.isclose(bands.middle - bands.lower, bands.upper - bands.middle)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import logging
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+from domain.models import Candle, Instrument
+from utils.memory import estimate_collection_size, estimate_size
+
+EURUSD = Instrument(symbol="EURUSD")
+
+
+def _candles(count: int) -> deque[Candle]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return deque(
+        Candle(
+            instrument=EURUSD,
+            timestamp=start + timedelta(minutes=index),
+            open=1.0 + index,
+            high=2.0 + index,
+            low=0.5 + index,
+            close=1.5 + index,
+        )
+        for index in range(count)
+    )
+
+
+def test_estimate_size_grows_with_contents_and_skips_shared_objects():
+    small, large = _candles(10), _candles(100)
+    assert estimate_size(large) > estimate_size(small) * 5
+    assert estimate_size(large, shared=[EURUSD]) < estimate_size(large)
+
+
+def test_estimate_size_counts_each_object_once_and_ignores_loggers():
+    payload = list(range(1000))
+    assert estimate_size([payload, payload]) < 2 * estimate_size(payload)
+
+    class Component:
+        def __init__(self) -> None:
+            self.logger = logging.getLogger("anything")
+            self.state = {"key": "value"}
+
+    assert estimate_size(Component()) < 2000
+
+
+def test_collection_estimate_is_close_to_the_exact_size():
+    candles = _candles(500)
+    exact = estimate_size(candles, shared=[EURUSD])
+    estimated = estimate_collection_size(candles, shared=[EURUSD])
+    assert abs(estimated - exact) / exact < 0.2
+    assert estimate_collection_size(deque()) > 0
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import pytest
+
+from utils.monte_carlo import load_trade_pnls, max_drawdown, run_monte_carlo
+
+PNLS = [3.0, -1.0, 2.0, -4.0, 1.5, 0.5, -2.0, 2.5]
+
+
+def test_max_drawdown_measures_largest_fall_from_peak():
+    assert max_drawdown([1.0, 2.0, -4.0, 1.0, -1.0]) == pytest.approx(4.0)
+    assert max_drawdown([1.0, 1.0]) == 0.0
+    assert max_drawdown([-2.0, 1.0]) == pytest.approx(2.0)
+
+
+def test_permutation_keeps_final_pnl_and_varies_drawdown():
+    result = run_monte_carlo(PNLS, resamples=500, method="permutation", seed=1)
+
+    assert result.final_pnl.minimum == pytest.approx(sum(PNLS))
+    assert result.final_pnl.maximum == pytest.approx(sum(PNLS))
+    assert result.max_drawdown.minimum < result.max_drawdown.maximum
+    assert result.probability_of_loss == 0.0
+
+
+def test_bootstrap_is_repeatable_with_a_seed():
+    first = run_monte_carlo(PNLS, resamples=1_000, seed=7)
+    second = run_monte_carlo(PNLS, resamples=1_000, seed=7)
+
+    assert first == second
+    percentiles = list(first.final_pnl.percentiles.values())
+    assert percentiles == sorted(percentiles)
+    assert first.final_pnl.minimum < sum(PNLS) < first.final_pnl.maximum
+    assert 0.0 < first.probability_of_loss < 1.0
+
+
+def test_run_monte_carlo_rejects_invalid_input():
+    with pytest.raises(ValueError):
+        run_monte_carlo([], resamples=10)
+    with pytest.raises(ValueError):
+        run_monte_carlo(PNLS, method="jackknife")
+
+
+def test_load_trade_pnls_reads_csv_jsonl_and_plain_numbers(tmp_path):
+    csv_file = tmp_path / "trades.csv"
+    csv_file.write_text("symbol,pnl\nEURUSD,1.5\nGBPUSD,-0.5\n", encoding="utf-8")
+    jsonl_file = tmp_path / "trades.jsonl"
+    jsonl_file.write_text('{"pnl": 2}\n\n{"pnl": -1.25}\n', encoding="utf-8")
+    plain_file = tmp_path / "trades.txt"
+    plain_file.write_text("0.5\n-0.25\n", encoding="utf-8")
+
+    assert load_trade_pnls(csv_file) == [1.5, -0.5]
+    assert load_trade_pnls(jsonl_file) == [2.0, -1.25]
+    assert load_trade_pnls(plain_file) == [0.5, -0.25]
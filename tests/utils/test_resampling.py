@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from domain.models import Candle, Instrument
+from utils.resampling import CandleResampler, ResamplingHub
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+INSTRUMENT = Instrument(symbol="EURUSD")
+
+
+def _candle(minute: int, close: float, volume: float | None = 1.0) -> Candle:
+    return Candle(
+        instrument=INSTRUMENT,
+        timestamp=START + timedelta(minutes=minute),
+        open=close,
+        high=close + 0.5,
+        low=close - 0.5,
+        close=close,
+        volume=volume,
+    )
+
+
+def test_resampler_aggregates_epoch_aligned_bars():
+    resampler = CandleResampler("5m")
+    completed = [resampler.update(_candle(minute, 10.0 + minute)) for minute in range(11)]
+
+    assert [bar is not None for bar in completed].count(True) == 2
+    first, second = resampler.window()
+    assert first.timestamp == START
+    assert (first.open, first.high, first.low, first.close, first.volume) == (10.0, 14.5, 9.5, 14.0, 5.0)
+    assert second.timestamp == START + timedelta(minutes=5)
+    assert resampler.current.close == 20.0
+    assert resampler.window(include_partial=True)[-1] == resampler.current
+
+
+def test_resampler_ignores_stale_candles_and_missing_volume():
+    resampler = CandleResampler(timedelta(minutes=5))
+    resampler.update(_candle(1, 10.0, volume=None))
+    resampler.update(_candle(1, 99.0))
+    resampler.update(_candle(2, 11.0))
+    assert resampler.current.close == 11.0
+    assert resampler.current.volume == 1.0
+
+
+def test_extend_only_consumes_new_candles():
+    candles = [_candle(minute, 10.0) for minute in range(12)]
+    resampler = CandleResampler("5m")
+    assert resampler.extend(candles[:6]) == 1
+    assert resampler.extend(candles) == 1
+    assert resampler.current.volume == 2.0
+
+
+def test_hub_shares_resamplers_per_symbol_and_timeframe():
+    hub = ResamplingHub()
+    assert hub.resampler("EURUSD", "1h") is hub.resampler("EURUSD", timedelta(hours=1))
+    assert hub.resampler("EURUSD", "1h") is not hub.resampler("GBPUSD", "1h")
+
+
+def test_hub_skips_an_empty_candle_sequence():
+    hub = ResamplingHub()
+    assert hub.update([], "5m") is None
+    assert hub.update([_candle(1, 10.0)], "5m").current.close == 10.0
+
+
+def test_invalid_timeframe_is_rejected():
+    with pytest.raises(ValueError):
+        CandleResampler("5 minutes")
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import pytest
+
+from utils.sharding import ConsistentHashRing, shard_instruments
+
+
+def test_shard_instruments_covers_every_symbol_once():
+    symbols = [f"SYM{index}" for index in range(200)]
+    shards = shard_instruments(symbols, 4)
+    assigned = [symbol for members in shards.values() for symbol in members]
+    assert sorted(assigned) == sorted(symbols)
+    assert all(members for members in shards.values())
+
+
+def test_adding_a_node_only_moves_a_fraction_of_keys():
+    symbols = [f"SYM{index}" for index in range(1000)]
+    ring = ConsistentHashRing(range(4))
+    before = {symbol: ring.node_for(symbol) for symbol in symbols}
+    ring.add_node(4)
+    moved = [symbol for symbol in symbols if ring.node_for(symbol) != before[symbol]]
+    assert all(ring.node_for(symbol) == 4 for symbol in moved)
+    assert len(moved) < len(symbols) * 0.4
+
+
+def test_removing_a_node_reassigns_its_keys():
+    ring = ConsistentHashRing(["a", "b"])
+    ring.remove_node("a")
+    assert ring.nodes == frozenset({"b"})
+    assert ring.node_for("EURUSD") == "b"
+
+
+def test_empty_ring_raises():
+    with pytest.raises(LookupError):
+        ConsistentHashRing().node_for("EURUSD")
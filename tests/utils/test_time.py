@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import signal
 import threading
+from datetime import timedelta
 
-from utils.time import IntervalScheduler, graceful_interrupt, utc_now
+import pytest
+
+from utils.time import IntervalScheduler, graceful_interrupt, parse_timeframe, reload_on_hangup, utc_now
 
 
 def test_interval_scheduler_runs_until_stopped():
@@ -40,3 +43,22 @@ def test_graceful_interrupt_installs_handler():
 
     assert calls == [signal.SIGINT]
     assert signal.getsignal(signal.SIGINT) is original
+
+
+def test_reload_on_hangup_installs_handler():
+    calls: list[int] = []
+    original = signal.getsignal(signal.SIGHUP)
+
+    with reload_on_hangup(lambda signum, frame: calls.append(signum)):
+        signal.getsignal(signal.SIGHUP)(signal.SIGHUP, None)
+
+    assert calls == [signal.SIGHUP]
+    assert signal.getsignal(signal.SIGHUP) is original
+
+
+def test_parse_timeframe_units():
+    assert parse_timeframe("30s") == timedelta(seconds=30)
+    assert parse_timeframe("15M") == timedelta(minutes=15)
+    assert parse_timeframe("4h") == timedelta(hours=4)
+    with pytest.raises(ValueError):
+        parse_timeframe("0m")
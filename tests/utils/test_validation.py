@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import math
+from array import array
+
 import pytest
 
+from domain.models import CandleColumns, Instrument
 from utils.validation import (
+    BatchValidationError,
     ensure_non_empty_string,
     ensure_positive_number,
     ensure_type,
+    ensure_valid_candles,
     ensure_within_range,
+    RowError,
+    find_candle_errors,
+    find_gaps,
 )
 
 
@@ -34,3 +43,55 @@ def test_ensure_type_matches_expected():
     ensure_type("value", str, "ok")
     with pytest.raises(TypeError):
         ensure_type(123, str, "error")
+
+
+def _columns(rows: int) -> CandleColumns:
+    return CandleColumns(
+        instrument=Instrument(symbol="EURUSD"),
+        timestamps=array("q", range(0, rows * 60, 60)),
+        open=array("d", [1.0] * rows),
+        high=array("d", [1.5] * rows),
+        low=array("d", [0.5] * rows),
+        close=array("d", [1.2] * rows),
+        volume=array("d", [math.nan] * rows),
+    )
+
+
+def test_find_candle_errors_reports_each_bad_row():
+    columns = _columns(10)
+    columns.low[2] = 0.0
+    columns.high[4] = 1.1
+    columns.close[5] = math.nan
+    columns.timestamps[7] = columns.timestamps[6]
+    errors = find_candle_errors(columns, row_offset=100)
+    assert [(error.row, error.message) for error in errors] == [
+        (102, "prices must be positive"),
+        (104, "high/low must bound open/close prices"),
+        (105, "prices must be positive, high/low must bound open/close prices"),
+        (107, "timestamps must be strictly increasing"),
+    ]
+
+
+def test_ensure_valid_candles_checks_against_the_previous_batch():
+    columns = _columns(3)
+    ensure_valid_candles(columns)
+    with pytest.raises(BatchValidationError, match="EURUSD row 0: timestamps must be strictly increasing"):
+        ensure_valid_candles(columns, source="EURUSD", previous_timestamp=0)
+
+
+def test_batch_error_message_is_truncated():
+    columns = _columns(8)
+    for row in range(8):
+        columns.low[row] = -1.0
+    with pytest.raises(BatchValidationError, match=r"row 4: .*\(and 3 more\)$") as excinfo:
+        ensure_valid_candles(columns)
+    assert len(excinfo.value.errors) == 8
+
+
+def test_find_gaps_reports_rows_after_a_gap():
+    timestamps = array("q", [0, 60, 120, 600, 660, 1200])
+    assert find_gaps(timestamps, 60) == [
+        RowError(3, "gap of 480 after the previous row"),
+        RowError(5, "gap of 540 after the previous row"),
+    ]
+    assert find_gaps(timestamps, 600) == []
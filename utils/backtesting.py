@@ -1,12 +1,17 @@
 """Utilities for backtesting strategies using historical data."""
 from __future__ import annotations
 
-from collections.abc import Sequence
-from dataclasses import dataclass
-from typing import Protocol
+import heapq
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import repeat
+from typing import Deque, Protocol
 
-from domain.models import Candle, Order, TradingSignal
+from domain.models import Candle, CandleColumns, Order, TradingSignal
 from domain.interfaces import RiskManager, Strategy
+from utils.datasets import CandleDataset
 
 
 class OrderExecutorStub(Protocol):
@@ -25,17 +30,49 @@ class BacktestResult:
     rejected: int
 
 
+@dataclass
+class MultiBacktestResult:
+    """Results of a multi-instrument backtest, per symbol and in aggregate."""
+
+    per_symbol: dict[str, BacktestResult] = field(default_factory=dict)
+    candles: int = 0
+    first_timestamp: datetime | None = None
+    last_timestamp: datetime | None = None
+
+    @property
+    def aggregate(self) -> BacktestResult:
+        """Return the totals over every symbol."""
+
+        results = self.per_symbol.values()
+        return BacktestResult(
+            trades=sum(result.trades for result in results),
+            signals=sum(result.signals for result in results),
+            rejected=sum(result.rejected for result in results),
+        )
+
+
 def run_backtest(
-    candles: Sequence[Candle],
+    candles: Iterable[Candle],
     strategy: Strategy,
     risk_manager: RiskManager,
     executor: OrderExecutorStub,
 ) -> BacktestResult:
-    """Execute a basic backtest by replaying candles through the strategy."""
+    """Execute a basic backtest by replaying candles through the strategy.
+
+    ``candles`` may be any iterable, e.g. :class:`~domain.models.CandleColumns`,
+    which builds each candle only when it is reached. For columns, a strategy
+    and risk manager that both implement the batch methods are evaluated
+    over the whole range at once and candles are never built.
+    """
 
+    if isinstance(candles, CandleColumns):
+        result = _run_batch_backtest(candles, strategy, risk_manager, executor)
+        if result is not None:
+            return result
     signals = 0
     trades = 0
     rejected = 0
+    signal_executed = getattr(strategy, "signal_executed", None)
     window: list[Candle] = []
     for candle in candles:
         window.append(candle)
@@ -46,5 +83,132 @@ def run_backtest(
             rejected += 1
             continue
         executor.submit(assessment.order)
+        if signal_executed is not None:
+            signal_executed(signal)
         trades += 1
     return BacktestResult(trades=trades, signals=signals, rejected=rejected)
+
+
+def _run_batch_backtest(
+    columns: CandleColumns,
+    strategy: Strategy,
+    risk_manager: RiskManager,
+    executor: OrderExecutorStub,
+) -> BacktestResult | None:
+    generate_signal_batch = getattr(strategy, "generate_signal_batch", None)
+    assess_batch = getattr(risk_manager, "assess_batch", None)
+    if generate_signal_batch is None or assess_batch is None:
+        return None
+    signal_types = generate_signal_batch(columns)
+    if signal_types is None:
+        return None
+    batch = assess_batch(signal_types, columns)
+    if batch is None:
+        return None
+    trades = 0
+    for index, side in enumerate(batch.sides):
+        if side is not None:
+            executor.submit(batch.order(index))
+            trades += 1
+    return BacktestResult(trades=trades, signals=len(batch), rejected=len(batch) - trades)
+
+
+def run_dataset_backtest(
+    dataset: CandleDataset,
+    symbol: str,
+    strategy: Strategy,
+    risk_manager: RiskManager,
+    executor: OrderExecutorStub,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> BacktestResult:
+    """Backtest ``symbol`` over ``[start, end]`` read from a columnar dataset.
+
+    Only the chunks overlapping the range are read from disk.
+    """
+
+    columns = dataset.read(symbol, start=start, end=end)
+    return run_backtest(columns, strategy, risk_manager, executor)
+
+
+def merge_candle_streams(streams: Mapping[str, Iterable[Candle]]) -> Iterator[tuple[str, Candle]]:
+    """Merge time-ordered candle streams, keyed by symbol, into one ``(symbol, candle)`` stream.
+
+    A heap holds the next candle of every stream, so the merge is lazy and
+    costs O(log k) per candle for k streams. Candles with equal timestamps
+    come out in stream order.
+    """
+
+    keyed = [zip(repeat(symbol), stream) for symbol, stream in streams.items()]
+    return heapq.merge(*keyed, key=lambda item: item[1].timestamp)
+
+
+def run_multi_backtest(
+    streams: Mapping[str, Iterable[Candle]],
+    strategy: Strategy,
+    risk_manager: RiskManager,
+    executor: OrderExecutorStub,
+    *,
+    window: int = 500,
+) -> MultiBacktestResult:
+    """Backtest several instruments on one synchronized timeline.
+
+    The streams, keyed by symbol, are merged by timestamp, and each candle is
+    evaluated against the last ``window`` candles of its own instrument. All
+    instruments share ``strategy``, ``risk_manager`` and ``executor``, so
+    portfolio limits see the positions of every symbol as they happen.
+    Memory is bounded by one pending candle per stream plus the windows.
+    """
+
+    if window <= 0:
+        raise ValueError("Window must be positive")
+    result = MultiBacktestResult(per_symbol={symbol: BacktestResult(0, 0, 0) for symbol in streams})
+    windows: dict[str, Deque[Candle]] = {}
+    signal_executed = getattr(strategy, "signal_executed", None)
+    for symbol, candle in merge_candle_streams(streams):
+        history = windows.get(symbol)
+        if history is None:
+            history = windows[symbol] = deque(maxlen=window)
+        history.append(candle)
+        result.candles += 1
+        if result.first_timestamp is None:
+            result.first_timestamp = candle.timestamp
+        result.last_timestamp = candle.timestamp
+        snapshot = tuple(history)
+        signals: Sequence[TradingSignal] = strategy.generate_signals(snapshot)
+        totals = result.per_symbol[symbol]
+        for signal in signals:
+            totals.signals += 1
+            assessment = risk_manager.assess(signal, snapshot)
+            if not assessment.approved or assessment.order is None:
+                totals.rejected += 1
+                continue
+            executor.submit(assessment.order)
+            if signal_executed is not None:
+                signal_executed(signal)
+            totals.trades += 1
+    return result
+
+
+def run_dataset_multi_backtest(
+    dataset: CandleDataset,
+    strategy: Strategy,
+    risk_manager: RiskManager,
+    executor: OrderExecutorStub,
+    *,
+    symbols: Sequence[str] | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    window: int = 500,
+) -> MultiBacktestResult:
+    """Backtest ``symbols`` (all of the dataset's by default) on one timeline.
+
+    Each symbol is streamed one chunk at a time, so memory does not grow with
+    the length of the range.
+    """
+
+    streams = {
+        symbol: dataset.iter_candles(symbol, start=start, end=end) for symbol in (symbols or dataset.symbols())
+    }
+    return run_multi_backtest(streams, strategy, risk_manager, executor, window=window)
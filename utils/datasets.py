@@ -0,0 +1,401 @@
+"""Columnar, chunked candle datasets for backtesting.
+
+A dataset is a directory with one subdirectory per symbol::
+
+    <root>/<SYMBOL>/manifest.json
+    <root>/<SYMBOL>/chunk-000000.bin
+    ...
+
+Each chunk stores up to ``chunk_rows`` candles column by column (timestamps
+as little-endian int64 microseconds, then open, high, low, close and volume
+as little-endian float64, NaN for a missing volume). The manifest lists the
+chunks with their row counts and min/max timestamps, so a range read only
+opens the chunks that overlap it and binary-searches their timestamp column
+through a memory map.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import math
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator, Mapping
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from domain.models import Candle, CandleColumns, Instrument
+from utils.time import to_microseconds
+from utils.validation import BatchValidationError, RowError, find_candle_errors
+
+MAGIC = b"HBCOLS01"
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+DEFAULT_CHUNK_ROWS = 65_536
+_HEADER = struct.Struct("<8sQ")
+_PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+_ROW_SIZE = 8 * (1 + len(_PRICE_COLUMNS))
+_SWAP = sys.byteorder != "little"
+
+
+@dataclass(frozen=True)
+class ChunkInfo:
+    """Manifest entry describing one chunk file."""
+
+    file: str
+    rows: int
+    min_timestamp: int
+    max_timestamp: int
+
+
+class _Columns:
+    """Growable column buffers for one chunk."""
+
+    def __init__(self) -> None:
+        self.timestamps = array("q")
+        self.prices = {name: array("d") for name in _PRICE_COLUMNS}
+        self.lines = array("q")
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def as_candle_columns(self, instrument: Instrument) -> CandleColumns:
+        return CandleColumns(
+            instrument=instrument,
+            timestamps=self.timestamps,
+            **{name: self.prices[name] for name in _PRICE_COLUMNS},
+        )
+
+
+class DatasetWriter:
+    """Writes candles for one symbol as columnar chunks plus a manifest.
+
+    Rows must be appended in strictly increasing timestamp order. Existing
+    data for the symbol is replaced. Each chunk is validated as a batch before
+    it is written, so an invalid row raises :class:`BatchValidationError`
+    from the :meth:`append` that fills its chunk or from :meth:`close`. Rows
+    are reported by their ``line`` when one was given on append, and errors
+    are prefixed with ``source`` (the symbol by default).
+
+    Chunks are written to a hidden staging directory next to the symbol's and
+    only replace the existing data, together with the manifest, in
+    :meth:`close`; a failed or abandoned write leaves the old data intact.
+    """
+
+    def __init__(
+        self, root: Path, symbol: str, *, chunk_rows: int = DEFAULT_CHUNK_ROWS, source: str | None = None
+    ) -> None:
+        if chunk_rows <= 0:
+            raise ValueError("Chunk rows must be positive")
+        self.symbol = symbol
+        self._source = source or symbol
+        self._directory = root / symbol
+        self._chunk_rows = chunk_rows
+        self._buffer = _Columns()
+        self._chunks: list[ChunkInfo] = []
+        self._rows = 0
+        self._last_timestamp: int | None = None
+        root.mkdir(parents=True, exist_ok=True)
+        self._staging = Path(tempfile.mkdtemp(prefix=f".{symbol}.staging-", dir=root))
+
+    @property
+    def rows(self) -> int:
+        """Return the number of rows appended so far."""
+
+        return self._rows
+
+    def append(
+        self,
+        timestamp: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float | None = None,
+        *,
+        line: int | None = None,
+    ) -> None:
+        """Append one candle; ``timestamp`` is in epoch microseconds."""
+
+        buffer = self._buffer
+        buffer.timestamps.append(timestamp)
+        for name, value in zip(_PRICE_COLUMNS, (open_, high, low, close, math.nan if volume is None else volume)):
+            buffer.prices[name].append(value)
+        if line is not None:
+            buffer.lines.append(line)
+        self._rows += 1
+        if len(buffer) >= self._chunk_rows:
+            self._flush()
+
+    def close(self) -> int:
+        """Write the final chunk and the manifest, returning the total row count."""
+
+        self._flush()
+        manifest = {
+            "format": FORMAT_VERSION,
+            "symbol": self.symbol,
+            "rows": self._rows,
+            "min_timestamp": self._chunks[0].min_timestamp if self._chunks else None,
+            "max_timestamp": self._chunks[-1].max_timestamp if self._chunks else None,
+            "chunks": [asdict(chunk) for chunk in self._chunks],
+        }
+        (self._staging / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        retired = self._directory.with_name(f".{self.symbol}.retired-{os.getpid()}")
+        shutil.rmtree(retired, ignore_errors=True)
+        if self._directory.exists():
+            self._directory.rename(retired)
+        self._staging.rename(self._directory)
+        shutil.rmtree(retired, ignore_errors=True)
+        return self._rows
+
+    def abort(self) -> None:
+        """Discard everything written so far, keeping the symbol's existing data."""
+
+        shutil.rmtree(self._staging, ignore_errors=True)
+
+    def _flush(self) -> None:
+        buffer = self._buffer
+        if not len(buffer):
+            return
+        errors = find_candle_errors(
+            buffer.as_candle_columns(Instrument(symbol=self.symbol)), previous_timestamp=self._last_timestamp
+        )
+        if errors:
+            if len(buffer.lines) == len(buffer):
+                errors = [RowError(buffer.lines[error.row], error.message) for error in errors]
+            else:
+                errors = [RowError(self._rows - len(buffer) + error.row, error.message) for error in errors]
+            self.abort()
+            raise BatchValidationError(errors, source=self._source)
+        self._last_timestamp = buffer.timestamps[-1]
+        name = f"chunk-{len(self._chunks):06d}.bin"
+        info = ChunkInfo(name, len(buffer), buffer.timestamps[0], buffer.timestamps[-1])
+        columns = [buffer.timestamps, *(buffer.prices[column] for column in _PRICE_COLUMNS)]
+        with (self._staging / name).open("wb") as fh:
+            fh.write(_HEADER.pack(MAGIC, len(buffer)))
+            for column in columns:
+                if _SWAP:
+                    column.byteswap()
+                column.tofile(fh)
+        self._chunks.append(info)
+        self._buffer = _Columns()
+
+
+class CandleDataset:
+    """Read access to a columnar candle dataset rooted at ``root``."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._manifests: dict[str, dict[str, Any]] = {}
+
+    def symbols(self) -> list[str]:
+        """Return the symbols stored in the dataset."""
+
+        manifests = self.root.glob(f"*/{MANIFEST_NAME}")
+        return sorted(path.parent.name for path in manifests if not path.parent.name.startswith("."))
+
+    def chunks(self, symbol: str) -> list[ChunkInfo]:
+        """Return the chunk metadata recorded for ``symbol``."""
+
+        return [ChunkInfo(**chunk) for chunk in self._manifest(symbol)["chunks"]]
+
+    def read(
+        self,
+        symbol: str,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        instrument: Instrument | None = None,
+    ) -> CandleColumns:
+        """Return the candles of ``symbol`` with timestamps in ``[start, end]``.
+
+        Only chunks whose timestamp range overlaps the request are opened, and
+        within them only the matching rows are copied out of the memory map.
+        """
+
+        low = to_microseconds(start) if start is not None else None
+        high = to_microseconds(end) if end is not None else None
+        columns = _Columns()
+        for chunk in self.chunks(symbol):
+            if (low is not None and chunk.max_timestamp < low) or (high is not None and chunk.min_timestamp > high):
+                continue
+            self._read_chunk(self.root / symbol / chunk.file, chunk.rows, low, high, columns)
+        return CandleColumns(
+            instrument=instrument or Instrument(symbol=symbol),
+            timestamps=columns.timestamps,
+            **{name: columns.prices[name] for name in _PRICE_COLUMNS},
+        )
+
+    def iter_candles(
+        self,
+        symbol: str,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        instrument: Instrument | None = None,
+    ) -> Iterator[Candle]:
+        """Yield the candles of ``symbol`` in ``[start, end]`` one chunk at a time.
+
+        Unlike :meth:`read`, at most one chunk is held in memory, so many
+        symbols can be streamed side by side.
+        """
+
+        low = to_microseconds(start) if start is not None else None
+        high = to_microseconds(end) if end is not None else None
+        instrument = instrument or Instrument(symbol=symbol)
+        for chunk in self.chunks(symbol):
+            if (low is not None and chunk.max_timestamp < low) or (high is not None and chunk.min_timestamp > high):
+                continue
+            columns = _Columns()
+            self._read_chunk(self.root / symbol / chunk.file, chunk.rows, low, high, columns)
+            yield from columns.as_candle_columns(instrument)
+
+    def _manifest(self, symbol: str) -> Mapping[str, Any]:
+        manifest = self._manifests.get(symbol)
+        if manifest is None:
+            path = self.root / symbol / MANIFEST_NAME
+            if not path.exists():
+                raise LookupError(f"No dataset for {symbol} in {self.root}")
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+            if manifest.get("format") != FORMAT_VERSION:
+                raise ValueError(f"Unsupported dataset format in {path}")
+            self._manifests[symbol] = manifest
+        return manifest
+
+    @staticmethod
+    def _read_chunk(path: Path, rows: int, low: int | None, high: int | None, into: _Columns) -> None:
+        with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            magic, stored_rows = _HEADER.unpack_from(buffer, 0)
+            if magic != MAGIC or stored_rows != rows or len(buffer) != _HEADER.size + rows * _ROW_SIZE:
+                raise ValueError(f"{path} is not a valid dataset chunk")
+            with memoryview(buffer) as view:
+                timestamps = view[_HEADER.size : _HEADER.size + rows * 8]
+                if _SWAP:
+                    timestamps = array("q", timestamps)
+                    timestamps.byteswap()
+                else:
+                    timestamps = timestamps.cast("q")
+                first = bisect_left(timestamps, low) if low is not None else 0
+                last = bisect_right(timestamps, high) if high is not None else rows
+                if first < last:
+                    _extend(into.timestamps, view, _HEADER.size, first, last)
+                    for index, name in enumerate(_PRICE_COLUMNS, start=1):
+                        _extend(into.prices[name], view, _HEADER.size + index * rows * 8, first, last)
+                if isinstance(timestamps, memoryview):
+                    timestamps.release()
+
+
+def _extend(column: array, view: memoryview, offset: int, first: int, last: int) -> None:
+    chunk = array(column.typecode)
+    chunk.frombytes(view[offset + first * 8 : offset + last * 8])
+    if _SWAP:
+        chunk.byteswap()
+    column.extend(chunk)
+
+
+def _parse_timestamp(value: Any) -> int:
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.replace(".", "", 1).isdigit()):
+        return round(float(value) * 1_000_000)
+    text = str(value).strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return to_microseconds(parsed)
+
+
+def _read_rows(source: Path, file_format: str) -> Iterator[Mapping[str, Any]]:
+    with source.open("r", encoding="utf-8", newline="") as fh:
+        if file_format == "csv":
+            yield from csv.DictReader(fh)
+        else:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def import_ohlcv(
+    source: Path,
+    root: Path,
+    *,
+    symbol: str | None = None,
+    file_format: str | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> dict[str, int]:
+    """Convert a CSV or JSON-lines OHLCV file into the dataset at ``root``.
+
+    Rows need ``timestamp`` (ISO-8601 or epoch seconds), ``open``, ``high``,
+    ``low`` and ``close`` fields and may carry ``volume``. Rows are assigned to
+    ``symbol`` or, when it is not given, to their own ``symbol`` field. Rows of
+    each symbol must be in timestamp order. Prices and ordering are validated
+    a chunk at a time and errors name the source rows. Returns the row count
+    per symbol.
+    """
+
+    if file_format is None:
+        file_format = "csv" if source.suffix.lower() == ".csv" else "jsonl"
+    if file_format not in ("csv", "jsonl"):
+        raise ValueError(f"Unsupported input format: {file_format}")
+    writers: dict[str, DatasetWriter] = {}
+    try:
+        return _import_rows(source, file_format, root, symbol, chunk_rows, writers)
+    except BaseException:
+        for writer in writers.values():
+            writer.abort()
+        raise
+
+
+def _import_rows(
+    source: Path,
+    file_format: str,
+    root: Path,
+    symbol: str | None,
+    chunk_rows: int,
+    writers: dict[str, DatasetWriter],
+) -> dict[str, int]:
+    for line_number, row in enumerate(_read_rows(source, file_format), start=1):
+        row_symbol = symbol or row.get("symbol")
+        if not row_symbol:
+            raise ValueError(f"{source} row {line_number}: no symbol given")
+        writer = writers.get(row_symbol)
+        if writer is None:
+            writer = writers[row_symbol] = DatasetWriter(
+                root, row_symbol, chunk_rows=chunk_rows, source=f"{source} ({row_symbol})"
+            )
+        volume = row.get("volume")
+        try:
+            values = (
+                _parse_timestamp(row["timestamp"]),
+                float(row["open"]),
+                float(row["high"]),
+                float(row["low"]),
+                float(row["close"]),
+                float(volume) if volume not in (None, "") else None,
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"{source} row {line_number}: {exc}") from exc
+        writer.append(*values, line=line_number)
+    return {name: writer.close() for name, writer in writers.items()}
+
+
+def write_columns(root: Path, columns: CandleColumns, *, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+    """Write in-memory columns as the dataset of their instrument."""
+
+    writer = DatasetWriter(root, columns.instrument.symbol, chunk_rows=chunk_rows)
+    try:
+        for row in zip(columns.timestamps, columns.open, columns.high, columns.low, columns.close, columns.volume):
+            writer.append(*row)
+        return writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+
@@ -0,0 +1,308 @@
+"""Streaming technical indicators shared by strategies and risk managers."""
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, ClassVar, Deque, NamedTuple
+
+from domain.models import Candle
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """Hashable description of an indicator, used to share identical indicators."""
+
+    name: str
+    window: int
+    params: tuple[Any, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.window <= 0:
+            raise ValueError("Indicator window must be positive")
+
+
+class Indicator(ABC):
+    """Indicator whose state is updated in O(1) per candle.
+
+    Every indicator can be driven one candle at a time (:meth:`update`) or
+    over whole price columns (:meth:`batch`). Both modes run the same step
+    function, so they produce identical values; the batch mode simply avoids
+    building :class:`Candle` objects, which is what dominates backtest cost.
+    """
+
+    name: ClassVar[str]
+    requires_range: ClassVar[bool] = False
+
+    def update(self, candle: Candle) -> Any:
+        """Consume ``candle`` and return the current value, or ``None`` while warming up."""
+
+        return self._step(candle.high, candle.low, candle.close)
+
+    @abstractmethod
+    def _step(self, high: float, low: float, close: float) -> Any:
+        """Advance the indicator by one bar and return its value."""
+
+    @property
+    @abstractmethod
+    def value(self) -> Any:
+        """Return the latest value, or ``None`` while warming up."""
+
+    @classmethod
+    def batch(
+        cls,
+        window: int,
+        *params: Any,
+        closes: Sequence[float],
+        highs: Sequence[float] | None = None,
+        lows: Sequence[float] | None = None,
+    ) -> list[Any]:
+        """Return the indicator value after every bar of the supplied columns."""
+
+        if highs is None or lows is None:
+            if cls.requires_range:
+                raise ValueError(f"{cls.name} requires high and low columns")
+            highs = lows = closes
+        if not len(highs) == len(lows) == len(closes):
+            raise ValueError("Price columns must have the same length")
+        step = cls(window, *params)._step
+        return [step(high, low, close) for high, low, close in zip(highs, lows, closes)]
+
+
+class SimpleMovingAverage(Indicator):
+    """Arithmetic mean of the last ``window`` closes."""
+
+    name = "sma"
+    _RESYNC_INTERVAL = 1024
+
+    def __init__(self, window: int) -> None:
+        self._window = window
+        self._values: Deque[float] = deque(maxlen=window)
+        self._sum = 0.0
+        self._updates = 0
+
+    def _step(self, high: float, low: float, close: float) -> float | None:
+        if len(self._values) == self._window:
+            self._sum -= self._values[0]
+        self._values.append(close)
+        self._sum += close
+        self._updates += 1
+        if self._updates % self._RESYNC_INTERVAL == 0:
+            # Bound floating point drift of the running sum.
+            self._sum = math.fsum(self._values)
+        return self.value
+
+    @property
+    def value(self) -> float | None:
+        if len(self._values) < self._window:
+            return None
+        return self._sum / self._window
+
+
+class ExponentialMovingAverage(Indicator):
+    """Exponential moving average seeded with the simple average of the first window."""
+
+    name = "ema"
+
+    def __init__(self, window: int) -> None:
+        self._window = window
+        self._alpha = 2.0 / (window + 1)
+        self._seed_sum = 0.0
+        self._count = 0
+        self._value: float | None = None
+
+    def _step(self, high: float, low: float, close: float) -> float | None:
+        if self._value is not None:
+            self._value += self._alpha * (close - self._value)
+            return self._value
+        self._seed_sum += close
+        self._count += 1
+        if self._count == self._window:
+            self._value = self._seed_sum / self._window
+        return self._value
+
+    @property
+    def value(self) -> float | None:
+        return self._value
+
+
+class RelativeStrengthIndex(Indicator):
+    """Wilder's relative strength index on a 0-100 scale."""
+
+    name = "rsi"
+
+    def __init__(self, window: int) -> None:
+        self._window = window
+        self._previous_close: float | None = None
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._changes = 0
+        self._value: float | None = None
+
+    def _step(self, high: float, low: float, close: float) -> float | None:
+        previous, self._previous_close = self._previous_close, close
+        if previous is None:
+            return None
+        change = close - previous
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        window = self._window
+        self._changes += 1
+        if self._changes <= window:
+            self._avg_gain += gain / window
+            self._avg_loss += loss / window
+            if self._changes < window:
+                return None
+        else:
+            self._avg_gain = (self._avg_gain * (window - 1) + gain) / window
+            self._avg_loss = (self._avg_loss * (window - 1) + loss) / window
+        if self._avg_loss == 0.0:
+            self._value = 50.0 if self._avg_gain == 0.0 else 100.0
+        else:
+            self._value = 100.0 - 100.0 / (1.0 + self._avg_gain / self._avg_loss)
+        return self._value
+
+    @property
+    def value(self) -> float | None:
+        return self._value
+
+
+class AverageTrueRange(Indicator):
+    """Wilder's average true range."""
+
+    name = "atr"
+    requires_range = True
+
+    def __init__(self, window: int) -> None:
+        self._window = window
+        self._previous_close: float | None = None
+        self._count = 0
+        self._seed_sum = 0.0
+        self._value: float | None = None
+
+    def _step(self, high: float, low: float, close: float) -> float | None:
+        previous = self._previous_close
+        self._previous_close = close
+        if previous is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - previous), abs(low - previous))
+        if self._value is not None:
+            self._value = (self._value * (self._window - 1) + true_range) / self._window
+            return self._value
+        self._seed_sum += true_range
+        self._count += 1
+        if self._count == self._window:
+            self._value = self._seed_sum / self._window
+        return self._value
+
+    @property
+    def value(self) -> float | None:
+        return self._value
+
+
+class BollingerBands(NamedTuple):
+    """Middle, upper and lower Bollinger band values."""
+
+    middle: float
+    upper: float
+    lower: float
+
+
+class BollingerBandsIndicator(Indicator):
+    """Simple moving average with bands ``num_std`` population deviations away."""
+
+    name = "bollinger"
+    _RESYNC_INTERVAL = 1024
+
+    def __init__(self, window: int, num_std: float = 2.0) -> None:
+        self._window = window
+        self._num_std = num_std
+        self._values: Deque[float] = deque(maxlen=window)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._updates = 0
+        self._value: BollingerBands | None = None
+
+    def _step(self, high: float, low: float, close: float) -> BollingerBands | None:
+        if len(self._values) == self._window:
+            oldest = self._values[0]
+            self._sum -= oldest
+            self._sum_sq -= oldest * oldest
+        self._values.append(close)
+        self._sum += close
+        self._sum_sq += close * close
+        self._updates += 1
+        if self._updates % self._RESYNC_INTERVAL == 0:
+            self._sum = math.fsum(self._values)
+            self._sum_sq = math.fsum(value * value for value in self._values)
+        if len(self._values) < self._window:
+            return None
+        middle = self._sum / self._window
+        deviation = math.sqrt(max(self._sum_sq / self._window - middle * middle, 0.0))
+        self._value = BollingerBands(
+            middle=middle,
+            upper=middle + self._num_std * deviation,
+            lower=middle - self._num_std * deviation,
+        )
+        return self._value
+
+    @property
+    def value(self) -> BollingerBands | None:
+        return self._value
+
+
+INDICATORS: dict[str, type[Indicator]] = {
+    indicator.name: indicator
+    for indicator in (
+        SimpleMovingAverage,
+        ExponentialMovingAverage,
+        RelativeStrengthIndex,
+        AverageTrueRange,
+        BollingerBandsIndicator,
+    )
+}
+
+
+def create_indicator(spec: IndicatorSpec) -> Indicator:
+    """Instantiate the streaming indicator described by ``spec``."""
+
+    try:
+        indicator_cls = INDICATORS[spec.name]
+    except KeyError:
+        raise ValueError(f"Unknown indicator: {spec.name}") from None
+    return indicator_cls(spec.window, *spec.params)
+
+
+def compute_batch(
+    spec: IndicatorSpec,
+    *,
+    closes: Sequence[float],
+    highs: Sequence[float] | None = None,
+    lows: Sequence[float] | None = None,
+) -> list[Any]:
+    """Compute the indicator described by ``spec`` over whole price columns."""
+
+    try:
+        indicator_cls = INDICATORS[spec.name]
+    except KeyError:
+        raise ValueError(f"Unknown indicator: {spec.name}") from None
+    return indicator_cls.batch(spec.window, *spec.params, closes=closes, highs=highs, lows=lows)
+
+
+def candles_since(candles: Sequence[Candle], timestamp: datetime | None) -> Sequence[Candle]:
+    """Return the trailing candles newer than ``timestamp``.
+
+    Scans backwards from the end, so the cost is proportional to the number of
+    new candles rather than the length of ``candles``.
+    """
+
+    if timestamp is None:
+        return candles
+    start = len(candles)
+    while start > 0 and candles[start - 1].timestamp > timestamp:
+        start -= 1
+    return candles[start:]
@@ -0,0 +1,72 @@
+"""Approximate memory accounting of object graphs."""
+from __future__ import annotations
+
+import logging
+import sys
+import types
+from collections import deque
+from collections.abc import Collection, Iterable, Mapping
+from itertools import islice
+from typing import Any
+
+# Objects that are shared with the rest of the process rather than owned by a
+# component; following them would attribute whole subsystems to one owner.
+_SKIPPED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    logging.Logger,
+)
+
+
+def estimate_size(obj: Any, *, shared: Iterable[Any] = ()) -> int:
+    """Return the approximate number of bytes reachable from ``obj``.
+
+    Containers, instance dictionaries and slots are followed, every object is
+    counted once, and objects in ``shared`` (e.g. instruments owned by the
+    registry) are left out, as are classes, functions, modules and loggers.
+    """
+
+    seen = {id(item) for item in shared}
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIPPED_TYPES):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, (str, bytes, bytearray, int, float, bool)) or current is None:
+            continue
+        if isinstance(current, Mapping):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            stack.extend(current)
+        attributes = getattr(current, "__dict__", None)
+        if isinstance(attributes, dict):
+            stack.append(attributes)
+        for slot in getattr(type(current), "__slots__", ()):
+            value = getattr(current, slot, None)
+            if value is not None:
+                stack.append(value)
+    return total
+
+
+def estimate_collection_size(items: Collection[Any], *, shared: Iterable[Any] = (), sample: int = 8) -> int:
+    """Estimate a large collection of similar items from the deep size of a few of them.
+
+    Costs O(``sample``) instead of O(n), which keeps periodic accounting of
+    long candle histories cheap.
+    """
+
+    shared = tuple(shared)
+    count = len(items)
+    sampled = list(islice(iter(items), sample))
+    if not sampled:
+        return sys.getsizeof(items)
+    # Sampled together, so objects the items share are counted once.
+    per_item = (estimate_size(sampled, shared=shared) - sys.getsizeof(sampled)) / len(sampled)
+    return sys.getsizeof(items) + round(per_item * count)
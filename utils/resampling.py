@@ -0,0 +1,139 @@
+"""Incremental resampling of a base candle stream into higher timeframes."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import Deque
+
+from domain.models import Candle, Instrument
+from utils.indicators import candles_since
+from utils.time import from_microseconds, parse_timeframe, to_microseconds
+
+
+class CandleResampler:
+    """Aggregates base candles into bars of a longer timeframe.
+
+    Bars are aligned to the Unix epoch, so a ``1h`` bar covers whole clock
+    hours and is stamped with its start time. Each base candle updates the
+    open bar in O(1); when a candle falls into a later bucket the open bar is
+    completed and kept, up to ``max_bars`` completed bars. Candles that are
+    not newer than the last one consumed are ignored, including a revision of
+    the last base candle with the same timestamp: a base candle is aggregated
+    as first seen, so feed completed base candles. The trading service does
+    so, since it only passes on candles with a new timestamp.
+    """
+
+    def __init__(self, timeframe: str | timedelta, *, max_bars: int = 1000) -> None:
+        if max_bars <= 0:
+            raise ValueError("Max bars must be positive")
+        self.timeframe = parse_timeframe(timeframe)
+        self._step = self.timeframe // timedelta(microseconds=1)
+        self._bars: Deque[Candle] = deque(maxlen=max_bars)
+        self._completed = 0
+        self._last_timestamp: datetime | None = None
+        # Open bar state, kept as plain fields so an update allocates nothing.
+        self._bucket: int | None = None
+        self._instrument: Instrument | None = None
+        self._open = self._high = self._low = self._close = 0.0
+        self._volume: float | None = None
+
+    @property
+    def current(self) -> Candle | None:
+        """Return the bar still being built, if any."""
+
+        if self._bucket is None or self._instrument is None:
+            return None
+        return Candle(
+            instrument=self._instrument,
+            timestamp=from_microseconds(self._bucket * self._step),
+            open=self._open,
+            high=self._high,
+            low=self._low,
+            close=self._close,
+            volume=self._volume,
+        )
+
+    @property
+    def completed(self) -> int:
+        """Return how many bars have been completed so far."""
+
+        return self._completed
+
+    @property
+    def last_timestamp(self) -> datetime | None:
+        """Return the timestamp of the newest base candle consumed."""
+
+        return self._last_timestamp
+
+    def update(self, candle: Candle) -> Candle | None:
+        """Consume a base candle and return the bar it completed, if any."""
+
+        if self._last_timestamp is not None and candle.timestamp <= self._last_timestamp:
+            return None
+        self._last_timestamp = candle.timestamp
+        bucket = to_microseconds(candle.timestamp) // self._step
+        if bucket == self._bucket:
+            if candle.high > self._high:
+                self._high = candle.high
+            if candle.low < self._low:
+                self._low = candle.low
+            self._close = candle.close
+            if candle.volume is not None:
+                self._volume = candle.volume if self._volume is None else self._volume + candle.volume
+            return None
+        finished = self.current
+        if finished is not None:
+            self._bars.append(finished)
+            self._completed += 1
+        self._bucket = bucket
+        self._instrument = candle.instrument
+        self._open, self._high, self._low, self._close = candle.open, candle.high, candle.low, candle.close
+        self._volume = candle.volume
+        return finished
+
+    def extend(self, candles: Sequence[Candle]) -> int:
+        """Consume base candles newer than the last one seen; return the bars completed."""
+
+        before = self._completed
+        for candle in candles_since(candles, self._last_timestamp):
+            self.update(candle)
+        return self._completed - before
+
+    def window(self, *, include_partial: bool = False) -> tuple[Candle, ...]:
+        """Return completed bars, oldest first, optionally followed by the open bar."""
+
+        current = self.current if include_partial else None
+        if current is not None:
+            return (*self._bars, current)
+        return tuple(self._bars)
+
+
+class ResamplingHub:
+    """Shares one :class:`CandleResampler` per instrument and timeframe.
+
+    Several consumers of the same timeframe read the same bars, and each base
+    candle is aggregated once per timeframe however many consumers there are.
+    """
+
+    def __init__(self, *, max_bars: int = 1000) -> None:
+        self._max_bars = max_bars
+        self._resamplers: dict[tuple[str, timedelta], CandleResampler] = {}
+
+    def resampler(self, symbol: str, timeframe: str | timedelta) -> CandleResampler:
+        """Return the resampler for ``symbol`` at ``timeframe``, creating it on first use."""
+
+        key = (symbol, parse_timeframe(timeframe))
+        resampler = self._resamplers.get(key)
+        if resampler is None:
+            resampler = self._resamplers[key] = CandleResampler(key[1], max_bars=self._max_bars)
+        return resampler
+
+    def update(self, candles: Sequence[Candle], timeframe: str | timedelta) -> CandleResampler | None:
+        """Feed the new base candles of one instrument and return its resampler, or ``None`` if there are none."""
+
+        if not candles:
+            return None
+        resampler = self.resampler(candles[-1].instrument.symbol, timeframe)
+        resampler.extend(candles)
+        return resampler
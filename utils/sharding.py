@@ -0,0 +1,73 @@
+"""Consistent hashing helpers for distributing instruments across workers."""
+from __future__ import annotations
+
+import hashlib
+from bisect import bisect_right
+from collections.abc import Hashable, Iterable, Sequence
+
+
+def _hash_key(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class ConsistentHashRing:
+    """Hash ring mapping keys to nodes with minimal movement when nodes change."""
+
+    def __init__(self, nodes: Iterable[Hashable] = (), *, replicas: int = 64) -> None:
+        if replicas <= 0:
+            raise ValueError("Replicas must be positive")
+        self._replicas = replicas
+        self._points: list[int] = []
+        self._owners: dict[int, Hashable] = {}
+        self._nodes: set[Hashable] = set()
+        for node in nodes:
+            self.add_node(node)
+
+    @property
+    def nodes(self) -> frozenset[Hashable]:
+        """Return the nodes currently placed on the ring."""
+
+        return frozenset(self._nodes)
+
+    def add_node(self, node: Hashable) -> None:
+        """Place ``node`` on the ring using its virtual replicas."""
+
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for replica in range(self._replicas):
+            point = _hash_key(f"{node}#{replica}")
+            if point in self._owners:
+                continue
+            self._owners[point] = node
+            self._points.append(point)
+        self._points.sort()
+
+    def remove_node(self, node: Hashable) -> None:
+        """Remove ``node`` and its virtual replicas from the ring."""
+
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        self._owners = {point: owner for point, owner in self._owners.items() if owner != node}
+        self._points = sorted(self._owners)
+
+    def node_for(self, key: str) -> Hashable:
+        """Return the node responsible for ``key``."""
+
+        if not self._points:
+            raise LookupError("Hash ring has no nodes")
+        index = bisect_right(self._points, _hash_key(key)) % len(self._points)
+        return self._owners[self._points[index]]
+
+
+def shard_instruments(symbols: Sequence[str], shard_count: int, *, replicas: int = 64) -> dict[int, list[str]]:
+    """Partition ``symbols`` into ``shard_count`` stable shards keyed by shard index."""
+
+    if shard_count <= 0:
+        raise ValueError("Shard count must be positive")
+    ring = ConsistentHashRing(range(shard_count), replicas=replicas)
+    shards: dict[int, list[str]] = {index: [] for index in range(shard_count)}
+    for symbol in symbols:
+        shards[ring.node_for(symbol)].append(symbol)
+    return shards
@@ -1,11 +1,12 @@
 """Utilities for time-related functionality."""
 from __future__ import annotations
 
+import re
 import signal
 import threading
 import time
 from contextlib import contextmanager
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from types import FrameType
 from typing import Callable, Iterator
 
@@ -40,17 +41,69 @@ def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_TIMEFRAME_PATTERN = re.compile(r"^\s*(\d+)\s*([smhdw])\s*$", re.IGNORECASE)
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86_400, "w": 604_800}
+
+
+def to_microseconds(timestamp: datetime) -> int:
+    """Return ``timestamp`` as integer microseconds since the Unix epoch."""
+
+    delta = timestamp - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_microseconds(value: int) -> datetime:
+    """Return the UTC datetime for integer microseconds since the Unix epoch."""
+
+    return datetime.fromtimestamp(value // 1_000_000, tz=timezone.utc).replace(microsecond=value % 1_000_000)
+
+
+def parse_timeframe(value: str | timedelta) -> timedelta:
+    """Return the duration of a timeframe such as ``"5m"``, ``"1h"`` or ``"1d"``."""
+
+    if isinstance(value, timedelta):
+        timeframe = value
+    else:
+        match = _TIMEFRAME_PATTERN.match(value)
+        if match is None:
+            raise ValueError(f"Invalid timeframe: {value!r}")
+        timeframe = timedelta(seconds=int(match.group(1)) * _UNIT_SECONDS[match.group(2).lower()])
+    if timeframe <= timedelta(0):
+        raise ValueError("Timeframe must be positive")
+    return timeframe
+
+
 @contextmanager
-def graceful_interrupt(handler: Callable[[int, FrameType | None], None]) -> Iterator[None]:
-    """Context manager to install a graceful interrupt signal handler."""
+def signal_handler(signum: int, handler: Callable[[int, FrameType | None], None]) -> Iterator[None]:
+    """Context manager installing ``handler`` for ``signum`` and restoring the previous one."""
 
-    original_handler = signal.getsignal(signal.SIGINT)
+    original_handler = signal.getsignal(signum)
 
     def _wrapped(signum: int, frame: FrameType | None) -> None:
         handler(signum, frame)
 
-    signal.signal(signal.SIGINT, _wrapped)
+    signal.signal(signum, _wrapped)
     try:
         yield
     finally:
-        signal.signal(signal.SIGINT, original_handler)
+        signal.signal(signum, original_handler)
+
+
+@contextmanager
+def graceful_interrupt(handler: Callable[[int, FrameType | None], None]) -> Iterator[None]:
+    """Context manager to install a graceful interrupt signal handler."""
+
+    with signal_handler(signal.SIGINT, handler):
+        yield
+
+
+@contextmanager
+def reload_on_hangup(handler: Callable[[int, FrameType | None], None]) -> Iterator[None]:
+    """Install ``handler`` for ``SIGHUP`` where the platform supports it."""
+
+    if not hasattr(signal, "SIGHUP"):  # pragma: no cover - Windows
+        yield
+        return
+    with signal_handler(signal.SIGHUP, handler):
+        yield
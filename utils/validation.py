@@ -1,7 +1,15 @@
-"""Validation helpers used across the application."""
+"""Validation helpers used across the application.
+
+The ``ensure_*`` helpers check one value. The batch validators check whole
+candle columns at once and report the offending rows.
+"""
 from __future__ import annotations
 
-from typing import Any
+import operator
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
+from itertools import compress, count, islice, repeat
+from typing import Any, Protocol
 
 
 def ensure_positive_number(value: float, message: str) -> None:
@@ -30,3 +38,118 @@ def ensure_type(value: Any, expected_type: type, message: str) -> None:
 
     if not isinstance(value, expected_type):
         raise TypeError(message)
+
+
+_SHOWN_ERRORS = 5
+
+
+@dataclass(frozen=True)
+class RowError:
+    """A validation failure located at one row of a batch."""
+
+    row: int
+    message: str
+
+
+class BatchValidationError(ValueError):
+    """Raised when rows of a batch fail validation; ``errors`` lists them."""
+
+    def __init__(self, errors: Sequence[RowError], *, source: str = "") -> None:
+        self.errors = list(errors)
+        self.source = source
+        shown = "; ".join(f"row {error.row}: {error.message}" for error in self.errors[:_SHOWN_ERRORS])
+        hidden = len(self.errors) - _SHOWN_ERRORS
+        suffix = f" (and {hidden} more)" if hidden > 0 else ""
+        super().__init__(f"{source} {shown}{suffix}" if source else f"{shown}{suffix}")
+
+
+class OHLCColumns(Protocol):
+    """Column-oriented candles, e.g. :class:`domain.models.CandleColumns`."""
+
+    timestamps: Sequence[int]
+    open: Sequence[float]
+    high: Sequence[float]
+    low: Sequence[float]
+    close: Sequence[float]
+
+
+def find_candle_errors(
+    columns: OHLCColumns,
+    *,
+    previous_timestamp: int | None = None,
+    row_offset: int = 0,
+    limit: int = 100,
+) -> list[RowError]:
+    """Return up to ``limit`` rows that are not valid candles, in row order.
+
+    A row is valid when its prices are positive, ``high`` and ``low`` bound
+    ``open`` and ``close``, and its timestamp is strictly greater than the
+    previous row's (or ``previous_timestamp`` for the first row). Each check
+    runs over whole columns inside the interpreter's C loops, so a clean
+    batch is validated without executing Python code per row; rows are only
+    inspected one by one to describe the ones that failed. NaN prices fail.
+    ``row_offset`` is added to the reported row numbers.
+    """
+
+    timestamps, open_, high, low, close = columns.timestamps, columns.open, columns.high, columns.low, columns.close
+    # With the bounds satisfied, every price is at least ``low``, so checking
+    # ``low`` is enough for positivity. Comparisons with NaN are false.
+    # Each check yields one result per row, starting at the given row.
+    checks: list[tuple[int, Callable[[], Iterator[bool]]]] = [
+        (0, lambda: map(operator.gt, low, repeat(0.0))),
+        (0, lambda: map(operator.ge, high, open_)),
+        (0, lambda: map(operator.ge, high, close)),
+        (0, lambda: map(operator.le, low, open_)),
+        (0, lambda: map(operator.le, low, close)),
+        (1, lambda: map(operator.lt, timestamps, islice(timestamps, 1, None))),
+    ]
+    failed: set[int] = set()
+    for first_row, check in checks:
+        if not all(check()):
+            failed.update(compress(count(first_row), map(operator.not_, check())))
+    if previous_timestamp is not None and len(timestamps) and timestamps[0] <= previous_timestamp:
+        failed.add(0)
+    errors = []
+    for row in sorted(failed)[:limit]:
+        message = _describe_row(columns, row, timestamps[row - 1] if row else previous_timestamp)
+        errors.append(RowError(row + row_offset, message))
+    return errors
+
+
+def ensure_valid_candles(
+    columns: OHLCColumns,
+    *,
+    source: str = "",
+    previous_timestamp: int | None = None,
+    row_offset: int = 0,
+) -> None:
+    """Raise :class:`BatchValidationError` naming the invalid rows of ``columns``."""
+
+    errors = find_candle_errors(columns, previous_timestamp=previous_timestamp, row_offset=row_offset)
+    if errors:
+        raise BatchValidationError(errors, source=source)
+
+
+def find_gaps(timestamps: Sequence[int], max_gap: int, *, row_offset: int = 0, limit: int = 100) -> list[RowError]:
+    """Return up to ``limit`` rows whose timestamp is more than ``max_gap`` after the previous row's."""
+
+    if len(timestamps) < 2 or max(map(operator.sub, islice(timestamps, 1, None), timestamps)) <= max_gap:
+        return []
+    gaps = map(operator.sub, islice(timestamps, 1, None), timestamps)
+    rows = islice(compress(count(1), map(operator.gt, gaps, repeat(max_gap))), limit)
+    return [
+        RowError(row + row_offset, f"gap of {timestamps[row] - timestamps[row - 1]} after the previous row")
+        for row in rows
+    ]
+
+
+def _describe_row(columns: OHLCColumns, row: int, previous: int | None) -> str:
+    open_, high, low, close = columns.open[row], columns.high[row], columns.low[row], columns.close[row]
+    problems = []
+    if not all(price > 0 for price in (open_, high, low, close)):
+        problems.append("prices must be positive")
+    if not (high >= open_ and high >= close and low <= open_ and low <= close):
+        problems.append("high/low must bound open/close prices")
+    if previous is not None and not columns.timestamps[row] > previous:
+        problems.append("timestamps must be strictly increasing")
+    return ", ".join(problems)